@@ -1,22 +1,36 @@
 from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
-import re
 import time
 import json
-from bs4 import BeautifulSoup
-from selenium import webdriver
+from html_parser import parse as parse_html, parse_regions
+import patterns
+import selector_plans
+import amazon_extract
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import WebDriverException, NoSuchElementException
 from pathlib import Path
 import tempfile
 import logging
 from datetime import datetime
 import sanitize_filename
+from retry_policy import extract as extract_field, stats as retry_stats
 import os
+from detail_tabs import DetailTabs
+from resource_blocking import apply_profile, page_stats, totals as blocking_totals
+from readiness import condition, wait_until_ready
+from driver_pool import acquire_driver, release_driver, get_pool, warm_up
+
+# Detail page regions the extractors read; colorImages is an inline script holding the gallery
+DETAIL_REGIONS = [
+    "#ppd", "#feature-bullets", "#detailBullets_feature_div", "ul.detail-bullet-list", "#productDetails_feature_div",
+    "#prodDetails", "#productDescription_feature_div", "#productDescription", "#aplus", "#aplus_feature_div", "#altImages"
+]
+DETAIL_SCRIPTS = ["colorImages"]
+# Regions re-read when the description has to be taken from the live tab
+DESCRIPTION_REGIONS = ["#feature-bullets", "#productDescription", "#aplus", "#aplus_feature_div"]
+
+# Search card, CAPTCHA and product page selectors, declared in site_specs/amazon.json
+PLAN = selector_plans.load("amazon")
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -51,52 +65,31 @@ class AmazonScraper:
         self.retries = 3
         self.scraped_products = {}
         self.browser = self._setup_browser()
+        self.detail_tabs = DetailTabs(self.browser)
 
     def _setup_browser(self):
-        """Configure and return a Selenium WebDriver instance."""
-        options = webdriver.ChromeOptions()
-        options.add_argument("--ignore-certificate-errors")
-        options.add_argument("--log-level=3")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--headless=new")
-        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        """Check out a warm Selenium WebDriver instance from the shared pool."""
         try:
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=options)
-            driver.maximize_window()
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            logger.info("Chrome WebDriver initialized successfully.")
+            driver = acquire_driver()
+            apply_profile(driver, "amazon")
+            logger.info("Chrome WebDriver checked out from pool.")
             return driver
-        except WebDriverException as e:
+        except (WebDriverException, TimeoutError) as e:
             logger.error(f"Failed to initialize WebDriver: {e}")
             raise
 
-    def retry_extraction(self, func, attempts=3, delay=1, default=""):
-        """Retries an extraction function up to 'attempts' times."""
-        for i in range(attempts):
-            try:
-                result = func()
-                if result:
-                    return result
-            except Exception as e:
-                logger.warning(f"Retry {i+1}/{attempts} failed: {e}")
-                time.sleep(delay)
-        return default
+    def retry_extraction(self, func, attempts=3, delay=1, default="", field=None, live=False):
+        """Extract a field once from a parsed page, or with bounded retries when live reads the browser."""
+        return extract_field(func, default, f"amazon.{field or 'unnamed'}", live, attempts, delay)
 
     def clean_text(self, text):
         """Clean text by removing extra whitespace, newlines, control characters, and special Unicode characters."""
-        if not text:
-            return ""
-        cleaned = re.sub(r'[\u2000-\u200F\u2028-\u202F]+', '', text)
-        cleaned = re.sub(r'\s+', ' ', cleaned)
-        cleaned = re.sub(r'\[U\+[0-9A-Fa-f]+\]', '', cleaned)
-        return cleaned.strip()
+        return patterns.clean_text(text)
 
     def detect_captcha(self):
         """Check for CAPTCHA presence."""
         try:
-            captcha_elements = self.browser.find_elements(By.CSS_SELECTOR, "form[action*='captcha'], div.a-box.a-alert.a-alert-warning, div#captchacharacters")
+            captcha_elements = self.browser.find_elements(By.CSS_SELECTOR, PLAN["captcha"].css())
             if captcha_elements:
                 logger.warning("CAPTCHA detected!")
                 return True
@@ -105,81 +98,30 @@ class AmazonScraper:
             logger.warning(f"Error checking CAPTCHA: {e}")
             return False
 
-    def extract_product_description(self, product_page_html):
-        """Extract product description from the product page, including overview, features, and technical specs."""
-        description = {
-            "features": [],
-            "technical_specs": {}
-        }
+    def extract_live_description(self):
+        """Description from the live tab, for pages whose snapshot had none: feature bullets may still be rendering.
 
-        # Extract features from module-9 sections
-        try:
-            module_9_sections = product_page_html.find_all("div", {"class": re.compile(r"aplus-module module-9")})
-            for section in module_9_sections:
-                flex_items = section.find_all("div", {"class": "apm-flex-item-third-width"})
-                for item in flex_items:
-                    try:
-                        heading = self.clean_text(item.find("h4").get_text(strip=True))
-                        paragraphs = item.find_all("p")
-                        lists = item.find_all("ul", {"class": "a-unordered-list"})
-                        feature_text = f"{heading}\n"
-                        for p in paragraphs:
-                            p_text = self.clean_text(p.get_text(strip=True))
-                            if p_text:
-                                feature_text += f"{p_text}\n"
-                        for ul in lists:
-                            for li in ul.find_all("li"):
-                                li_text = self.clean_text(li.get_text(strip=True))
-                                feature_text += f"- {li_text}\n"
-                        description["features"].append(feature_text.strip())
-                    except Exception as e:
-                        logger.warning(f"Error extracting feature: {e}")
-        except Exception as e:
-            logger.warning(f"Error extracting module-9 sections: {e}")
+        The bullets are polled with the short live backoff of retry_policy, so the wait is bounded
+        and shows up in the amazon.feature_bullets retry stats.
+        """
+        bullets = self.retry_extraction(
+            lambda: PLAN["feature_bullet"].live(self.browser),
+            default=[], field="feature_bullets", live=True
+        )
+        if not bullets:
+            logger.info("No description on the page")
+            return "N/A"
+        return amazon_extract.extract_description(parse_regions(self.browser, DESCRIPTION_REGIONS))
 
-        # Extract technical specifications from module-16-tech-specs
+    def scrape_product_page(self, url, product_json_data):
+        """Extract additional details from the product page loaded in the current tab."""
         try:
-            tech_specs_table = product_page_html.find("table", {"class": "aplus-tech-spec-table"})
-            if tech_specs_table:
-                rows = tech_specs_table.find_all("tr")
-                for row in rows:
-                    cells = row.find_all("td")
-                    if len(cells) == 2:
-                        key = self.clean_text(cells[0].get_text(strip=True))
-                        value = self.clean_text(cells[1].get_text(strip=True))
-                        description["technical_specs"][key] = value
+            product_page_html = parse_regions(self.browser, DETAIL_REGIONS, DETAIL_SCRIPTS)
+            product_json_data.update(amazon_extract.extract_detail(product_page_html, url, product_json_data, self.search_keyword))
+            if product_json_data["description"] == "N/A":
+                product_json_data["description"] = self.extract_live_description()
         except Exception as e:
-            logger.warning(f"Error extracting technical specs: {e}")
-
-        # Extract description from feature-bullets (updated selector)
-        try:
-            description_elements = WebDriverWait(self.browser, 15).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "#feature-bullets ul li"))
-            )
-            if description_elements:
-                feature_text = ""
-                for element in description_elements:
-                    self.browser.execute_script("arguments[0].scrollIntoView(true);", element)
-                    time.sleep(0.5)
-                    element_text = self.clean_text(element.text.strip())
-                    if element_text:
-                        feature_text += f"- {element_text}\n"
-                description["features"].append(feature_text.strip())
-        except TimeoutException:
-            logger.warning("Primary description selector not found, trying alternative selector...")
-            try:
-                description_elements = product_page_html.select("div#productDescription, ul.a-unordered-list.a-vertical.a-spacing-mini li")
-                if description_elements:
-                    feature_text = ""
-                    for element in description_elements:
-                        element_text = self.clean_text(element.get_text(strip=True))
-                        if element_text:
-                            feature_text += f"- {element_text}\n"
-                    description["features"].append(feature_text.strip())
-            except Exception as e:
-                logger.warning(f"Alternative description selector not found: {e}")
-
-        return description if description["features"] or description["technical_specs"] else "N/A"
+            logger.error(f"Error processing product page {url}: {e}")
 
     def scrape_products(self):
         """Main scraping function."""
@@ -190,304 +132,38 @@ class AmazonScraper:
                         search_url = f"https://www.amazon.in/s?k={self.search_keyword.replace(' ', '+')}&page={page}"
                         logger.info(f"Scraping page {page}/{self.max_pages}: {search_url}")
                         self.browser.get(search_url)
-                        WebDriverWait(self.browser, 15).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "div.s-main-slot"))
-                        )
                         if self.detect_captcha():
                             logger.error(f"CAPTCHA detected on page {page}, stopping.")
                             break
-                        time.sleep(2)
-                        html_data = BeautifulSoup(self.browser.page_source, "html.parser")
-                        product_cards = html_data.select("div.s-result-item.s-asin:not(.AdHolder)")
+                        wait_until_ready(self.browser, "amazon", "search")
+                        html_data = parse_html(self.browser.page_source)
+                        product_cards = PLAN["card"].values(html_data)
                         logger.info(f"Found {len(product_cards)} organic product cards on page {page}")
+                        page_products = {}
 
                         for product in product_cards:
-                            product_json_data = {
-                                "url": "N/A",
-                                "title": "N/A",
-                                "currency": "N/A",
-                                "exact_price": "N/A",
-                                "mrp": "N/A",
-                                "description": "N/A",
-                                "min_order": "1 unit",
-                                "supplier": "N/A",
-                                "origin": "N/A",
-                                "feedback": {"rating": "N/A", "review": "N/A"},
-                                "image_url": "N/A",
-                                "images": [],
-                                "videos": [],
-                                "Specifications": {},
-                                "website_name": "Amazon",
-                                "discount_information": "N/A",
-                                "brand_name": "N/A"
-                            }
-
-                            # Extract product URL
-                            try:
-                                product_link = self.retry_extraction(
-                                    lambda: product.select_one("a.a-link-normal.s-no-outline")["href"]
-                                )
-                                if product_link:
-                                    product_url = product_link if product_link.startswith("https://www.amazon.in") else f"https://www.amazon.in{product_link}"
-                                    product_json_data["url"] = product_url.split("?")[0].split("/ref=")[0]
-                                    logger.info(f"Product URL: {product_url}")
-                                else:
-                                    logger.warning("No product link found, skipping product.")
-                                    continue
-                            except Exception as e:
-                                logger.warning(f"Error extracting product URL: {e}")
+                            product_json_data = amazon_extract.extract_card(product, self.search_keyword)
+                            if not product_json_data:
                                 continue
 
                             # Avoid duplicate products by URL
-                            if product_json_data["url"] in self.scraped_products:
+                            if product_json_data["url"] in self.scraped_products or product_json_data["url"] in page_products:
                                 logger.info(f"Skipping duplicate product: {product_json_data['url']}")
                                 continue
+                            page_products[product_json_data["url"]] = product_json_data
+
+                        # Load product pages in parallel tabs and extract details as each becomes ready
+                        self.detail_tabs.fetch(
+                            list(page_products.items()),
+                            self.scrape_product_page,
+                            condition=condition("amazon", "detail")
+                        )
 
-                            # Extract product title
-                            try:
-                                title_elem = self.retry_extraction(
-                                    lambda: product.select_one("span.a-size-medium.a-color-base.a-text-normal, h2.a-size-mini.a-spacing-none.a-color-base")
-                                )
-                                if title_elem:
-                                    product_json_data["title"] = self.clean_text(title_elem.get_text(strip=True))
-                                    logger.info(f"Product title: {product_json_data['title']}")
-                            except Exception as e:
-                                logger.warning(f"Error extracting product title: {e}")
-
-                            # Extract product currency
-                            try:
-                                product_currency_element = self.retry_extraction(
-                                    lambda: product.select_one("span.a-price-symbol")
-                                )
-                                if product_currency_element:
-                                    currency = self.clean_text(product_currency_element.get_text(strip=True))
-                                    product_json_data["currency"] = currency
-                                    logger.info(f"Product currency: {sanitize_log_message(currency)}")
-                            except Exception as e:
-                                logger.warning(f"Error extracting product currency: {e}")
-
-                            # Extract product price
-                            try:
-                                product_price_whole = self.retry_extraction(
-                                    lambda: product.select_one("span.a-price-whole")
-                                )
-                                product_price_fraction = self.retry_extraction(
-                                    lambda: product.select_one("span.a-price-fraction")
-                                )
-                                if product_price_whole:
-                                    price_whole = self.clean_text(product_price_whole.get_text(strip=True)).replace(",", "")
-                                    price_text = price_whole
-                                    if product_price_fraction:
-                                        price_fraction = self.clean_text(product_price_fraction.get_text(strip=True))
-                                        price_text = f"{price_whole}.{price_fraction}"
-                                    product_json_data["exact_price"] = price_text
-                                    logger.info(f"Product price: {product_json_data['exact_price']}")
-                            except Exception as e:
-                                logger.warning(f"Error extracting product price: {e}")
-
-                            # Open product page to extract additional details
-                            if product_json_data["url"] != "N/A":
-                                try:
-                                    self.browser.execute_script("window.open('');")
-                                    self.browser.switch_to.window(self.browser.window_handles[-1])
-                                    self.browser.get(product_json_data["url"])
-                                    WebDriverWait(self.browser, 15).until(
-                                        EC.presence_of_element_located((By.CSS_SELECTOR, "div#ppd, div#dp-container"))
-                                    )
-                                    time.sleep(1)
-                                    product_page_html = BeautifulSoup(self.browser.page_source, "html.parser")
-
-                                    # Extract product description
-                                    product_json_data["description"] = self.extract_product_description(product_page_html)
-
-                                    # Extract MRP
-                                    try:
-                                        mrp_element = self.retry_extraction(
-                                            lambda: product_page_html.select_one("span.a-price.a-text-price span.a-offscreen")
-                                        )
-                                        if mrp_element:
-                                            mrp_text = self.clean_text(mrp_element.get_text(strip=True))
-                                            if mrp_text:
-                                                mrp_value = re.sub(r'[^\d.]', '', mrp_text)
-                                                product_json_data["mrp"] = float(mrp_value) if mrp_value else "N/A"
-                                                logger.info(f"MRP extracted: {product_json_data['mrp']}")
-                                            else:
-                                                logger.warning(f"No MRP text found")
-                                        else:
-                                            logger.warning(f"No MRP element found")
-                                    except Exception as e:
-                                        logger.warning(f"Error extracting MRP: {e}")
-
-                                    # Extract discount information
-                                    try:
-                                        discount_elem = self.retry_extraction(
-                                            lambda: product_page_html.select_one("span.savingsPercentage")
-                                        )
-                                        if discount_elem:
-                                            product_json_data["discount_information"] = self.clean_text(discount_elem.get_text(strip=True))
-                                            logger.info(f"Discount extracted: {product_json_data['discount_information']}")
-                                        else:
-                                            # Fallback: Calculate discount from MRP and price
-                                            if product_json_data["mrp"] != "N/A" and product_json_data["exact_price"] != "N/A":
-                                                try:
-                                                    current_price = float(re.sub(r'[^\d.]', '', product_json_data["exact_price"]))
-                                                    mrp_value = float(product_json_data["mrp"])
-                                                    if mrp_value > current_price:
-                                                        discount_percentage = ((mrp_value - current_price) / mrp_value) * 100
-                                                        product_json_data["discount_information"] = f"{discount_percentage:.2f}% off"
-                                                        logger.info(f"Calculated discount: {product_json_data['discount_information']}")
-                                                    else:
-                                                        logger.info(f"No discount applicable (MRP <= Price)")
-                                                except ValueError as e:
-                                                    logger.warning(f"Error calculating discount: {e}")
-                                            else:
-                                                logger.warning(f"No discount found (missing MRP or price)")
-                                    except Exception as e:
-                                        logger.warning(f"Error extracting discount: {e}")
-
-                                    # Extract product details
-                                    product_details = {}
-                                    try:
-                                        detail_lists = product_page_html.select("ul.detail-bullet-list > li")
-                                        for li in detail_lists:
-                                            try:
-                                                label_tag = li.select_one("span.a-text-bold")
-                                                value_tag = label_tag.find_next_sibling("span") if label_tag else None
-                                                if label_tag and value_tag:
-                                                    label = self.clean_text(label_tag.get_text(strip=True).replace(":", ""))
-                                                    value = self.clean_text(value_tag.get_text(" ", strip=True))
-                                                    if label and value:
-                                                        product_details[label] = value
-                                            except Exception as e:
-                                                logger.warning(f"Error parsing product detail item: {e}")
-                                        if not product_details:
-                                            details_table = product_page_html.select_one("table#productDetails_detailBullets_sections1")
-                                            if details_table:
-                                                rows = details_table.find_all("tr")
-                                                for row in rows:
-                                                    try:
-                                                        label = row.find("th", {"class": "a-color-secondary a-size-base prodDetSectionEntry"})
-                                                        value = row.find("td", {"class": "a-size-base prodDetAttrValue"})
-                                                        if label and value:
-                                                            label_text = self.clean_text(label.get_text(strip=True).replace(":", ""))
-                                                            value_text = self.clean_text(value.get_text(" ", strip=True))
-                                                            if label_text and value_text:
-                                                                product_details[label_text] = value_text
-                                                    except Exception as e:
-                                                        logger.warning(f"Error parsing table detail row: {e}")
-                                        product_json_data["Specifications"] = product_details
-                                        logger.info(f"Product details extracted: {product_details}")
-                                    except Exception as e:
-                                        logger.warning(f"Error extracting product details: {e}")
-
-                                    # Extract product reviews
-                                    try:
-                                        product_review_element = self.retry_extraction(
-                                            lambda: product_page_html.find("span", {"id": "acrCustomerReviewText"})
-                                        )
-                                        if product_review_element:
-                                            product_review_text = self.clean_text(product_review_element.get_text(strip=True))
-                                            numeric_match = re.search(r"(\d+)", product_review_text)
-                                            if numeric_match:
-                                                product_json_data["feedback"]["review"] = numeric_match.group(1)
-                                                logger.info(f"Product reviews: {product_json_data['feedback']['review']}")
-                                    except Exception as e:
-                                        logger.warning(f"Error extracting product reviews: {e}")
-
-                                    # Extract product rating
-                                    try:
-                                        product_rating_element = self.retry_extraction(
-                                            lambda: product_page_html.find(
-                                                lambda tag: tag.name == "span" and tag.get("id") == "acrPopover" and "reviewCountTextLinkedHistogram" in tag.get("class", []) and tag.has_attr("title")
-                                            )
-                                        )
-                                        if product_rating_element:
-                                            rating_span = product_rating_element.find("span", {"class": "a-size-base a-color-base"})
-                                            if rating_span:
-                                                product_json_data["feedback"]["rating"] = self.clean_text(rating_span.get_text(strip=True))
-                                                logger.info(f"Product rating: {product_json_data['feedback']['rating']}")
-                                    except Exception as e:
-                                        logger.warning(f"Error extracting product rating: {e}")
-
-                                    # Extract product supplier
-                                    try:
-                                        product_supplier_element = product_page_html.find("a", {"id": "sellerProfileTriggerId"})
-                                        if not product_supplier_element:
-                                            product_supplier_element = product_page_html.find("span", {"class": "tabular-buybox-text"})
-                                        if product_supplier_element:
-                                            product_json_data["supplier"] = self.clean_text(product_supplier_element.get_text(strip=True))
-                                            logger.info(f"Product supplier: {product_json_data['supplier']}")
-                                    except Exception as e:
-                                        logger.warning(f"Error extracting product supplier: {e}")
-
-                                    # Extract product images (static extraction)
-                                    try:
-                                        main_image = product_page_html.select_one("#landingImage, img#imgTagWrapperId")
-                                        if main_image and main_image.get("src"):
-                                            product_json_data["image_url"] = main_image["src"]
-                                            product_json_data["images"].append(main_image["src"])
-                                        scripts = product_page_html.find_all("script", string=re.compile("colorImages"))
-                                        for script in scripts:
-                                            matches = re.findall(r'"large":"(https://[^"]+)"', script.string)
-                                            product_json_data["images"].extend(matches)
-                                        thumbs = product_page_html.select("#altImages .a-button-thumbnail img")
-                                        for thumb in thumbs:
-                                            if thumb.get("src"):
-                                                hi_res_url = re.sub(r'\._(AC_SR\d+,\d+|SX\d+_SY\d+)_', '._AC_SL1500_', thumb["src"])
-                                                if hi_res_url not in product_json_data["images"]:
-                                                    product_json_data["images"].append(hi_res_url)
-                                        product_json_data["images"] = list(set(product_json_data["images"]))[:5]
-                                        logger.info(f"Product images: {product_json_data['images']}")
-                                    except Exception as e:
-                                        logger.warning(f"Error extracting product images: {e}")
-
-                                    # Extract brand name
-                                    try:
-                                        if "Brand" in product_json_data["Specifications"]:
-                                            product_json_data["brand_name"] = product_json_data["Specifications"]["Brand"]
-                                        elif "brand" in product_json_data["Specifications"]:
-                                            product_json_data["brand_name"] = product_json_data["Specifications"]["brand"]
-                                        else:
-                                            brand_elem = product_page_html.select_one("#bylineInfo")
-                                            if brand_elem:
-                                                brand_text = self.clean_text(brand_elem.get_text(strip=True))
-                                                brand_match = re.search(r"(?:Visit|Brand:|by|from)\s+the\s+(.+?)\s+(?:Store|Brand|$)", brand_text, re.IGNORECASE)
-                                                if brand_match:
-                                                    product_json_data["brand_name"] = brand_match.group(1)
-                                                else:
-                                                    product_json_data["brand_name"] = brand_text
-                                        logger.info(f"Brand name: {product_json_data['brand_name']}")
-                                    except Exception as e:
-                                        logger.warning(f"Error extracting brand name: {e}")
-
-                                    # Extract origin
-                                    try:
-                                        if "Country of Origin" in product_json_data["Specifications"]:
-                                            product_json_data["origin"] = product_json_data["Specifications"]["Country of Origin"]
-                                        elif "country of origin" in product_json_data["Specifications"]:
-                                            product_json_data["origin"] = product_json_data["Specifications"]["country of origin"]
-                                        else:
-                                            detail_bullets = product_page_html.select("ul.detail-bullet-list > li")
-                                            for bullet in detail_bullets:
-                                                text = self.clean_text(bullet.get_text(strip=True))
-                                                match = re.search(r"Country of Origin:?\s*([^:]+?)(?:\.|\s|$)", text, re.IGNORECASE)
-                                                if match:
-                                                    product_json_data["origin"] = match.group(1).strip()
-                                                    break
-                                        logger.info(f"Origin: {product_json_data['origin']}")
-                                    except Exception as e:
-                                        logger.warning(f"Error extracting origin: {e}")
-
-                                except Exception as e:
-                                    logger.error(f"Error processing product page {product_json_data['url']}: {e}")
-                                finally:
-                                    self.browser.close()
-                                    self.browser.switch_to.window(self.browser.window_handles[0])
-
-                            # Save product if URL is valid
-                            if product_json_data["url"] != "N/A":
-                                self.scraped_products[product_json_data["url"]] = product_json_data
-                                logger.info(f"Saved product: {product_json_data['url']}")
+                        # Save products with a valid URL
+                        for url, product_json_data in page_products.items():
+                            self.scraped_products[url] = product_json_data
+                            logger.info(f"Saved product: {url}")
+                        logger.info(f"Page {page} network: {page_stats(self.browser)}")
 
                         # Break out of the retry loop for the page if successful
                         break
@@ -601,11 +277,11 @@ class AmazonScraper:
         }
 
     def close(self):
-        """Close the WebDriver."""
+        """Return the WebDriver to the shared pool."""
         if self.browser:
             try:
-                self.browser.quit()
-                logger.info("Browser closed")
+                release_driver(self.browser)
+                logger.info("Browser returned to pool")
             except Exception as e:
                 logger.warning(f"Error closing browser: {e}")
             self.browser = None
@@ -762,7 +438,11 @@ def health():
     return jsonify({
         "status": "ok",
         "timestamp": datetime.now().isoformat(),
-        "uptime": time.time() - app.start_time
+        "uptime": time.time() - app.start_time,
+        "browser_pool": get_pool().stats(),
+        "resource_blocking": blocking_totals(),
+        "extraction_retries": retry_stats(),
+        "selectors": selector_plans.stats()
     })
 
 def check_dependencies():
@@ -783,4 +463,5 @@ if __name__ == "__main__":
     app.start_time = time.time()
     if not check_dependencies():
         logger.error("Server started but dependencies are missing. Some features may not work.")
+    warm_up()
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)), debug=False)
\ No newline at end of file
@@ -1,6 +1,5 @@
 from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
-import re
 import time
 import json
 import os
@@ -8,16 +7,24 @@ import random
 import logging
 import subprocess
 from datetime import datetime
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from html_parser import parse_regions
+import selector_plans
+import flipkart_extract
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from collections import OrderedDict
 import sanitize_filename
+from retry_policy import stats as retry_stats
+from detail_tabs import DetailTabs
+from resource_blocking import apply_profile, page_stats, totals as blocking_totals
+from readiness import condition, wait_until_ready, wait_for_quiet
+from network_capture import capture_products, ENABLED as CAPTURE_ENABLED
+from driver_pool import acquire_driver, release_driver, get_pool, warm_up
+
+# Search card and product page selectors, declared in site_specs/flipkart.json
+PLAN = selector_plans.load("flipkart")
+
+# Product page regions the extractors read, taken from the declared selectors
+DETAIL_REGIONS = [PLAN[name].css() for name in ("title", "price", "supplier", "rating", "review", "discount", "gallery", "specifications")]
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -44,28 +51,29 @@ class FlipkartScraper:
             "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.81 Safari/537.36"
         ]
         self.browser = self._setup_browser()
+        self.detail_tabs = DetailTabs(self.browser)
         self.scraped_data = []  # Initialize scraped_data
 
     def _setup_browser(self):
-        """Configure and return a Selenium WebDriver instance"""
-        options = webdriver.ChromeOptions()
-        options.add_argument("--ignore-certificate-errors")
-        options.add_argument("--log-level=3")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--headless=new")
-        options.add_argument(f"user-agent={random.choice(self.user_agents)}")
+        """Check out a warm Selenium WebDriver instance from the shared pool"""
         try:
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=options)
-            driver.maximize_window()
+            driver = acquire_driver()
+            apply_profile(driver, "flipkart")
+            logger.info("Chrome WebDriver checked out from pool.")
             return driver
-        except WebDriverException as e:
+        except (WebDriverException, TimeoutError) as e:
             logger.error(f"Failed to initialize WebDriver: {e}")
             raise
 
+    def close(self):
+        """Return the WebDriver to the shared pool"""
+        if self.browser:
+            try:
+                release_driver(self.browser)
+            except Exception as e:
+                logger.warning(f"Error closing browser: {e}")
+            self.browser = None
+
     def rotate_user_agent(self):
         """Change the user agent to avoid detection"""
         try:
@@ -77,40 +85,62 @@ class FlipkartScraper:
         except Exception as e:
             logger.warning(f"Failed to rotate user agent: {e}")
 
-    def retry_extraction(self, func, attempts=3, delay=2, default="N/A"):
-        """Retries an extraction function up to 'attempts' times."""
-        for i in range(attempts):
-            try:
-                result = func()
-                if result:
-                    return result
-            except Exception as e:
-                if i < attempts - 1:
-                    time.sleep(delay)
-        return default
-
     def create_product_data(self):
         """Create an ordered dictionary with field order preserved"""
-        return OrderedDict([
-            ("url", "N/A"),
-            ("title", "N/A"),
-            ("currency", "N/A"),
-            ("exact_price", "N/A"),
-            ("description", "N/A"),
-            ("min_order", "1 unit"),
-            ("supplier", "N/A"),
-            ("feedback", {"rating": "N/A", "review": "N/A"}),
-            ("image_url", "N/A"),
-            ("images", []),
-            ("videos", []),
-            ("specifications", {}),
-            ("website_name", "Flipkart"),
-            ("discount_information", "N/A")
-        ])
+        return OrderedDict(flipkart_extract.new_record())
+
+    def scrape_product_page(self, product_data):
+        """Extract product details from one snapshot of the product page loaded in the current tab"""
+        try:
+            product_page_html = parse_regions(self.browser, DETAIL_REGIONS, keep_scripts=[flipkart_extract.STATE_MARKER])
+            record = flipkart_extract.extract_detail(product_page_html, product_data["url"], product_data, self.search_keyword)
+            if record is None:
+                return False
+            product_data.update(record)
+
+            # Last resort: image thumbnails whose own src does not give their image away
+            unresolved = flipkart_extract.unresolved_thumbnails(product_page_html)
+            if unresolved:
+                self.click_gallery(product_data, unresolved)
+
+            logger.info(f"Successfully scraped product: {product_data['title']}")
+            return True
+        except Exception as e:
+            logger.error(f"Error processing product page {product_data['url']}: {e}")
+            return False
+
+    def click_gallery(self, product_data, indices):
+        """Click the given gallery thumbnails of the live tab, collecting the image each one shows"""
+        try:
+            images_elem = PLAN["gallery"].live(self.browser)[0]
+            img_buttons = PLAN["gallery_thumbnail"].live(images_elem)
+            logger.info(f"Clicking {len(indices)} of {len(img_buttons)} gallery thumbnails for {product_data['title']}")
+            for i in indices:
+                if i >= len(img_buttons):
+                    continue
+                img_button = img_buttons[i]
+                try:
+                    self.browser.execute_script("arguments[0].scrollIntoView(true);", img_button)
+                    img_button.click()
+                    wait_for_quiet(self.browser, quiet_ms=200, timeout=2)
+                    image_url = flipkart_extract.full_size(PLAN["gallery_image"].live(images_elem)[0].get_attribute("src"))
+                    if product_data["image_url"] == "N/A":
+                        product_data["image_url"] = image_url
+                    if image_url not in product_data["images"]:
+                        product_data["images"].append(image_url)
+                except Exception:
+                    continue
+        except Exception as e:
+            logger.warning(f"Error extracting images for {product_data['title']}: {e}")
 
     def scrape_products(self):
         """Main scraping function"""
         scraped_products = {}
+
+        def on_product_page(url, product_data):
+            if self.scrape_product_page(product_data):
+                scraped_products[url] = product_data
+
         try:
             for page in range(1, self.max_pages + 1):
                 for attempt in range(self.retries):
@@ -119,149 +149,49 @@ class FlipkartScraper:
                         search_url = f"https://www.flipkart.com/search?q={self.search_keyword.replace(' ', '+')}&page={page}"
                         logger.info(f"Scraping page {page}/{self.max_pages}: {search_url}")
                         self.browser.get(search_url)
-                        WebDriverWait(self.browser, 15).until(
-                            lambda d: d.execute_script("return document.readyState") == "complete"
-                        )
-                        time.sleep(3)  # Allow dynamic content to load
 
                         # Check for CAPTCHA
                         if "captcha" in self.browser.current_url.lower() or "verify" in self.browser.page_source.lower():
                             logger.warning("CAPTCHA detected. Skipping page.")
                             break
+                        # Search results can be read from the JSON responses the page already downloaded
+                        captured = []
+                        if CAPTURE_ENABLED:
+                            wait_for_quiet(self.browser, quiet_ms=500, timeout=10)
+                            captured = capture_products(self.browser, "flipkart")
+
+                        if captured:
+                            product_urls = [record["url"] for record in captured]
+                        else:
+                            wait_until_ready(self.browser, "flipkart", "search")
+
+                            # Card fallbacks are probed once each, in hit-rate order, on the ready page
+                            product_cards = PLAN["card"].live(self.browser)
+                            if not product_cards:
+                                logger.warning(f"No products found on page {page}")
+                                break
+
+                            product_urls = []
+                            for product_card in product_cards:
+                                try:
+                                    # Extract product URL
+                                    product_url_tag = PLAN["card_link"].live(product_card)[0]
+                                    product_urls.append(product_url_tag.get_attribute("href"))
+                                except Exception as e:
+                                    logger.error(f"Error processing product card: {e}")
 
-                        # Try multiple product card selectors
-                        product_cards_selectors = ["div.slAVV4"]
-                        product_cards = None
-                        for selector in product_cards_selectors:
-                            try:
-                                product_cards = WebDriverWait(self.browser, 10).until(
-                                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-                                )
-                                if product_cards:
-                                    break
-                            except TimeoutException:
+                        logger.info(f"Found {len(product_urls)} products on page {page}")
+                        page_products = {}
+                        for product_url in product_urls:
+                            if not product_url or product_url in scraped_products or product_url in page_products:
                                 continue
-
-                        if not product_cards:
-                            logger.warning(f"No products found on page {page}")
-                            break
-
-                        logger.info(f"Found {len(product_cards)} products on page {page}")
-                        for index, product_card in enumerate(product_cards):
                             product_data = self.create_product_data()
-                            try:
-                                # Extract product URL
-                                product_url_tag = product_card.find_element(By.TAG_NAME, "a")
-                                product_data["url"] = product_url_tag.get_attribute("href")
-                                if not product_data["url"] or product_data["url"] in scraped_products:
-                                    continue
-
-                                # Open product page
-                                self.browser.execute_script("window.open('');")
-                                self.browser.switch_to.window(self.browser.window_handles[-1])
-                                self.browser.get(product_data["url"])
-                                WebDriverWait(self.browser, 15).until(
-                                    lambda d: d.execute_script("return document.readyState") == "complete"
-                                )
-                                time.sleep(2)
-
-                                # Product title
-                                product_data["title"] = self.retry_extraction(
-                                    lambda: self.browser.find_element(By.CSS_SELECTOR, "span.VU-ZEz").text.strip()
-                                )
-                                if self.search_keyword.lower() not in product_data["title"].lower():
-                                    logger.info(f"Skipping non-matching product: {product_data['title']}")
-                                    self.browser.close()
-                                    self.browser.switch_to.window(self.browser.window_handles[0])
-                                    continue
-
-                                # Product price and currency
-                                product_data["exact_price"] = self.retry_extraction(
-                                    lambda: self.browser.find_element(By.CSS_SELECTOR, "div.Nx9bqj.CxhGGd").text.strip()
-                                )
-                                match = re.match(r'([^0-9]+)([0-9,]+)', product_data["exact_price"])
-                                if match:
-                                    product_data["currency"] = match.group(1)
-                                    product_data["exact_price"] = match.group(2).replace(",", "")
-
-                                # Product description
-                                product_data["description"] = self.retry_extraction(
-                                    lambda: " ".join([e.text.strip() for e in self.browser.find_elements(By.CSS_SELECTOR, "span.VU-ZEz") if e.text.strip()])
-                                )
-
-                                # Supplier (seller info)
-                                product_data["supplier"] = self.retry_extraction(
-                                    lambda: self.browser.find_element(By.CSS_SELECTOR, "div.cvCpHS").text.strip()
-                                )
-
-                                # Feedback (rating and reviews)
-                                product_data["feedback"]["rating"] = self.retry_extraction(
-                                    lambda: self.browser.find_element(By.CSS_SELECTOR, "div.XQDdHH._1Quie7").text.split()[0]
-                                )
-                                product_data["feedback"]["review"] = self.retry_extraction(
-                                    lambda: self.browser.find_element(By.CSS_SELECTOR, "span.Wphh3N span").text.strip()
-                                )
-
-                                # Discount information
-                                product_data["discount_information"] = self.retry_extraction(
-                                    lambda: self.browser.find_element(By.CSS_SELECTOR, "div.UkUFwK.WW8yVX").text.strip()
-                                )
-
-                                # Product images
-                                try:
-                                    images_elem = WebDriverWait(self.browser, 10).until(
-                                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.qOPjUY"))
-                                    )
-                                    img_buttons = images_elem.find_elements(By.CSS_SELECTOR, "li.YGoYIP")
-                                    for i, img_button in enumerate(img_buttons):
-                                        try:
-                                            self.browser.execute_script("arguments[0].scrollIntoView(true);", img_button)
-                                            img_button.click()
-                                            time.sleep(1)
-                                            wrapper = images_elem.find_element(By.CSS_SELECTOR, "div.vU5WPQ")
-                                            img_tag = wrapper.find_element(By.TAG_NAME, "img")
-                                            image_url = img_tag.get_attribute("src")
-                                            if i == 0:
-                                                product_data["image_url"] = image_url
-                                            if image_url not in product_data["images"]:
-                                                product_data["images"].append(image_url)
-                                        except Exception:
-                                            continue
-                                except Exception as e:
-                                    logger.warning(f"Error extracting images for {product_data['title']}: {e}")
+                            product_data["url"] = product_url
+                            page_products[product_url] = product_data
 
-                                # Specifications
-                                try:
-                                    WebDriverWait(self.browser, 10).until(
-                                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.GNDEQ-"))
-                                    )
-                                    table_html = self.browser.find_element(By.CSS_SELECTOR, "div.GNDEQ-").get_attribute("innerHTML")
-                                    soup = BeautifulSoup(table_html, "html.parser")
-                                    rows = soup.select("tr.WJdYP6")
-                                    product_data["specifications"] = {}
-                                    for row in rows:
-                                        try:
-                                            label = row.select_one("td.col-3-12").get_text(strip=True)
-                                            value = ", ".join(li.get_text(strip=True) for li in row.select("td.col-9-12 li"))
-                                            if label:
-                                                product_data["specifications"][label] = value
-                                        except Exception:
-                                            continue
-                                except Exception as e:
-                                    logger.warning(f"Error extracting specifications for {product_data['title']}: {e}")
-
-                                scraped_products[product_data["url"]] = product_data
-                                logger.info(f"Successfully scraped product: {product_data['title']}")
-
-                            except Exception as e:
-                                logger.error(f"Error processing product page {product_data['url']}: {e}")
-                            finally:
-                                if len(self.browser.window_handles) > 1:
-                                    try:
-                                        self.browser.close()
-                                        self.browser.switch_to.window(self.browser.window_handles[0])
-                                    except Exception as e:
-                                        logger.warning(f"Error switching windows: {e}")
+                        # Product pages load side by side in reusable tabs
+                        self.detail_tabs.fetch(list(page_products.items()), on_product_page, condition=condition("flipkart", "detail"))
+                        logger.info(f"Page {page} network: {page_stats(self.browser)}")
                         break
                     except TimeoutException:
                         logger.error(f"Timeout on page {page}, attempt {attempt + 1}")
@@ -275,10 +205,7 @@ class FlipkartScraper:
         except Exception as e:
             logger.error(f"Unexpected error during scraping: {e}")
         finally:
-            try:
-                self.browser.quit()
-            except Exception as e:
-                logger.warning(f"Error closing browser: {e}")
+            self.close()
         self.scraped_data = list(scraped_products.values())
         return self.scraped_data
 
@@ -402,8 +329,11 @@ def scrape():
         output_file = os.path.join(os.path.expanduser("~/Desktop"), f"output_flipkart_{safe_keyword}_{timestamp}.json")
 
         scraper = FlipkartScraper(keyword, pages, output_file)
-        scraper.scraped_data = scraper.scrape_products()
-        result = scraper.save_results()
+        try:
+            scraper.scraped_data = scraper.scrape_products()
+            result = scraper.save_results()
+        finally:
+            scraper.close()
 
         response = app.response_class(
             response=json.dumps(result, ensure_ascii=False),
@@ -424,7 +354,11 @@ def health():
     return jsonify({
         "status": "ok",
         "timestamp": datetime.now().isoformat(),
-        "uptime": time.time() - app.start_time
+        "uptime": time.time() - app.start_time,
+        "browser_pool": get_pool().stats(),
+        "resource_blocking": blocking_totals(),
+        "extraction_retries": retry_stats(),
+        "selectors": selector_plans.stats()
     })
 
 def check_dependencies():
@@ -449,4 +383,5 @@ if __name__ == '__main__':
     app.start_time = time.time()
     if not check_dependencies():
         logger.error("Server started but dependencies are missing. Some features may not work.")
+    warm_up()
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
\ No newline at end of file
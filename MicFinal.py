@@ -5,18 +5,21 @@ import logging
 import sys
 from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
-from bs4 import BeautifulSoup
-from selenium import webdriver
+from html_parser import parse as parse_html, capture_regions
+import madeinchina_extract
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
 from datetime import datetime
 from collections import OrderedDict
 import sanitize_filename
+from retry_policy import extract as extract_field, stats as retry_stats
 import random
+from detail_tabs import DetailTabs
+from http_fetch import fetch_soup
+from parse_pipeline import ParsePipeline, totals as parse_totals
+from resource_blocking import apply_profile, page_stats, totals as blocking_totals
+from readiness import condition, wait_until_ready, wait_for_quiet
+from driver_pool import acquire_driver, release_driver, get_pool, warm_up
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -31,6 +34,9 @@ def setup_logging():
     )
     return time.strftime("%Y%m%d_%H%M%S")
 
+# Detail page regions the extractors read; slide videos are data-only scripts and survive pruning
+DETAIL_REGIONS = [".basic-info-list", "div.sr-proMainInfo-slide-container", "a.J-company-review"]
+
 # Scraper class
 class MadeInChinaScraper:
     def __init__(self, search_keyword, max_pages=1, output_file=None):
@@ -46,28 +52,29 @@ class MadeInChinaScraper:
             "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.81 Safari/537.36"
         ]
         self.browser = self._setup_browser()
+        self.detail_tabs = DetailTabs(self.browser)
+        self.pipeline = ParsePipeline("madeinchina", search_keyword)
 
     def _setup_browser(self):
-        """Configure and return a Selenium WebDriver instance"""
-        options = webdriver.ChromeOptions()
-        options.add_argument("--ignore-certificate-errors")
-        options.add_argument("--log-level=3")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--headless=new")
-        options.add_argument("--disable-extensions")
-        options.add_argument(f"user-agent={random.choice(self.user_agents)}")
+        """Check out a warm Selenium WebDriver instance from the shared pool"""
         try:
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=options)
-            driver.maximize_window()
+            driver = acquire_driver()
+            apply_profile(driver, "madeinchina")
+            logging.info("Chrome WebDriver checked out from pool.")
             return driver
-        except WebDriverException as e:
+        except (WebDriverException, TimeoutError) as e:
             logging.error(f"Failed to initialize WebDriver: {e}")
             raise
 
+    def close(self):
+        """Return the WebDriver to the shared pool"""
+        if self.browser:
+            try:
+                release_driver(self.browser)
+            except Exception as e:
+                logging.warning(f"Error closing browser: {e}")
+            self.browser = None
+
     def rotate_user_agent(self):
         """Change the user agent to avoid detection"""
         try:
@@ -79,175 +86,68 @@ class MadeInChinaScraper:
         except Exception as e:
             logging.warning(f"Failed to rotate user agent: {e}")
 
-    def retry_extraction(self, func, attempts=2, delay=0.5, default=""):
-        """Retry a function with specified attempts and delay"""
-        for i in range(attempts):
-            try:
-                result = func()
-                if result:
-                    return result
-            except Exception as e:
-                logging.debug(f"Retry {i+1}/{attempts} failed: {e}")
-                time.sleep(delay)
-        return default
+    def retry_extraction(self, func, attempts=2, delay=0.5, default="", field=None, live=False):
+        """Extract a field once from a parsed page, or with bounded retries when live reads the browser."""
+        return extract_field(func, default, f"madeinchina.{field or 'unnamed'}", live, attempts, delay)
 
     def create_product_data(self):
         """Create an ordered dictionary with field order preserved"""
-        return OrderedDict([
-            ("url", ""),
-            ("title", ""),
-            ("currency", ""),
-            ("exact_price", ""),
-            ("min_order", ""),
-            ("supplier", ""),
-            ("origin", ""),
-            ("feedback", OrderedDict([("rating", ""), ("star count", "0")])),
-            ("specifications", {}),
-            ("images", []),
-            ("videos", []),
-            ("website_name", "MadeinChina"),
-            ("discount_information", "N/A"),
-            ("brand_name", "N/A")
-        ])
+        return OrderedDict(madeinchina_extract.new_record())
+
+    def scrape_product_page(self, url, product_json_data):
+        """Queue the product page loaded in the current tab for extraction into product_json_data"""
+        try:
+            self.browser.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            wait_for_quiet(self.browser)
+            # One snapshot holds everything the extractors read, the company review widget included;
+            # the tab is free for the next product while a parse worker extracts it
+            markup = capture_regions(self.browser, DETAIL_REGIONS)
+            self.pipeline.submit("detail", markup, url, product_json_data, on_result=product_json_data.update)
+        except Exception as e:
+            logging.error(f"Error processing product page: {e}")
 
     def scrape_products(self):
         """Main scraping function"""
         for page in range(1, self.max_pages + 1):
             for attempt in range(self.retries):
                 try:
-                    self.rotate_user_agent()
                     search_url = f'https://www.made-in-china.com/multi-search/{self.search_keyword.replace(" ", "+")}/F1/{page}.html?pv_id=1ik76htapa40&faw_id=null'
                     logging.info(f"Scraping page {page}/{self.max_pages}: {search_url}")
-                    self.browser.get(search_url)
-                    WebDriverWait(self.browser, 8).until(
-                        lambda d: d.execute_script("return document.readyState") == "complete"
-                    )
-                    try:
-                        captcha = self.browser.find_element(By.XPATH, '//form[contains(@action, "captcha")]')
-                        logging.warning(f"CAPTCHA detected on page {page}!")
-                        break
-                    except NoSuchElementException:
-                        logging.info(f"No CAPTCHA detected on page {page}, proceeding...")
-                    product_cards_container = WebDriverWait(self.browser, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, '.prod-list'))
-                    )
-                    if not product_cards_container:
-                        logging.warning(f"No products found on page {page}")
-                        break
-
-                    product_cards_html = BeautifulSoup(product_cards_container.get_attribute("outerHTML"), "html.parser")
-                    product_cards = product_cards_html.select("div.prod-info")
-
-                    for product in product_cards:
-                        product_json_data = self.create_product_data()
+                    # Search results are server-rendered; Chrome is only needed when the plain GET is blocked
+                    listing_soup = fetch_soup(search_url, required=[madeinchina_extract.PLAN["card"].css()], headers={"User-Agent": random.choice(self.user_agents)})
+                    if listing_soup:
+                        logging.info(f"Fetched page {page} via HTTP")
+                        product_cards_html = madeinchina_extract.PLAN["card_list"].first(listing_soup)
+                    else:
+                        self.rotate_user_agent()
+                        self.browser.get(search_url)
                         try:
-                            product_link = product.select_one('.product-name a[href]')
-                            if product_link:
-                                product_url = product_link['href']
-                                if product_url.startswith('//'):
-                                    product_url = 'https:' + product_url
-                                product_json_data["url"] = product_url
-
-                            product_title_elem = product.select_one('.product-name[title]')
-                            if product_title_elem:
-                                product_json_data["title"] = product_title_elem['title'].strip()
-
-                            if product_json_data["url"] in self.scraped_products:
-                                continue
-
-                            currency_price_elem = product.select_one('.product-property .price-info .price')
-                            if currency_price_elem:
-                                currency_price_text = currency_price_elem.get_text(strip=True)
-                                currency = ''.join(c for c in currency_price_text if not c.isdigit() and c not in ['.', '-', ' ']).strip()
-                                product_json_data["currency"] = currency
-                                product_json_data["exact_price"] = currency_price_text.replace(currency, '').strip()
-
-                            for info_elem in product.select('div.info'):
-                                if '(MOQ)' in info_elem.text:
-                                    min_order_text = info_elem.text.strip()
-                                    product_json_data["min_order"] = min_order_text.replace('(MOQ)', '').strip()
-                                    break
-
-                            supplier_elem = product.select_one('.company-name-wrapper .compnay-name span')
-                            if supplier_elem:
-                                product_json_data["supplier"] = supplier_elem.get_text(strip=True)
-
-                            if product_json_data["url"]:
-                                try:
-                                    self.browser.execute_script(f"window.open('{product_json_data['url']}');")
-                                    self.browser.switch_to.window(self.browser.window_handles[-1])
-                                    WebDriverWait(self.browser, 8).until(
-                                        lambda d: d.execute_script("return document.readyState") == "complete"
-                                    )
-                                    self.browser.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                                    time.sleep(1)
-                                    product_page_html = BeautifulSoup(self.browser.page_source, "html.parser")
-
-                                    product_origin_info = product_page_html.select_one('.basic-info-list')
-                                    if product_origin_info:
-                                        for item in product_origin_info.select('div.bsc-item.cf'):
-                                            label = item.select_one('div.bac-item-label.fl')
-                                            if label and 'Origin' in label.text:
-                                                value = item.select_one('div.bac-item-value.fl')
-                                                if value:
-                                                    product_json_data["origin"] = value.get_text(strip=True)
-
-                                    try:
-                                        rating_elem = WebDriverWait(self.browser, 5).until(
-                                            EC.presence_of_element_located((By.CSS_SELECTOR, "a.J-company-review .review-score"))
-                                        )
-                                        rating_text = rating_elem.text
-                                        star_elems = self.browser.find_elements(By.CSS_SELECTOR, "a.J-company-review .review-rate i")
-                                        product_json_data["feedback"]["rating"] = rating_text
-                                        product_json_data["feedback"]["star count"] = str(len(star_elems))
-                                    except (NoSuchElementException, TimeoutException):
-                                        product_json_data["feedback"]["rating"] = "No rating available"
-                                        product_json_data["feedback"]["star count"] = "0"
-
-                                    specifications = {}
-                                    try:
-                                        rows = self.browser.find_elements(By.XPATH, "//div[@class='basic-info-list']/div[@class='bsc-item cf']")
-                                        for row in rows:
-                                            label_div = row.find_element(By.XPATH, ".//div[contains(@class,'bac-item-label')]")
-                                            value_div = row.find_element(By.XPATH, ".//div[contains(@class,'bac-item-value')]")
-                                            label = label_div.text.strip()
-                                            value = value_div.text.strip()
-                                            if label and value:
-                                                specifications[label] = value
-                                        product_json_data["specifications"] = specifications
-                                    except Exception as e:
-                                        logging.error(f"Error extracting specifications: {e}")
-
-                                    swiper = product_page_html.select_one("div.sr-proMainInfo-slide-container")
-                                    if swiper:
-                                        wrapper = swiper.select_one("div.swiper-wrapper")
-                                        if wrapper:
-                                            for media in wrapper.select("div.sr-prMainInfo-slide-inner"):
-                                                for vid in media.select("script[type='text/data-video']"):
-                                                    try:
-                                                        video_data = json.loads(vid.get_text(strip=True))
-                                                        if video_data.get("videoUrl"):
-                                                            product_json_data["videos"].append(video_data["videoUrl"])
-                                                    except Exception:
-                                                        pass
-                                                for img in media.select("img[src]"):
-                                                    src = img["src"]
-                                                    if src.startswith("//"):
-                                                        src = "https:" + src
-                                                    product_json_data["images"].append(src)
-
-                                except Exception as e:
-                                    logging.error(f"Error processing product page: {e}")
-                                finally:
-                                    if len(self.browser.window_handles) > 1:
-                                        self.browser.close()
-                                        self.browser.switch_to.window(self.browser.window_handles[0])
-
-                            self.scraped_products[product_json_data["url"]] = product_json_data
-
-                        except Exception as e:
-                            logging.error(f"Error processing product: {e}")
-
+                            captcha = self.browser.find_element(By.XPATH, '//form[contains(@action, "captcha")]')
+                            logging.warning(f"CAPTCHA detected on page {page}!")
+                            break
+                        except NoSuchElementException:
+                            logging.info(f"No CAPTCHA detected on page {page}, proceeding...")
+                        wait_until_ready(self.browser, "madeinchina", "search", timeout=8)
+                        product_cards_container = madeinchina_extract.PLAN["card_list"].live(self.browser)
+                        if not product_cards_container:
+                            logging.warning(f"No products found on page {page}")
+                            break
+
+                        product_cards_html = parse_html(product_cards_container[0].get_attribute("outerHTML"))
+                    product_cards = madeinchina_extract.PLAN["card"].values(product_cards_html)
+
+                    page_products = []
+                    for product in product_cards:
+                        product_json_data = madeinchina_extract.extract_card(product, self.search_keyword)
+                        if product_json_data["url"] in self.scraped_products:
+                            continue
+                        self.scraped_products[product_json_data["url"]] = product_json_data
+                        if product_json_data["url"]:
+                            page_products.append((product_json_data["url"], product_json_data))
+
+                    # Product pages load side by side in reusable tabs
+                    self.detail_tabs.fetch(page_products, self.scrape_product_page, condition=condition("madeinchina", "detail"))
+                    logging.info(f"Page {page} network: {page_stats(self.browser)}")
                     break
                 except Exception as e:
                     logging.error(f"Attempt {attempt + 1}/{self.retries}: Error scraping page {page}: {e}")
@@ -255,6 +155,8 @@ class MadeInChinaScraper:
             else:
                 logging.error(f"Failed to scrape page {page} after {self.retries} attempts.")
 
+        # Records are complete once the parse workers have delivered every queued product page
+        self.pipeline.join()
         return list(self.scraped_products.values())
 
     def save_results(self):
@@ -306,10 +208,7 @@ class MadeInChinaScraper:
                 ("data", [])
             ])
         finally:
-            try:
-                self.browser.quit()
-            except Exception as e:
-                logging.warning(f"Error closing browser: {e}")
+            self.close()
 
 # API endpoint to scrape Made-in-China
 @app.route('/api/scrape', methods=['POST'])
@@ -378,8 +277,11 @@ def scrape():
         output_file = os.path.join(os.path.expanduser("~/Desktop"), f"output_madeinchina_{safe_keyword}_{timestamp}.json")
 
         scraper = MadeInChinaScraper(keyword, pages, output_file)
-        products = scraper.scrape_products()
-        result = scraper.save_results()
+        try:
+            products = scraper.scrape_products()
+            result = scraper.save_results()
+        finally:
+            scraper.close()
 
         response = app.response_class(
             response=json.dumps(result, ensure_ascii=False),
@@ -401,7 +303,11 @@ def health():
     return jsonify({
         "status": "ok",
         "timestamp": datetime.now().isoformat(),
-        "uptime": time.time() - app.start_time
+        "uptime": time.time() - app.start_time,
+        "browser_pool": get_pool().stats(),
+        "resource_blocking": blocking_totals(),
+        "extraction_retries": retry_stats(),
+        "extraction_pipeline": parse_totals()
     })
 
 # Check dependencies
@@ -425,4 +331,5 @@ if __name__ == "__main__":
     app.start_time = time.time()
     if not check_dependencies():
         logging.error("Server started but dependencies are missing. Some features may not work.")
+    warm_up()
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)), debug=False)
\ No newline at end of file
@@ -1,6 +1,5 @@
 import time
 import json
-import re
 import logging
 import os
 import random
@@ -8,18 +7,22 @@ from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
 from pathlib import Path
 from datetime import datetime
-from urllib.parse import quote, urljoin
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+from urllib.parse import quote
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, WebDriverException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import WebDriverException
+from html_parser import capture_regions, parse_regions
+from parse_pipeline import ParsePipeline, totals as parse_totals
+import selector_plans
+import alibaba_extract
+import image_dimensions
 from collections import OrderedDict
 import sanitize_filename
+from detail_tabs import DetailTabs
+from resource_blocking import apply_profile, page_stats, totals as blocking_totals
+from readiness import condition, wait_until_ready, wait_for_quiet
+from network_capture import capture_products
+from driver_pool import acquire_driver, release_driver, get_pool, warm_up
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -34,6 +37,9 @@ def setup_logging():
     )
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
+# Detail page layouts vary too much to pin regions, so the whole body is taken with scripts pruned
+DETAIL_REGIONS = ["body"]
+
 # Scraper class
 class AlibabaScraper:
     def __init__(self, search_keyword: str, max_pages: int = 5, output_file: str = None):
@@ -53,55 +59,21 @@ class AlibabaScraper:
         ]
         self.driver = None
         self.wait = None
+        self.detail_tabs = None
         self.base_url = "https://www.alibaba.com"
-        self.selectors = {
-            "product_card": ".j-offer-wrapper, .offer-wrapper, .organic-list-offer-outter, .search-card-item, .organic-gallery-offer-outter, .m-gallery-product-item-v2, div[class*='offer'], div[class*='card']",
-            "product_link": "a.elements-title-normal__link, a.organic-gallery-title__link, a[href*='product-detail'], a[class*='title'], a",
-            "next_page": ".organic-gallery-offer-pagination a.next, a.next-pagination-item, a[class*='next'], [aria-label*='next'], a[rel='next']",
-            "title": "h1.product-title, h2.organic-gallery-title, .elements-title-normal__content, a[class*='title'], div[class*='title']",
-            "price": ".elements-offer-price-normal__price, .organic-gallery-offer-section__offer-price, div[class*='price'], span[class*='price']",
-            "description": "div[class*='desc'], div.product-detail-description, div[class*='text']",
-            "detail_description": "div.product-main-description, div.detail-desc-decorate-richtext, div[class*='description'], div[class*='detail-content']",
-            "supplier": ".company-name-wrapper, .company-name, div[class*='company'], div[class*='supplier']",
-            "origin": "span.origin, div.product-shipping-location, div[class*='location'], div[class*='place']",
-            "feedback": ".rating-info, .rating, div[class*='rating'], span[class*='rating']",
-            "discount": "span.discount, div[class*='discount'], div[class*='promo']",
-            "image": "img.main-image, img[src*='product'], img[class*='image'], img[src], img[data-src]",
-            "detail_images": ".detail-gallery img, .thumb-list img, img[src*='product'], .main-image img",
-            "detail_specs": ".product-props-list, .spec-table, div[class*='specification'], .attribute-list",
-            "video": "video, video[src], div[class*='video']",
-            "captcha": "div[class*='captcha'], iframe[src*='captcha'], div[class*='verify'], div[class*='slider'], .nc_wrapper"
-        }
+        self.plan = selector_plans.load("alibaba")
+        self.pipeline = ParsePipeline("alibaba", self.original_keyword)
         self._setup_driver()
 
     def _setup_driver(self):
-        """Set up Selenium WebDriver with Chrome."""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument(f"--window-size={random.randint(1600, 1920)},{random.randint(900, 1080)}")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--log-level=3")
-        chrome_options.add_argument(f"user-agent={random.choice(self.user_agents)}")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option("useAutomationExtension", False)
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--start-maximized")
+        """Check out a warm Selenium WebDriver from the shared pool."""
         try:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-                "source": """
-                    Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-                    window.navigator.chrome = { runtime: {} };
-                    Object.defineProperty(navigator, 'platform', { get: () => 'Win32' });
-                """
-            })
+            self.driver = acquire_driver()
+            apply_profile(self.driver, "alibaba")
             self.wait = WebDriverWait(self.driver, 15)
-            logging.info("WebDriver initialized")
-        except WebDriverException as e:
+            self.detail_tabs = DetailTabs(self.driver)
+            logging.info("WebDriver checked out from pool")
+        except (WebDriverException, TimeoutError) as e:
             logging.error(f"Failed to initialize WebDriver: {e}")
             raise
 
@@ -114,11 +86,33 @@ class AlibabaScraper:
         except Exception as e:
             logging.warning(f"Failed to rotate user agent: {e}")
 
+    def scrape_listing_cards(self, page: int) -> bool:
+        """Scrape the product cards rendered on a search page; False when no cards are found."""
+        # Every card comes from one capture of the result list, parsed once
+        listing_soup = parse_regions(self.driver, [self.plan["product_card"].css()])
+        working_selector, cards = next(self.plan["product_card"].matches(listing_soup), (None, []))
+        if not cards:
+            logging.error(f"No products found on page {page}")
+            return False
+        logging.info(f"Total cards found on page {page} with selector {working_selector}: {len(cards)}")
+        products = []
+        for card_soup in cards:
+            record = alibaba_extract.extract_card(card_soup, self.original_keyword)
+            if record is None:
+                continue
+            product_data = self.create_product_data()
+            product_data.update(record)
+            products.append(product_data)
+        # Images are measured while the search page is still the current tab
+        image_dimensions.measure_records(self.driver, products)
+        self.complete_products(products, page)
+        return True
+
     def handle_anti_bot_checks(self) -> bool:
         """Detect CAPTCHA presence."""
         try:
-            time.sleep(random.uniform(1, 2))
-            captcha_elements = self.driver.find_elements(By.CSS_SELECTOR, self.selectors["captcha"])
+            wait_for_quiet(self.driver, quiet_ms=500)
+            captcha_elements = self.driver.find_elements(By.CSS_SELECTOR, self.plan["captcha"].css())
             if captcha_elements:
                 logging.warning("CAPTCHA detected!")
                 return False
@@ -132,31 +126,13 @@ class AlibabaScraper:
         """Perform simple scrolling to load content."""
         try:
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(random.uniform(1, 2))
+            wait_for_quiet(self.driver)
         except Exception as e:
             logging.warning(f"Error during scrolling: {e}")
 
     def create_product_data(self):
         """Create an ordered dictionary with field order preserved."""
-        return OrderedDict([
-            ("url", None),
-            ("title", None),
-            ("currency", None),
-            ("exact_price", None),
-            ("description", None),
-            ("min_order", None),
-            ("supplier", None),
-            ("origin", None),
-            ("feedback", OrderedDict([("rating", None), ("review", None)])),
-            ("image_url", None),
-            ("images", None),
-            ("videos", None),
-            ("dimensions", None),
-            ("website_name", "Alibaba"),
-            ("discount_information", None),
-            ("brand_name", None),
-            ("specifications", {})
-        ])
+        return OrderedDict(alibaba_extract.new_record())
 
     def scrape_products(self) -> list:
         """Main scraping logic."""
@@ -173,384 +149,80 @@ class AlibabaScraper:
                 logging.info(f"Scraping page {page}/{self.max_pages}: {url}")
                 self.rotate_user_agent()
                 self.driver.get(url)
-                self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+                wait_until_ready(self.driver, "alibaba", "search")
                 if not self.handle_anti_bot_checks():
                     logging.error(f"Failed anti-bot checks on page {page}")
                     continue
                 self.human_like_scroll()
-                working_selector = None
-                for selector in self.selectors["product_card"].split(", "):
-                    try:
-                        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        if elements:
-                            working_selector = selector
-                            logging.info(f"Found {len(elements)} elements with selector: {selector}")
-                            break
-                    except TimeoutException:
-                        logging.debug(f"Selector {selector} failed")
-                        continue
-                if not working_selector:
-                    logging.error(f"No products found on page {page}")
+                # Search results can be read from the JSON responses the page already downloaded
+                captured = capture_products(self.driver, "alibaba")
+                if captured:
+                    self.complete_products([self.product_from_capture(record) for record in captured], page)
+                elif not self.scrape_listing_cards(page):
                     continue
-                cards = self.driver.find_elements(By.CSS_SELECTOR, working_selector)
-                logging.info(f"Total cards found on page {page}: {len(cards)}")
-                for idx, card_elem in enumerate(cards):
-                    product_data = self.create_product_data()
-                    try:
-                        card_html = card_elem.get_attribute("outerHTML")
-                        card_soup = BeautifulSoup(card_html, "html.parser")
-                    except StaleElementReferenceException:
-                        logging.warning(f"Stale element for card {idx}. Skipping.")
-                        continue
-                    title = None
-                    for selector in self.selectors["title"].split(", "):
-                        if title_el := card_soup.select_one(selector):
-                            title = title_el.get_text(strip=True)
-                            break
-                    if not title:
-                        logging.warning(f"No title found for card {idx}")
-                        continue
-                    product_data["title"] = self.clean_title(title)
-                    product_url = None
-                    for selector in self.selectors["product_link"].split(", "):
-                        if a_tag := card_soup.select_one(selector):
-                            product_url = a_tag.get("href", None)
-                            break
-                    if not product_url:
-                        logging.warning(f"No URL found for {product_data['title']}")
-                        continue
-                    if product_url.startswith('//'):
-                        product_url = f"https:{product_url}"
-                    elif not product_url.startswith(('http://', 'https://')):
-                        product_url = urljoin(self.base_url, product_url)
-                    if "?" in product_url:
-                        product_url = product_url.split("?")[0]
-                    product_data["url"] = product_url
-                    product_data.update(self.extract_price(card_soup, product_data["title"]))
-                    product_data["min_order"] = self.extract_min_order(card_soup, product_data["title"])
-                    product_data["supplier"] = self.extract_supplier(card_soup, product_data["title"])
-                    product_data["feedback"] = self.extract_feedback(card_soup, product_data["title"])
-                    product_data["discount_information"] = self.extract_discount(card_soup, product_data["title"])
-                    product_data["brand_name"] = self.extract_brand(product_data["title"])
-                    image_data = self.extract_images(card_soup, card_elem, product_data["title"])
-                    product_data.update(image_data)
-                    try:
-                        detail_data = self.extract_detail_page(product_data["url"], product_data["title"])
-                        product_data["description"] = detail_data["description"]
-                        product_data["videos"] = detail_data["videos"]
-                        product_data["specifications"] = detail_data["specifications"]
-                        product_data["origin"] = detail_data["origin"]
-                        if detail_data["images"]:
-                            product_data["images"] = list(set((product_data["images"] or []) + detail_data["images"]))[:5]
-                            if not product_data["image_url"] and product_data["images"]:
-                                product_data["image_url"] = product_data["images"][0]
-                    except Exception as e:
-                        logging.error(f"Failed to extract detail page for {product_data['title']}: {e}")
-                    if product_data["title"] and product_data["url"]:
-                        self.scraped_data.append(product_data)
-                        logging.info(f"Scraped product on page {page}: {product_data['title']}")
-                    self.driver.get(url)
-                    self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                    time.sleep(random.uniform(1, 2))
+                logging.info(f"Page {page} network: {page_stats(self.driver)}")
                 if page < self.max_pages:
                     try:
                         next_button = None
-                        for selector in self.selectors["next_page"].split(", "):
-                            try:
-                                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                                for elem in elements:
-                                    if elem.is_displayed() and elem.is_enabled():
-                                        next_button = elem
-                                        break
-                                if next_button:
-                                    break
-                            except NoSuchElementException:
-                                continue
+                        for _, elements in self.plan["next_page"].live_matches(self.driver):
+                            next_button = next((elem for elem in elements if elem.is_displayed() and elem.is_enabled()), None)
+                            if next_button:
+                                break
                         if not next_button:
                             logging.info("Next page button not found, stopping pagination")
                             break
                         self.driver.execute_script("arguments[0].click();", next_button)
-                        time.sleep(random.uniform(2, 3))
+                        wait_for_quiet(self.driver)
                     except Exception as e:
                         logging.info(f"Error finding next page button: {e}")
                         break
         except Exception as e:
             logging.error(f"Scraping error: {e}")
+        # Records are complete once the parse workers have delivered every queued detail page
+        self.pipeline.join()
         return self.scraped_data
 
-    def clean_title(self, title: str) -> str:
-        """Clean and normalize product title."""
-        if not title:
-            return ""
-        title = re.sub(r'<[^>]+>', '', title)
-        title = re.sub(r'[^\w\s,()&-]', ' ', title)
-        title = " ".join(title.split())
-        if self.search_keyword.lower() not in title.lower():
-            title += f" {self.original_keyword.capitalize()}"
-        if len(title) > 100:
-            title = title[:97] + "..."
-        return title
-
-    def extract_price(self, soup: BeautifulSoup, title: str) -> dict:
-        """Extract currency and exact price."""
-        try:
-            for selector in self.selectors["price"].split(", "):
-                if price_el := soup.select_one(selector):
-                    raw_price = price_el.get_text(strip=True)
-                    if "Contact Supplier" in raw_price or "Negotiable" in raw_price:
-                        return {"currency": None, "exact_price": "Ask Price"}
-                    currency = None
-                    currency_symbols = ["$", "€", "¥", "£", "US$", "CNY", "₹"]
-                    for symbol in currency_symbols:
-                        if symbol in raw_price:
-                            currency = symbol
-                            break
-                    price_pattern = r'[\d,]+(?:\.\d+)?'
-                    price_matches = re.findall(price_pattern, raw_price)
-                    price_values = [re.sub(r'[^\d.]', '', p) for p in price_matches]
-                    if price_values:
-                        return {"currency": currency, "exact_price": price_values[0]}
-                    break
-            logging.warning(f"No price found for {title}")
-            return {"currency": None, "exact_price": None}
-        except Exception as e:
-            logging.error(f"Error extracting price for {title}: {e}")
-            return {"currency": None, "exact_price": None}
+    def complete_products(self, products: list, page: int) -> None:
+        """Merge detail page data into a page's listing records and keep those with a title and URL.
 
-    def extract_min_order(self, soup: BeautifulSoup, title: str) -> str:
-        """Extract minimum order quantity and unit."""
+        Detail pages load side by side in their own tabs; the search page stays open in the listing
+        tab, so pagination continues from it without reloading.
+        """
+        products = [product_data for product_data in products if product_data["title"] and product_data["url"]]
         try:
-            for selector in self.selectors["discount"].split(", "):
-                if moq_el := soup.select_one(selector):
-                    text = moq_el.get_text(strip=True)
-                    qty_pattern = r'(\d+)'
-                    qty_match = re.search(qty_pattern, text)
-                    qty = qty_match.group(1) if qty_match else None
-                    unit_pattern = r'([A-Za-z]+)'
-                    unit_match = re.search(unit_pattern, text)
-                    unit = unit_match.group(1) if unit_match else None
-                    if qty and unit:
-                        return f"{qty} {unit}"
-                    return text or None
-            return None
+            self.detail_tabs.fetch(
+                [(product_data["url"], product_data) for product_data in products], self.parse_detail_page,
+                condition=condition("alibaba", "detail")
+            )
         except Exception as e:
-            logging.error(f"Error extracting min order for {title}: {e}")
-            return None
-
-    def extract_supplier(self, soup: BeautifulSoup, title: str) -> str:
-        """Extract supplier name."""
-        try:
-            for selector in self.selectors["supplier"].split(", "):
-                if elem := soup.select_one(selector):
-                    return elem.get_text(strip=True)
-            return None
-        except Exception as e:
-            logging.error(f"Error extracting supplier for {title}: {e}")
-            return None
-
-    def extract_origin(self, soup: BeautifulSoup, title: str) -> str:
-        """Extract product origin."""
-        try:
-            for selector in self.selectors["origin"].split(", "):
-                if origin_el := soup.select_one(selector):
-                    return origin_el.get_text(strip=True)
-            return None
-        except Exception as e:
-            logging.error(f"Error extracting origin for {title}: {e}")
-            return None
-
-    def extract_feedback(self, soup: BeautifulSoup, title: str) -> dict:
-        """Extract rating and review count."""
-        feedback = OrderedDict([("rating", None), ("review", None)])
-        try:
-            for selector in self.selectors["feedback"].split(", "):
-                if rating_el := soup.select_one(selector):
-                    rating_text = rating_el.get_text(strip=True)
-                    rating_match = re.search(r'([\d.]+)', rating_text)
-                    if rating_match:
-                        feedback["rating"] = rating_match.group(1)
-                        break
-            for selector in self.selectors["feedback"].split(", "):
-                if review_el := soup.select_one(selector):
-                    review_text = review_el.get_text(strip=True)
-                    review_match = re.search(r'\((\d+)\)', review_text)
-                    if review_match:
-                        feedback["review"] = review_match.group(1)
-                        break
-            return feedback
-        except Exception as e:
-            logging.error(f"Error extracting feedback for {title}: {e}")
-            return feedback
-
-    def extract_discount(self, soup: BeautifulSoup, title: str) -> str:
-        """Extract discount information."""
+            logging.error(f"Failed to extract detail pages on page {page}: {e}")
+        for product_data in products:
+            self.scraped_data.append(product_data)
+            logging.info(f"Scraped product on page {page}: {product_data['title']}")
+
+    def product_from_capture(self, record: dict) -> OrderedDict:
+        """Build a listing record from a product captured in the search JSON responses."""
+        product_data = self.create_product_data()
+        product_data.update(alibaba_extract.record_from_capture(record, self.original_keyword))
+        return product_data
+
+    def parse_detail_page(self, url: str, product_data: OrderedDict) -> None:
+        """Queue the detail page loaded in the current tab for extraction into product_data."""
         try:
-            for selector in self.selectors["discount"].split(", "):
-                if discount_el := soup.select_one(selector):
-                    return discount_el.get_text(strip=True)
-            return None
-        except Exception as e:
-            logging.error(f"Error extracting discount for {title}: {e}")
-            return None
-
-    def extract_brand(self, title: str) -> str:
-        """Extract brand from title."""
-        try:
-            title_lower = title.lower()
-            common_brands = ["dior", "sauvage", "creed", "ysl", "chanel", "gucci", "armani", "versace"]
-            for brand in common_brands:
-                if re.search(r'\b' + brand + r'\b', title_lower):
-                    return brand.capitalize()
-            return None
-        except Exception as e:
-            logging.error(f"Error extracting brand: {e}")
-            return None
-
-    def extract_images(self, soup: BeautifulSoup, card_elem, title: str) -> dict:
-        """Extract image_url, images, and dimensions."""
-        try:
-            images = []
-            image_url = None
-            dimensions = None
-            for selector in self.selectors["image"].split(", "):
-                img_elements = soup.select(selector)
-                if not img_elements:
-                    continue
-                for idx, img in enumerate(img_elements):
-                    src = img.get("src", "") or img.get("data-src", "") or img.get("data-lazy-src", "")
-                    if not src or any(x in src.lower() for x in ['placeholder', 'default', '.svg', 'noimage']):
-                        continue
-                    if src.startswith('//'):
-                        src = 'https:' + src
-                    elif not src.startswith(('http://', 'https://')):
-                        src = urljoin(self.base_url, src)
-                    if idx == 0:
-                        image_url = src
-                        width = height = "Unknown"
-                        try:
-                            img_elem = card_elem.find_element(By.CSS_SELECTOR, selector)
-                            width = self.driver.execute_script("return arguments[0].naturalWidth", img_elem) or img.get("width", "Unknown")
-                            height = self.driver.execute_script("return arguments[0].naturalHeight", img_elem) or img.get("height", "Unknown")
-                            dimensions = f"{width}x{height}"
-                        except Exception as e:
-                            logging.debug(f"Error getting image dimensions for {title}: {e}")
-                            dimensions = f"{img.get('width', 'Unknown')}x{img.get('height', 'Unknown')}"
-                    images.append(src)
-                if images:
-                    break
-            if images:
-                logging.info(f"Found {len(images)} images for {title}")
-                return {"image_url": image_url, "images": images[:5], "dimensions": dimensions}
-            logging.warning(f"No images found for {title}")
-            return {"image_url": None, "images": None, "dimensions": None}
-        except Exception as e:
-            logging.error(f"Error extracting images for {title}: {e}")
-            return {"image_url": None, "images": None, "dimensions": None}
-
-    def extract_videos(self, soup: BeautifulSoup, title: str) -> list:
-        """Extract video URLs."""
-        try:
-            videos = []
-            for selector in self.selectors["video"].split(", "):
-                for video_el in soup.find_all("video"):
-                    if src := video_el.get("src"):
-                        videos.append(src)
-            return videos if videos else None
-        except Exception as e:
-            logging.error(f"Error extracting videos for {title}: {e}")
-            return None
-
-    def extract_specifications(self, soup: BeautifulSoup, title: str) -> dict:
-        """Extract product specifications."""
-        specs = {}
-        try:
-            for selector in self.selectors["detail_specs"].split(", "):
-                for spec_elem in soup.select(selector):
-                    if selector == ".attribute-list":
-                        for item in spec_elem.select(".attribute-item"):
-                            key_elem = item.select_one(".left")
-                            value_elem = item.select_one(".right span")
-                            if key_elem and value_elem:
-                                key = key_elem.get_text(strip=True)
-                                value = value_elem.get_text(strip=True)
-                                if key and value and len(key) < 100 and len(value) < 500:
-                                    specs[key] = value
-                    else:
-                        for row in spec_elem.select("tr, li, div.do-entry-item"):
-                            cells = row.select("th, td, span.attr-name, span.attr-value")
-                            if len(cells) >= 2:
-                                key = cells[0].get_text(strip=True)
-                                value = cells[1].get_text(strip=True)
-                                if key and value and len(key) < 100 and len(value) < 500:
-                                    specs[key] = value
-                    if specs:
-                        break
-                if specs:
-                    break
-            return specs
-        except Exception as e:
-            logging.error(f"Error extracting specifications for {title}: {e}")
-            return {}
-
-    def extract_description(self, soup: BeautifulSoup, title: str) -> str:
-        """Extract product description."""
-        try:
-            for selector in self.selectors["detail_description"].split(", "):
-                if desc := soup.select_one(selector):
-                    return desc.get_text(strip=True)
-            return None
-        except Exception as e:
-            logging.error(f"Error extracting description for {title}: {e}")
-            return None
-
-    def extract_detail_page(self, url: str, title: str) -> dict:
-        """Extract data from product detail page."""
-        detail_data = {
-            "description": None,
-            "videos": None,
-            "specifications": {},
-            "images": [],
-            "origin": None
-        }
-        try:
-            self.driver.execute_script(f"window.open('{url}');")
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-            self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
             if not self.handle_anti_bot_checks():
                 logging.error(f"Failed anti-bot checks on detail page: {url}")
-                return detail_data
+                return
             self.human_like_scroll()
-            detail_html = self.driver.page_source
-            detail_soup = BeautifulSoup(detail_html, "html.parser")
-            detail_data["description"] = self.extract_description(detail_soup, title)
-            detail_data["videos"] = self.extract_videos(detail_soup, title)
-            detail_data["specifications"] = self.extract_specifications(detail_soup, title)
-            detail_data["origin"] = self.extract_origin(detail_soup, title)
-            valid_extensions = ('.jpg', '.jpeg', '.png', '.webp')
-            for selector in self.selectors["detail_images"].split(", "):
-                for img in detail_soup.select(selector):
-                    src = img.get("src", "") or img.get("data-src", "") or img.get("data-lazy-src", "")
-                    if not src or any(x in src.lower() for x in ['placeholder', 'default', '.svg', 'noimage']):
-                        continue
-                    if src.startswith('//'):
-                        src = 'https:' + src
-                    elif not src.startswith(('http://', 'https://')):
-                        src = urljoin(self.base_url, src)
-                    if src.lower().endswith(valid_extensions):
-                        src = src.replace("_.webp", "")
-                        if src not in detail_data["images"]:
-                            detail_data["images"].append(src)
-                if detail_data["images"]:
-                    break
-            detail_data["images"] = detail_data["images"][:5]
-            logging.info(f"Extracted detail page data for: {title}")
+            markup = capture_regions(self.driver, DETAIL_REGIONS)
+
+            def on_result(record):
+                product_data.update(record)
+                logging.info(f"Extracted detail page data for: {product_data['title']}")
+
+            # The tab moves on to the next page while a parse worker extracts this one
+            self.pipeline.submit("detail", markup, url, product_data, on_result=on_result)
         except Exception as e:
             logging.error(f"Error extracting detail page {url}: {e}")
-        finally:
-            if len(self.driver.window_handles) > 1:
-                self.driver.close()
-                self.driver.switch_to.window(self.driver.window_handles[0])
-        return detail_data
 
     def save_results(self) -> dict:
         """Save scraped data to JSON file and return results."""
@@ -604,11 +276,11 @@ class AlibabaScraper:
             self.close()
 
     def close(self):
-        """Close the WebDriver."""
+        """Return the WebDriver to the shared pool."""
         if self.driver:
             try:
-                self.driver.quit()
-                logging.info("Browser closed")
+                release_driver(self.driver)
+                logging.info("Browser returned to pool")
             except Exception as e:
                 logging.warning(f"Error closing browser: {e}")
             self.driver = None
@@ -680,8 +352,11 @@ def scrape():
         output_file = os.path.join(os.path.expanduser("~/Desktop"), f"output_alibaba_{safe_keyword}_{timestamp}.json")
 
         scraper = AlibabaScraper(keyword, pages, output_file)
-        products = scraper.scrape_products()
-        result = scraper.save_results()
+        try:
+            products = scraper.scrape_products()
+            result = scraper.save_results()
+        finally:
+            scraper.close()
 
         response = app.response_class(
             response=json.dumps(result, ensure_ascii=False),
@@ -703,7 +378,12 @@ def health():
     return jsonify({
         "status": "ok",
         "timestamp": datetime.now().isoformat(),
-        "uptime": time.time() - app.start_time
+        "uptime": time.time() - app.start_time,
+        "browser_pool": get_pool().stats(),
+        "resource_blocking": blocking_totals(),
+        "image_dimensions": image_dimensions.stats(),
+        "extraction_pipeline": parse_totals(),
+        "selectors": selector_plans.stats()
     })
 
 # Check dependencies
@@ -727,4 +407,5 @@ if __name__ == "__main__":
     app.start_time = time.time()
     if not check_dependencies():
         logging.error("Server started but dependencies are missing. Some features may not work.")
+    warm_up()
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)), debug=False)
\ No newline at end of file
@@ -0,0 +1,264 @@
+import logging
+import patterns
+import selector_plans
+import image_dimensions
+from urllib.parse import urljoin
+from extractors import as_soup, detail_record, run_steps
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://www.alibaba.com"
+
+# Search card and detail page selectors, declared in site_specs/alibaba.json
+PLAN = selector_plans.load("alibaba")
+
+COMMON_BRANDS = ("dior", "sauvage", "creed", "ysl", "chanel", "gucci", "armani", "versace")
+CURRENCY_SYMBOLS = ["$", "€", "¥", "£", "US$", "CNY", "₹"]
+PLACEHOLDER_MARKERS = ['placeholder', 'default', '.svg', 'noimage']
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+def new_record():
+    return {
+        "url": None,
+        "title": None,
+        "currency": None,
+        "exact_price": None,
+        "description": None,
+        "min_order": None,
+        "supplier": None,
+        "origin": None,
+        "feedback": {"rating": None, "review": None},
+        "image_url": None,
+        "images": None,
+        "videos": None,
+        "dimensions": None,
+        "website_name": "Alibaba",
+        "discount_information": None,
+        "brand_name": None,
+        "specifications": {}
+    }
+
+
+def clean_title(title, keyword=None):
+    """Clean and normalize product title."""
+    if not title:
+        return ""
+    title = patterns.HTML_TAG.sub('', title)
+    title = patterns.TITLE_SYMBOLS.sub(' ', title)
+    title = patterns.normalize_space(title)
+    if keyword and keyword.lower() not in title.lower():
+        title += f" {keyword.capitalize()}"
+    if len(title) > 100:
+        title = title[:97] + "..."
+    return title
+
+
+def parse_price_text(raw_price):
+    """Split a displayed price into currency and the first numeric value."""
+    if "Contact Supplier" in raw_price or "Negotiable" in raw_price:
+        return {"currency": None, "exact_price": "Ask Price"}
+    currency = next((symbol for symbol in CURRENCY_SYMBOLS if symbol in raw_price), None)
+    price_values = [patterns.NON_NUMERIC.sub('', p) for p in patterns.PRICE_NUMBER.findall(raw_price)]
+    if price_values:
+        return {"currency": currency, "exact_price": price_values[0]}
+    return None
+
+
+def brand_from_title(title):
+    brand = patterns.first_word(COMMON_BRANDS, title.lower())
+    return brand.capitalize() if brand else None
+
+
+def image_src(img):
+    """Absolute source of an image element, or "" for lazy placeholders."""
+    src = img.get("src", "") or img.get("data-src", "") or img.get("data-lazy-src", "")
+    if not src or any(x in src.lower() for x in PLACEHOLDER_MARKERS):
+        return ""
+    if src.startswith('//'):
+        return 'https:' + src
+    if not src.startswith(('http://', 'https://')):
+        return urljoin(BASE_URL, src)
+    return src
+
+
+def title(card, record, keyword):
+    raw_title = PLAN["title"].value(card)
+    if not raw_title:
+        logger.warning("No title found for card")
+        return False
+    record["title"] = clean_title(raw_title, keyword)
+
+
+def url(card, record, keyword):
+    product_url = PLAN["product_link"].value(card)
+    if not product_url:
+        logger.warning(f"No URL found for {record['title']}")
+        return False
+    if not product_url.startswith(('http://', 'https://')):
+        product_url = urljoin(BASE_URL, product_url)
+    record["url"] = product_url.split("?")[0]
+
+
+def price(card, record, keyword):
+    price_el = PLAN["price"].first(card)
+    parsed = parse_price_text(price_el.get_text(strip=True)) if price_el else None
+    if parsed:
+        record.update(parsed)
+    else:
+        logger.warning(f"No price found for {record['title']}")
+
+
+def min_order(card, record, keyword):
+    moq_el = PLAN["min_order"].first(card)
+    if moq_el:
+        text = moq_el.get_text(strip=True)
+        qty_match = patterns.DIGITS.search(text)
+        unit_match = patterns.UNIT_WORD.search(text)
+        record["min_order"] = f"{qty_match.group(1)} {unit_match.group(1)}" if qty_match and unit_match else text or None
+
+
+def supplier(card, record, keyword):
+    record["supplier"] = PLAN["supplier"].value(card)
+
+
+def feedback(card, record, keyword):
+    record["feedback"] = {"rating": PLAN["rating"].value(card), "review": PLAN["review"].value(card)}
+
+
+def discount(card, record, keyword):
+    record["discount_information"] = PLAN["discount"].value(card)
+
+
+def brand(card, record, keyword):
+    record["brand_name"] = brand_from_title(record["title"])
+
+
+def image_sources(card):
+    """(selector, [(index, img, src)]) of the first image selector with a usable source."""
+    for selector, img_elements in PLAN["image"].matches(card):
+        found = [(index, img, image_src(img)) for index, img in enumerate(img_elements)]
+        found = [entry for entry in found if entry[2]]
+        if found:
+            return selector, found
+    return None, []
+
+
+def images(card, record, keyword):
+    _, found = image_sources(card)
+    if not found:
+        logger.warning(f"No images found for {record['title']}")
+        return
+    index, first, src = found[0]
+    if index == 0:
+        record["image_url"] = src
+        record["dimensions"] = image_dimensions.known(src) or f"{first.get('width', 'Unknown')}x{first.get('height', 'Unknown')}"
+    record["images"] = [src for _, _, src in found][:5]
+    logger.info(f"Found {len(found)} images for {record['title']}")
+
+
+CARD_STEPS = (
+    ("title", title), ("url", url), ("price", price), ("min_order", min_order), ("supplier", supplier),
+    ("feedback", feedback), ("discount", discount), ("brand", brand), ("images", images),
+)
+
+
+def extract_card(card, keyword=None, timings=None):
+    """Listing record from one search result card, or None without a title or URL."""
+    record = new_record()
+    return record if run_steps(CARD_STEPS, card, record, keyword, timings) else None
+
+
+def extract_search(html, url, keyword=None, timings=None):
+    """Listing records of the result cards on a search page, from the first card selector that matches."""
+    _, cards = next(PLAN["product_card"].matches(as_soup(html)), (None, []))
+    records = (extract_card(card, keyword, timings) for card in cards)
+    return [record for record in records if record]
+
+
+def record_from_capture(captured, keyword=None):
+    """Listing record from a product captured in the search JSON responses."""
+    record = new_record()
+    record["title"] = clean_title(captured["title"], keyword)
+    record["url"] = captured["url"].split("?")[0]
+    if captured.get("price") is not None:
+        record.update(parse_price_text(str(captured["price"])) or {})
+    if captured.get("min_order") is not None:
+        record["min_order"] = str(captured["min_order"])
+    record["supplier"] = captured.get("supplier")
+    if captured.get("image"):
+        image_url = captured["image"]
+        if image_url.startswith("//"):
+            image_url = "https:" + image_url
+        record["image_url"] = image_url
+        record["images"] = [image_url]
+    record["brand_name"] = brand_from_title(record["title"])
+    return record
+
+
+def description(soup, record, keyword):
+    record["description"] = PLAN["detail_description"].value(soup)
+
+
+def videos(soup, record, keyword):
+    record["videos"] = PLAN["video"].values(soup) or None
+
+
+def specifications(soup, record, keyword):
+    specs = {}
+    for selector, spec_elems in PLAN["detail_specs"].matches(soup):
+        for spec_elem in spec_elems:
+            if selector == ".attribute-list":
+                pairs = [
+                    (item.select_one(".left"), item.select_one(".right span"))
+                    for item in spec_elem.select(".attribute-item")
+                ]
+            else:
+                pairs = [
+                    tuple(cells[:2]) for cells in (row.select("th, td, span.attr-name, span.attr-value") for row in spec_elem.select("tr, li, div.do-entry-item"))
+                    if len(cells) >= 2
+                ]
+            for key_elem, value_elem in pairs:
+                if key_elem and value_elem:
+                    key, value = key_elem.get_text(strip=True), value_elem.get_text(strip=True)
+                    if key and value and len(key) < 100 and len(value) < 500:
+                        specs[key] = value
+            if specs:
+                break
+        if specs:
+            break
+    record["specifications"] = specs
+
+
+def origin(soup, record, keyword):
+    record["origin"] = PLAN["origin"].value(soup)
+
+
+def detail_images(soup, record, keyword):
+    found = []
+    for _, img_elements in PLAN["detail_images"].matches(soup):
+        for img in img_elements:
+            src = image_src(img)
+            if src.lower().endswith(IMAGE_EXTENSIONS):
+                src = src.replace("_.webp", "")
+                if src not in found:
+                    found.append(src)
+        if found:
+            break
+    if found:
+        record["images"] = list(set((record["images"] or []) + found[:5]))[:5]
+        if not record["image_url"] and record["images"]:
+            record["image_url"] = record["images"][0]
+
+
+DETAIL_STEPS = (
+    ("description", description), ("videos", videos), ("specifications", specifications), ("origin", origin),
+    ("images", detail_images),
+)
+
+
+def extract_detail(html, url, record=None, keyword=None, timings=None):
+    """Listing record completed from a product page: description, videos, specifications, origin and gallery images."""
+    record = detail_record(new_record, url, record)
+    run_steps(DETAIL_STEPS, as_soup(html), record, keyword, timings)
+    return record
@@ -0,0 +1,259 @@
+import logging
+import patterns
+import selector_plans
+from retry_policy import extract as extract_field
+from extractors import as_soup, detail_record, run_steps
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://www.amazon.in"
+
+# Search card and product page selectors, declared in site_specs/amazon.json
+PLAN = selector_plans.load("amazon")
+
+
+def new_record():
+    return {
+        "url": "N/A",
+        "title": "N/A",
+        "currency": "N/A",
+        "exact_price": "N/A",
+        "mrp": "N/A",
+        "description": "N/A",
+        "min_order": "1 unit",
+        "supplier": "N/A",
+        "origin": "N/A",
+        "feedback": {"rating": "N/A", "review": "N/A"},
+        "image_url": "N/A",
+        "images": [],
+        "videos": [],
+        "Specifications": {},
+        "website_name": "Amazon",
+        "discount_information": "N/A",
+        "brand_name": "N/A"
+    }
+
+
+def card_url(card, record, keyword):
+    product_link = extract_field(lambda: PLAN["link"].value(card), "", "amazon.link")
+    if not product_link:
+        logger.warning("No product link found, skipping product.")
+        return False
+    product_url = product_link if product_link.startswith(BASE_URL) else f"{BASE_URL}{product_link}"
+    record["url"] = product_url.split("?")[0].split("/ref=")[0]
+    logger.info(f"Product URL: {product_url}")
+
+
+def card_title(card, record, keyword):
+    title = extract_field(lambda: PLAN["title"].value(card), "", "amazon.title")
+    if title:
+        record["title"] = title
+        logger.info(f"Product title: {record['title']}")
+
+
+def card_currency(card, record, keyword):
+    currency = extract_field(lambda: PLAN["currency"].value(card), "", "amazon.currency")
+    if currency:
+        record["currency"] = currency
+
+
+def card_price(card, record, keyword):
+    price_whole = extract_field(lambda: PLAN["price_whole"].value(card), "", "amazon.price_whole")
+    price_fraction = extract_field(lambda: PLAN["price_fraction"].value(card), "", "amazon.price_fraction")
+    if price_whole:
+        price_whole = price_whole.replace(",", "")
+        record["exact_price"] = f"{price_whole}.{price_fraction}" if price_fraction else price_whole
+        logger.info(f"Product price: {record['exact_price']}")
+
+
+CARD_STEPS = (("url", card_url), ("title", card_title), ("currency", card_currency), ("price", card_price))
+
+
+def extract_card(card, keyword=None, timings=None):
+    """Listing record from one search result card, or None when it has no product link."""
+    record = new_record()
+    return record if run_steps(CARD_STEPS, card, record, keyword, timings) else None
+
+
+def extract_search(html, url, keyword=None, timings=None):
+    """Listing records of the organic result cards on a search page."""
+    cards = PLAN["card"].values(as_soup(html))
+    records = (extract_card(card, keyword, timings) for card in cards)
+    return [record for record in records if record]
+
+
+def aplus_features(soup):
+    """Feature blocks of the A+ module-9 sections, heading first."""
+    features = []
+    for section in PLAN["aplus_feature_section"].values(soup):
+        for item in PLAN["aplus_feature"].values(section):
+            heading = PLAN["aplus_feature_heading"].value(item)
+            if not heading:
+                logger.warning("Skipping feature without a heading")
+                continue
+            lines = [heading] + PLAN["aplus_feature_paragraph"].values(item)
+            lines.extend(f"- {text}" for text in PLAN["aplus_feature_item"].values(item))
+            features.append("\n".join(lines).strip())
+    return features
+
+
+def tech_specs(soup):
+    """Rows of the A+ module-16 technical specification table."""
+    specs = {}
+    for row in PLAN["tech_spec_row"].values(soup):
+        cells = PLAN["tech_spec_cell"].values(row)
+        if len(cells) == 2:
+            specs[patterns.clean_text(cells[0].get_text(strip=True))] = patterns.clean_text(cells[1].get_text(strip=True))
+    return specs
+
+
+def bullet_list(texts):
+    """Non-empty texts as one "- " bulleted block."""
+    return "\n".join(f"- {text}" for text in (patterns.clean_text(text) for text in texts) if text)
+
+
+def extract_description(soup):
+    """Overview features, feature bullets and technical specs, or "N/A" when the page has none."""
+    description = {"features": aplus_features(soup), "technical_specs": tech_specs(soup)}
+    bullet_text = bullet_list(PLAN["feature_bullet"].values(soup))
+    if bullet_text:
+        description["features"].append(bullet_text)
+    return description if description["features"] or description["technical_specs"] else "N/A"
+
+
+def description(soup, record, keyword):
+    record["description"] = extract_description(soup)
+
+
+def mrp(soup, record, keyword):
+    mrp_text = extract_field(lambda: PLAN["mrp"].value(soup), "", "amazon.mrp")
+    if mrp_text:
+        mrp_value = patterns.NON_NUMERIC.sub('', mrp_text)
+        record["mrp"] = float(mrp_value) if mrp_value else "N/A"
+        logger.info(f"MRP extracted: {record['mrp']}")
+    else:
+        logger.warning("No MRP found")
+
+
+def discount(soup, record, keyword):
+    discount_text = extract_field(lambda: PLAN["discount"].value(soup), "", "amazon.discount")
+    if discount_text:
+        record["discount_information"] = discount_text
+        logger.info(f"Discount extracted: {record['discount_information']}")
+        return
+    # Fallback: Calculate discount from MRP and price
+    if record["mrp"] == "N/A" or record["exact_price"] == "N/A":
+        logger.warning("No discount found (missing MRP or price)")
+        return
+    try:
+        current_price = float(patterns.NON_NUMERIC.sub('', record["exact_price"]))
+        mrp_value = float(record["mrp"])
+        if mrp_value > current_price:
+            record["discount_information"] = f"{((mrp_value - current_price) / mrp_value) * 100:.2f}% off"
+            logger.info(f"Calculated discount: {record['discount_information']}")
+        else:
+            logger.info("No discount applicable (MRP <= Price)")
+    except ValueError as e:
+        logger.warning(f"Error calculating discount: {e}")
+
+
+def specifications(soup, record, keyword):
+    product_details = {}
+    for li in PLAN["detail_bullet"].values(soup):
+        label_tag = PLAN["detail_bullet_label"].first(li)
+        value_tag = label_tag.find_next_sibling("span") if label_tag else None
+        if label_tag and value_tag:
+            label = patterns.clean_text(label_tag.get_text(strip=True).replace(":", ""))
+            value = patterns.clean_text(value_tag.get_text(" ", strip=True))
+            if label and value:
+                product_details[label] = value
+    if not product_details:
+        for row in PLAN["details_table_row"].values(soup):
+            label = PLAN["details_table_label"].first(row)
+            value = PLAN["details_table_value"].first(row)
+            if label and value:
+                label_text = patterns.clean_text(label.get_text(strip=True).replace(":", ""))
+                value_text = patterns.clean_text(value.get_text(" ", strip=True))
+                if label_text and value_text:
+                    product_details[label_text] = value_text
+    record["Specifications"] = product_details
+    logger.info(f"Product details extracted: {product_details}")
+
+
+def review(soup, record, keyword):
+    review_count = extract_field(lambda: PLAN["review_count"].value(soup), "", "amazon.review")
+    if review_count:
+        record["feedback"]["review"] = review_count
+        logger.info(f"Product reviews: {record['feedback']['review']}")
+
+
+def rating(soup, record, keyword):
+    rating_text = extract_field(lambda: PLAN["rating"].value(soup), "", "amazon.rating")
+    if rating_text:
+        record["feedback"]["rating"] = rating_text
+        logger.info(f"Product rating: {record['feedback']['rating']}")
+
+
+def supplier(soup, record, keyword):
+    supplier_name = PLAN["supplier"].value(soup)
+    if supplier_name:
+        record["supplier"] = supplier_name
+        logger.info(f"Product supplier: {record['supplier']}")
+
+
+def images(soup, record, keyword):
+    main_image = PLAN["main_image"].value(soup)
+    if main_image:
+        record["image_url"] = main_image
+        record["images"].append(main_image)
+    for script in soup.find_all("script", string=patterns.AMAZON_COLOR_IMAGES):
+        record["images"].extend(patterns.AMAZON_LARGE_IMAGE.findall(script.string))
+    for thumb in PLAN["thumbnail_image"].values(soup):
+        hi_res_url = patterns.AMAZON_THUMBNAIL_SIZE.sub('._AC_SL1500_', thumb)
+        if hi_res_url not in record["images"]:
+            record["images"].append(hi_res_url)
+    record["images"] = list(set(record["images"]))[:5]
+    logger.info(f"Product images: {record['images']}")
+
+
+def brand(soup, record, keyword):
+    specs = record["Specifications"]
+    if "Brand" in specs:
+        record["brand_name"] = specs["Brand"]
+    elif "brand" in specs:
+        record["brand_name"] = specs["brand"]
+    else:
+        brand_text = PLAN["byline"].value(soup)
+        if brand_text:
+            brand_match = patterns.AMAZON_BYLINE_BRAND.search(brand_text)
+            record["brand_name"] = brand_match.group(1) if brand_match else brand_text
+    logger.info(f"Brand name: {record['brand_name']}")
+
+
+def origin(soup, record, keyword):
+    specs = record["Specifications"]
+    if "Country of Origin" in specs:
+        record["origin"] = specs["Country of Origin"]
+    elif "country of origin" in specs:
+        record["origin"] = specs["country of origin"]
+    else:
+        for bullet in PLAN["detail_bullet"].values(soup):
+            match = patterns.COUNTRY_OF_ORIGIN.search(patterns.clean_text(bullet.get_text(strip=True)))
+            if match:
+                record["origin"] = match.group(1).strip()
+                break
+    logger.info(f"Origin: {record['origin']}")
+
+
+DETAIL_STEPS = (
+    ("description", description), ("mrp", mrp), ("discount", discount), ("specifications", specifications),
+    ("review", review), ("rating", rating), ("supplier", supplier), ("images", images), ("brand", brand),
+    ("origin", origin),
+)
+
+
+def extract_detail(html, url, record=None, keyword=None, timings=None):
+    """Listing record completed from a product page: description, MRP, discount, specs, feedback, seller, images, brand and origin."""
+    record = detail_record(new_record, url, record)
+    run_steps(DETAIL_STEPS, as_soup(html), record, keyword, timings)
+    return record
@@ -0,0 +1,222 @@
+import os
+import sys
+import re
+import glob
+import json
+import time
+import shutil
+import logging
+import threading
+import subprocess
+from pathlib import Path
+from selenium.webdriver.chrome.service import Service
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = Path(os.environ.get("SCRAPER_DRIVER_CACHE", Path.home() / ".cache" / "scraper_apis" / "chromedriver.json"))
+
+DRIVER_NAME = "chromedriver.exe" if os.name == "nt" else "chromedriver"
+
+BROWSER_NAMES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome", "chrome-headless-shell"]
+
+# Places webdriver-manager and Selenium Manager leave binaries from earlier downloads
+LOCAL_DRIVER_GLOBS = [
+    str(Path.home() / ".wdm" / "drivers" / "chromedriver" / "**" / DRIVER_NAME),
+    str(Path.home() / ".cache" / "selenium" / "chromedriver" / "**" / DRIVER_NAME),
+]
+LOCAL_BROWSER_GLOBS = [
+    str(Path.home() / ".cache" / "selenium" / "chrome-headless-shell" / "**" / ("chrome-headless-shell.exe" if os.name == "nt" else "chrome-headless-shell")),
+    str(Path.home() / ".cache" / "selenium" / "chrome" / "**" / ("chrome.exe" if os.name == "nt" else "chrome")),
+]
+
+# First dotted number in "ChromeDriver 126.0.6478.126 (...)" or "Google Chrome 126.0.6478.126"
+VERSION_NUMBER = re.compile(r"(\d+)\.\d+")
+
+_binaries = None
+_lock = threading.Lock()
+
+
+def _is_executable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _newest_first(pattern):
+    """Executables matching a glob pattern, most recently modified first."""
+    matches = [p for p in glob.glob(pattern, recursive=True) if _is_executable(p)]
+    return sorted(matches, key=os.path.getmtime, reverse=True)
+
+
+def _newest(pattern):
+    """Most recently modified executable matching a glob pattern."""
+    return next(iter(_newest_first(pattern)), None)
+
+
+def _binary_version(path):
+    """Read the version string printed by a browser or driver binary."""
+    try:
+        result = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10)
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _major(version):
+    """Major version number of a --version string, or None when it cannot be read."""
+    match = VERSION_NUMBER.search(version or "")
+    return int(match.group(1)) if match else None
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except (OSError, TypeError):
+        return None
+
+
+def _matches_browser(driver_path, browser_major):
+    """Whether a chromedriver can drive the browser; always True when the browser version is unknown."""
+    if browser_major is None:
+        return True
+    driver_major = _major(_binary_version(driver_path))
+    if driver_major != browser_major:
+        logger.info(f"Skipping chromedriver {driver_path}: major version {driver_major}, browser is {browser_major}")
+        return False
+    return True
+
+
+def _load_cache():
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not _is_executable(cached.get("driver_path")):
+        return None
+    # Explicitly pinned binaries always win over a stale cache entry
+    for env, key in (("CHROMEDRIVER_PATH", "driver_path"), ("CHROME_BINARY", "browser_path")):
+        if os.environ.get(env) and os.environ[env] != cached.get(key):
+            return None
+    if cached.get("browser_path") and not _is_executable(cached["browser_path"]):
+        return None
+    # Chrome updates itself in place; the version is only re-read when the binary changed
+    if cached.get("browser_path") and _mtime(cached["browser_path"]) != cached.get("browser_mtime"):
+        browser_version = _binary_version(cached["browser_path"])
+        if _major(browser_version) != _major(cached.get("driver_version")):
+            logger.info(f"Cached chromedriver {cached.get('driver_version')} does not match {browser_version}, resolving again")
+            return None
+        cached = dict(cached, browser_version=browser_version, browser_mtime=_mtime(cached["browser_path"]))
+        _save_cache(cached)
+    return cached
+
+
+def _save_cache(binaries):
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(binaries, f, indent=2)
+    except OSError as e:
+        logger.warning(f"Failed to write chromedriver cache {CACHE_FILE}: {e}")
+
+
+def _find_driver(allow_network, browser_major=None):
+    """Locate chromedriver, preferring pinned and local binaries over a download.
+
+    Local binaries whose major version differs from the browser's are skipped.
+    """
+    pinned = os.environ.get("CHROMEDRIVER_PATH")
+    if pinned:
+        if not _is_executable(pinned):
+            raise FileNotFoundError(f"CHROMEDRIVER_PATH is not an executable file: {pinned}")
+        if not _matches_browser(pinned, browser_major):
+            logger.warning(f"CHROMEDRIVER_PATH {pinned} does not match browser major version {browser_major}")
+        return pinned, "env"
+    on_path = shutil.which(DRIVER_NAME)
+    if on_path and _matches_browser(on_path, browser_major):
+        return on_path, "path"
+    for pattern in LOCAL_DRIVER_GLOBS:
+        for found in _newest_first(pattern):
+            if _matches_browser(found, browser_major):
+                return found, "local-cache"
+    if not allow_network:
+        raise FileNotFoundError(
+            f"No chromedriver matching browser major version {browser_major} found locally and network lookups are disabled (SCRAPER_OFFLINE)"
+        )
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install(), "download"
+
+
+def _find_browser():
+    """Locate a Chrome, Chromium or chrome-headless-shell binary; None lets chromedriver decide."""
+    pinned = os.environ.get("CHROME_BINARY")
+    if pinned:
+        if not _is_executable(pinned):
+            raise FileNotFoundError(f"CHROME_BINARY is not an executable file: {pinned}")
+        return pinned
+    for name in BROWSER_NAMES:
+        found = shutil.which(name)
+        if found:
+            return found
+    for pattern in LOCAL_BROWSER_GLOBS:
+        found = _newest(pattern)
+        if found:
+            return found
+    return None
+
+
+def provision(force=False):
+    """Resolve and pin the chromedriver and browser binaries once per process.
+
+    Resolution order is: CHROMEDRIVER_PATH/CHROME_BINARY, the on-disk cache, binaries on
+    PATH or left by earlier downloads whose major version matches the browser, and only then
+    a webdriver-manager download (skipped when SCRAPER_OFFLINE is set). The result is cached
+    on disk for the next cold start, and dropped once the browser updates to another major.
+    """
+    global _binaries
+    with _lock:
+        if _binaries is not None and not force:
+            return _binaries
+        started = time.perf_counter()
+        cached = None if force else _load_cache()
+        if cached:
+            binaries = dict(cached, source="cache")
+        else:
+            allow_network = not os.environ.get("SCRAPER_OFFLINE")
+            browser_path = _find_browser()
+            browser_version = _binary_version(browser_path) if browser_path else None
+            driver_path, source = _find_driver(allow_network, _major(browser_version))
+            binaries = {
+                "driver_path": driver_path,
+                "driver_version": _binary_version(driver_path),
+                "browser_path": browser_path,
+                "browser_version": browser_version,
+                "browser_mtime": _mtime(browser_path),
+                "source": source,
+                "resolved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+        binaries["lookup_seconds"] = round(time.perf_counter() - started, 6)
+        if not cached:
+            _save_cache(binaries)
+        logger.info(f"Chromedriver provisioned from {binaries['source']} in {binaries['lookup_seconds']:.4f}s: {binaries['driver_path']}")
+        _binaries = binaries
+        return binaries
+
+
+def provisioned():
+    """Binaries resolved so far in this process, without triggering a lookup."""
+    return _binaries
+
+
+def chromedriver_service(**kwargs):
+    """Build a Service for the provisioned chromedriver without any version lookups."""
+    return Service(executable_path=provision()["driver_path"], **kwargs)
+
+
+def browser_binary():
+    """Path of the provisioned browser binary, or None to use chromedriver's default."""
+    return provision()["browser_path"]
+
+
+if __name__ == "__main__":
+    # Run at image build time to bake the binary paths into the cache
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    print(json.dumps(provision(force="--refresh" in sys.argv), indent=2))
@@ -0,0 +1,111 @@
+import os
+import time
+import logging
+from collections import deque
+from readiness import is_ready
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TABS = int(os.environ.get("SCRAPER_DETAIL_TABS", 4))
+
+# Marks the document a tab is leaving so the previous page is never mistaken for the next one
+NAVIGATE_SCRIPT = """
+    document.documentElement.setAttribute('data-scraper-stale', '1');
+    window.location.href = arguments[0];
+"""
+
+# Used when a caller does not declare what its detail pages look like when ready
+DEFAULT_CONDITION = {"quiet_ms": 300}
+
+
+class DetailTabs:
+    """Fetches detail pages through a set of persistent tabs in one browser.
+
+    Navigation is started in every tab at once and each tab is harvested as soon as its
+    page is ready, so the network waits of several detail pages overlap. Tabs are reused
+    across batches instead of being opened and closed per product.
+    """
+
+    def __init__(self, driver, tabs=DEFAULT_TABS, timeout=20, poll_interval=0.1):
+        self.driver = driver
+        self.size = max(1, tabs)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.home = None
+        self.handles = []
+
+    def _ensure_tabs(self, count):
+        """Open detail tabs until `count` exist, remembering the listing tab as home."""
+        if self.home is None or self.home not in self.driver.window_handles:
+            self.home = self.driver.current_window_handle
+            self.handles = []
+        live = set(self.driver.window_handles)
+        self.handles = [h for h in self.handles if h in live]
+        while len(self.handles) < count:
+            self.driver.switch_to.new_window("tab")
+            self.handles.append(self.driver.current_window_handle)
+
+    def fetch(self, jobs, handle_page, condition=None):
+        """Load every (url, context) job and call handle_page(url, context) once its tab is ready.
+
+        Readiness is a readiness.CONDITIONS entry for the site's detail page.
+
+        handle_page runs with the driver switched to the tab holding the page, so it can read
+        page_source or query live elements. The driver is switched back to the listing tab
+        when the batch is done.
+        """
+        queue = deque(jobs)
+        if not queue:
+            return
+        condition = condition or DEFAULT_CONDITION
+        self._ensure_tabs(min(self.size, len(queue)))
+        busy = {}
+        try:
+            while queue or busy:
+                for handle in self.handles:
+                    if handle not in busy and queue:
+                        url, context = queue.popleft()
+                        self.driver.switch_to.window(handle)
+                        self.driver.execute_script(NAVIGATE_SCRIPT, url)
+                        if hasattr(self.driver, "count_navigation"):
+                            self.driver.count_navigation()
+                        busy[handle] = (url, context, time.monotonic())
+                harvested = False
+                for handle, (url, context, started) in list(busy.items()):
+                    self.driver.switch_to.window(handle)
+                    try:
+                        ready = is_ready(self.driver, condition)
+                    except Exception as e:
+                        logger.debug(f"Readiness check failed for {url}: {e}")
+                        ready = False
+                    if not ready and time.monotonic() - started < self.timeout:
+                        continue
+                    del busy[handle]
+                    harvested = True
+                    if not ready:
+                        logger.warning(f"Timed out waiting for detail page: {url}")
+                        continue
+                    try:
+                        handle_page(url, context)
+                    except Exception as e:
+                        logger.error(f"Error processing detail page {url}: {e}")
+                if not harvested:
+                    time.sleep(self.poll_interval)
+        finally:
+            if self.home in self.driver.window_handles:
+                self.driver.switch_to.window(self.home)
+
+    def close(self):
+        """Close the detail tabs and return to the listing tab."""
+        for handle in self.handles:
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception as e:
+                logger.debug(f"Error closing detail tab: {e}")
+        self.handles = []
+        if self.home:
+            try:
+                self.driver.switch_to.window(self.home)
+            except Exception as e:
+                logger.debug(f"Error returning to listing tab: {e}")
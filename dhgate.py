@@ -6,19 +6,19 @@ import uuid
 import subprocess
 import re
 import time
-import random
 import logging
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 from datetime import datetime
 import sanitize_filename
+from retry_policy import extract as extract_field
+from dhgate_media import extract_media
+from html_parser import parse_regions
+from readiness import wait_until_ready, wait_for_quiet
 
 app = Flask(__name__)
 CORS(app)
@@ -31,6 +31,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Numbers every card matching arguments[0] in document order, so captured cards map back to live ones
+CARD_TAG = "data-scrape-card"
+TAG_CARDS_SCRIPT = f"document.querySelectorAll(arguments[0]).forEach((card, i) => card.setAttribute('{CARD_TAG}', i));"
+
 class DHgateScraper:
     def __init__(self, search_keyword, max_pages=1, output_file=None):
         self.search_keyword = search_keyword
@@ -59,17 +63,9 @@ class DHgateScraper:
             logger.error(f"Failed to initialize WebDriver: {e}")
             raise
 
-    def retry_extraction(self, func, attempts=3, delay=1, default=""):
-        """Retry a function with specified attempts and delay"""
-        for i in range(attempts):
-            try:
-                result = func()
-                if result:
-                    return result
-            except Exception as e:
-                logger.debug(f"Retry {i+1}/{attempts} failed: {e}")
-                time.sleep(delay)
-        return default
+    def retry_extraction(self, func, attempts=3, delay=1, default="", field=None, live=False):
+        """Extract a field once from a parsed page, or with bounded retries when live reads the browser."""
+        return extract_field(func, default, f"dhgate.{field or 'unnamed'}", live, attempts, delay)
 
     def clean_text(self, text):
         """Clean text by removing extra whitespace"""
@@ -79,8 +75,8 @@ class DHgateScraper:
         """Scroll to element with retry"""
         try:
             element = self.browser.find_element(By.CSS_SELECTOR, css_selector)
-            self.browser.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
-            time.sleep(random.uniform(0.5, 1))
+            self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+            wait_for_quiet(self.browser)
             return element
         except Exception as e:
             logger.error(f"Error scrolling to {css_selector}: {e}")
@@ -97,7 +93,7 @@ class DHgateScraper:
                          r'\b\d+\s*(UK|US|EU|CM)\b'
             specs_container = self.retry_extraction(
                 lambda: product_page_html.find("div", {"class": "prodSpecifications_showLayer__15RQA"}),
-                attempts=3, delay=1, default=None
+                attempts=3, delay=1, default=None, field="specs_container"
             )
             if specs_container:
                 specs_list = specs_container.find("ul", {"class": "prodSpecifications_showUl__fmY8y"})
@@ -116,7 +112,7 @@ class DHgateScraper:
                 self.scroll_to_element("table.product-spec")
                 specs_table = self.retry_extraction(
                     lambda: product_page_html.find("table", {"class": "product-spec"}),
-                    attempts=3, delay=1, default=None
+                    attempts=3, delay=1, default=None, field="specs_table"
                 )
                 if specs_table:
                     for row in specs_table.find_all("tr"):
@@ -153,10 +149,7 @@ class DHgateScraper:
                     search_url = f'https://www.dhgate.com/wholesale/search.do?act=search&searchkey={self.search_keyword}&pageNum={page}'
                     logger.info(f"Scraping page {page}/{self.max_pages}: {search_url}")
                     self.browser.get(search_url)
-                    WebDriverWait(self.browser, 10).until(
-                        lambda d: d.execute_script("return document.readyState") == "complete"
-                    )
-                    time.sleep(random.uniform(2, 3))
+                    wait_for_quiet(self.browser)
                     try:
                         captcha = self.browser.find_element(By.XPATH, '//form[contains(@action, "captcha")]')
                         logger.warning(f"CAPTCHA detected on page {page}!")
@@ -164,14 +157,17 @@ class DHgateScraper:
                     except NoSuchElementException:
                         logger.info(f"No CAPTCHA detected on page {page}, proceeding...")
                     self.browser.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(random.uniform(1, 2))
-                    product_cards = WebDriverWait(self.browser, 10).until(
-                        EC.presence_of_all_elements_located((By.CLASS_NAME, "gallery-main"))
-                    )
+                    wait_until_ready(self.browser, "dhgate", "search", timeout=10)
+                    product_cards = self.browser.find_elements(By.CLASS_NAME, "gallery-main")
                     if not product_cards:
                         logger.warning(f"No products found on page {page}")
                         break
-                    for product in product_cards:
+                    # Card markup comes from one capture of the result list, parsed once; each card is
+                    # tagged first so a captured card can be found again in the live page by identity
+                    self.browser.execute_script(TAG_CARDS_SCRIPT, ".gallery-main")
+                    card_soups = parse_regions(self.browser, [".gallery-main"]).select(".gallery-main")
+                    for product_html in card_soups:
+                        live_card = f'.gallery-main[{CARD_TAG}="{product_html.get(CARD_TAG)}"]'
                         product_json_data = {
                             "url": "",
                             "title": "",
@@ -191,15 +187,14 @@ class DHgateScraper:
                             "brand_name": ""
                         }
                         try:
-                            product_html = BeautifulSoup(product.get_attribute('outerHTML'), "html.parser")
                             title_div = self.retry_extraction(
                                 lambda: product_html.find('div', {"class": "gallery-pro-name"}),
-                                attempts=3, delay=1, default=None
+                                attempts=3, delay=1, default=None, field="title_div"
                             )
                             if title_div:
                                 a_tag = self.retry_extraction(
                                     lambda: title_div.find("a"),
-                                    attempts=3, delay=1, default=None
+                                    attempts=3, delay=1, default=None, field="a_tag"
                                 )
                                 if a_tag:
                                     product_json_data["title"] = a_tag.get("title", "").strip()
@@ -214,9 +209,10 @@ class DHgateScraper:
                         if product_json_data["url"] in self.scraped_products:
                             continue
                         try:
+                            # The price is split on the rendered line breaks, which only the live card has
                             price_element = self.retry_extraction(
-                                lambda: product.find_element(By.CSS_SELECTOR, "[class*='price'], .gallery-pro-price"),
-                                attempts=3, delay=1, default=None
+                                lambda: self.browser.find_element(By.CSS_SELECTOR, live_card).find_element(By.CSS_SELECTOR, "[class*='price'], .gallery-pro-price"),
+                                attempts=3, delay=1, default=None, field="price_element", live=True
                             )
                             if price_element:
                                 price_text = price_element.text.strip()
@@ -243,17 +239,14 @@ class DHgateScraper:
                                 self.browser.execute_script("window.open('');")
                                 self.browser.switch_to.window(self.browser.window_handles[-1])
                                 self.browser.get(product_json_data["url"])
-                                WebDriverWait(self.browser, 10).until(
-                                    lambda d: d.execute_script("return document.readyState") == "complete"
-                                )
-                                time.sleep(random.uniform(1, 2))
+                                wait_until_ready(self.browser, "dhgate", "detail", timeout=10)
                                 self.browser.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                                time.sleep(random.uniform(1, 2))
+                                wait_for_quiet(self.browser)
                                 product_page_html = BeautifulSoup(self.browser.page_source, "html.parser")
                                 try:
                                     description_elements = self.retry_extraction(
                                         lambda: product_page_html.find("div", {"class": "product-description-detail"}).find_all("p"),
-                                        attempts=3, delay=1, default=[]
+                                        attempts=3, delay=1, default=[], field="description_elements"
                                     )
                                     if description_elements:
                                         description = " ".join([elem.get_text(strip=True) for elem in description_elements])
@@ -262,7 +255,7 @@ class DHgateScraper:
                                     else:
                                         info_section = self.retry_extraction(
                                             lambda: product_page_html.find("div", {"class": "product-info"}),
-                                            attempts=3, delay=1, default=None
+                                            attempts=3, delay=1, default=None, field="info_section"
                                         )
                                         if info_section:
                                             description = info_section.get_text(strip=True)
@@ -271,7 +264,7 @@ class DHgateScraper:
                                         else:
                                             h1_title = self.retry_extraction(
                                                 lambda: product_page_html.find("h1").get_text(strip=True),
-                                                attempts=3, delay=1, default=""
+                                                attempts=3, delay=1, default="", field="h1_title"
                                             )
                                             if h1_title:
                                                 product_json_data["description"] = h1_title
@@ -281,7 +274,7 @@ class DHgateScraper:
                                 try:
                                     review_text = self.retry_extraction(
                                         lambda: product_page_html.find("span", {"class": "productSellerMsg_reviewsCount__HJ3MJ"}).get_text(strip=True),
-                                        attempts=3, delay=1, default=""
+                                        attempts=3, delay=1, default="", field="review_text"
                                     )
                                     if review_text:
                                         review_match = re.search(r'\d+', review_text)
@@ -291,7 +284,7 @@ class DHgateScraper:
                                     else:
                                         alt_reviews = self.retry_extraction(
                                             lambda: product_page_html.find("span", {"class": "review-count"}).get_text(strip=True),
-                                            attempts=3, delay=1, default=""
+                                            attempts=3, delay=1, default="", field="alt_reviews"
                                         )
                                         if alt_reviews:
                                             review_match = re.search(r'\d+', alt_reviews)
@@ -303,7 +296,7 @@ class DHgateScraper:
                                 try:
                                     rating = self.retry_extraction(
                                         lambda: product_page_html.find("div", {"class": "productSellerMsg_starWarp__WeIw2"}).find("span", string=re.compile(r'^\d+\.\d+$')),
-                                        attempts=3, delay=1, default=""
+                                        attempts=3, delay=1, default="", field="rating"
                                     )
                                     if rating:
                                         product_json_data["feedback"]["rating"] = rating.get_text(strip=True)
@@ -311,7 +304,7 @@ class DHgateScraper:
                                     else:
                                         alt_rating = self.retry_extraction(
                                             lambda: product_page_html.find("span", {"class": "star-rating"}).get_text(strip=True),
-                                            attempts=3, delay=1, default=""
+                                            attempts=3, delay=1, default="", field="alt_rating"
                                         )
                                         if alt_rating and re.match(r'^\d+\.\d+$', alt_rating):
                                             product_json_data["feedback"]["rating"] = alt_rating
@@ -321,7 +314,7 @@ class DHgateScraper:
                                 try:
                                     supplier_name = self.retry_extraction(
                                         lambda: product_page_html.find("a", {"class": "store-name"}).get_text(strip=True),
-                                        attempts=3, delay=1, default=""
+                                        attempts=3, delay=1, default="", field="supplier_name"
                                     )
                                     if supplier_name:
                                         product_json_data["supplier"] = supplier_name
@@ -329,7 +322,7 @@ class DHgateScraper:
                                     else:
                                         store_link = self.retry_extraction(
                                             lambda: product_page_html.find("a", href=re.compile(r'https://www\.dhgate\.com/store/')).get_text(strip=True),
-                                            attempts=3, delay=1, default=""
+                                            attempts=3, delay=1, default="", field="store_link"
                                         )
                                         if store_link:
                                             product_json_data["supplier"] = store_link
@@ -339,7 +332,7 @@ class DHgateScraper:
                                 try:
                                     main_image_elem = self.retry_extraction(
                                         lambda: product_page_html.find("div", {"class": "masterMap_bigMapWarp__2Jzw2"}).find("img"),
-                                        attempts=3, delay=1, default=None
+                                        attempts=3, delay=1, default=None, field="main_image_elem"
                                     )
                                     if main_image_elem:
                                         main_image = main_image_elem.get("data-zoom-image") or main_image_elem.get("src", "")
@@ -351,7 +344,7 @@ class DHgateScraper:
                                     if not product_json_data["image_url"]:
                                         alt_image_elem = self.retry_extraction(
                                             lambda: product_page_html.find("img", {"class": "main-image"}),
-                                            attempts=3, delay=1, default=None
+                                            attempts=3, delay=1, default=None, field="alt_image_elem"
                                         )
                                         if alt_image_elem:
                                             alt_image = alt_image_elem.get("data-zoom-image") or alt_image_elem.get("src", "")
@@ -364,7 +357,7 @@ class DHgateScraper:
                                         thumb_image = self.retry_extraction(
                                             lambda: product_page_html.find("ul", {"class": "masterMap_smallMapList__JTkBX"}).find("img").get("data-zoom-image") or 
                                                     product_page_html.find("ul", {"class": "masterMap_smallMapList__JTkBX"}).find("img").get("src"),
-                                            attempts=3, delay=1, default=""
+                                            attempts=3, delay=1, default="", field="thumb_image"
                                         )
                                         if thumb_image and not thumb_image.startswith("http"):
                                             thumb_image = f"https:{thumb_image}"
@@ -374,38 +367,9 @@ class DHgateScraper:
                                 except Exception as e:
                                     logger.error(f"Error extracting primary image URL: {e}")
                                 try:
-                                    self.scroll_to_element("ul.masterMap_smallMapList__JTkBX")
-                                    thumbnails = self.retry_extraction(
-                                        lambda: self.browser.find_elements(By.CSS_SELECTOR, "ul.masterMap_smallMapList__JTkBX li"),
-                                        attempts=3, delay=1, default=[]
-                                    )
-                                    media_images = set([product_json_data["image_url"]]) if product_json_data["image_url"] else set()
-                                    media_videos = set()
-                                    for thumb in thumbnails:
-                                        try:
-                                            ActionChains(self.browser).move_to_element(thumb).click().perform()
-                                            time.sleep(random.uniform(0.5, 1))
-                                            media_soup = BeautifulSoup(self.browser.page_source, "html.parser")
-                                            big_map_div = media_soup.find("div", {"class": "masterMap_bigMapWarp__2Jzw2"})
-                                            if big_map_div:
-                                                video_tag = big_map_div.find("video")
-                                                if video_tag and video_tag.get("src"):
-                                                    video_src = video_tag.get("src")
-                                                    if not video_src.startswith("http"):
-                                                        video_src = f"https:{video_src}"
-                                                    media_videos.add(video_src)
-                                                else:
-                                                    image_tag = big_map_div.find("img")
-                                                    if image_tag:
-                                                        img_src = image_tag.get("data-zoom-image") or image_tag.get("src", "")
-                                                        if img_src and not img_src.startswith("http"):
-                                                            img_src = f"https:{img_src}"
-                                                        if "100x100" not in img_src and img_src:
-                                                            media_images.add(img_src)
-                                        except Exception as e:
-                                            logger.error(f"Error extracting media for a thumbnail: {e}")
-                                    product_json_data["images"] = list(media_images)
-                                    product_json_data["videos"] = list(media_videos)
+                                    images, videos = extract_media(self.browser, product_page_html, product_json_data["image_url"])
+                                    product_json_data["images"] = images
+                                    product_json_data["videos"] = videos
                                     logger.info(f"Images: {product_json_data['images']}")
                                     logger.info(f"Videos: {product_json_data['videos']}")
                                 except Exception as e:
@@ -417,7 +381,7 @@ class DHgateScraper:
                                     dimension_keys = ["Band length", "Dial Diameter", "Band Width", "Waterproof Deepness", "Case Size", "Dimensions"]
                                     specs_list = self.retry_extraction(
                                         lambda: product_page_html.find("ul", {"class": "prodSpecifications_showUl__fmY8y"}),
-                                        attempts=3, delay=1, default=None
+                                        attempts=3, delay=1, default=None, field="specs_list"
                                     )
                                     dimensions = []
                                     if specs_list:
@@ -445,7 +409,7 @@ class DHgateScraper:
                                 try:
                                     discount_element = self.retry_extraction(
                                         lambda: product_page_html.find("span", {"class": "productPrice_discount__dMPyI"}),
-                                        attempts=3, delay=1, default=None
+                                        attempts=3, delay=1, default=None, field="discount_element"
                                     )
                                     if discount_element:
                                         discount_text = discount_element.get_text(strip=True)
@@ -455,7 +419,7 @@ class DHgateScraper:
                                     else:
                                         discount_element = self.retry_extraction(
                                             lambda: product_page_html.find("span", {"class": "discount-label"}),
-                                            attempts=3, delay=1, default=None
+                                            attempts=3, delay=1, default=None, field="discount_element"
                                         )
                                         if discount_element:
                                             discount_text = discount_element.get_text(strip=True)
@@ -465,7 +429,7 @@ class DHgateScraper:
                                         else:
                                             promo_tag = self.retry_extraction(
                                                 lambda: product_page_html.find("span", {"class": "promo-label"}).get_text(strip=True),
-                                                attempts=3, delay=1, default=""
+                                                attempts=3, delay=1, default="", field="promo_tag"
                                             )
                                             if promo_tag and re.match(r'\d+%\s*off', promo_tag, re.IGNORECASE):
                                                 product_json_data["discount_information"] = promo_tag
@@ -484,7 +448,7 @@ class DHgateScraper:
                                     if not brand_name:
                                         brand_element = self.retry_extraction(
                                             lambda: product_page_html.find("span", {"class": "brand-name"}),
-                                            attempts=3, delay=1, default=None
+                                            attempts=3, delay=1, default=None, field="brand_element"
                                         )
                                         if brand_element:
                                             brand_name = brand_element.get_text(strip=True)
@@ -507,7 +471,7 @@ class DHgateScraper:
                     break
                 except Exception as e:
                     logger.error(f"Attempt {attempt + 1}/{self.retries}: Error scraping page {page}: {e}")
-                    time.sleep(random.uniform(1, 2))
+                    wait_for_quiet(self.browser)
             else:
                 logger.error(f"Failed to scrape page {page} after {self.retries} attempts.")
         return list(self.scraped_products.values())
@@ -0,0 +1,205 @@
+import logging
+import patterns
+import selector_plans
+from functools import partial
+from dhgate_media import resolve_media
+from extractors import as_soup, detail_record, run_steps, timed
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://www.dhgate.com"
+
+# Search card and product page selectors, declared in site_specs/dhgate.json
+PLAN = selector_plans.load("dhgate")
+CARD_FIELDS = ["title", "href", "price"]
+
+DIMENSION_KEYS = ["Band length", "Dial Diameter", "Band Width", "Waterproof Deepness", "Case Size", "Dimensions"]
+# Specification rows kept even when the value does not look like a measurement
+MEASURED_SPECS = ["dial diameter", "waterproof deepness", "band width", "band length"]
+
+
+def new_record():
+    return {
+        "url": "",
+        "title": "",
+        "currency": "",
+        "min_price": "",
+        "max_price": "",
+        "description": "",
+        "supplier": "",
+        "feedback": {"rating": "", "review": ""},
+        "image_url": "",
+        "images": [],
+        "videos": [],
+        "dimensions": "",
+        "specifications": {},
+        "website_name": "DHgate.com",
+        "discount_information": "",
+        "brand_name": ""
+    }
+
+
+def absolute(url):
+    return f"https:{url}" if url and not url.startswith("http") else url
+
+
+def card_record(fields):
+    """Listing record from a card's title, href and price values."""
+    record = new_record()
+    if fields["href"] is not None:
+        record["title"] = (fields["title"] or "").strip()
+        product_url = fields["href"].strip()
+        if product_url and not product_url.startswith("http"):
+            product_url = f"{BASE_URL}{product_url}"
+        record["url"] = product_url
+        logger.info(f"Product URL: {product_url}")
+    price_text = fields["price"]
+    if price_text is None:
+        logger.warning(f"Price element not found for product: {record['url']}")
+        return record
+    prices = []
+    for line in price_text.split('\n'):
+        match = patterns.DHGATE_PRICE_RANGE.match(line)
+        if match:
+            prices.extend([float(match.group(1).replace(',', '')), float(match.group(2).replace(',', ''))])
+    if prices:
+        record["currency"] = "$"
+        record["min_price"] = str(min(prices))
+        record["max_price"] = str(max(prices))
+    else:
+        logger.warning(f"Price format not recognized: '{price_text}'")
+    return record
+
+
+def extract_card(card, keyword=None, timings=None):
+    """Listing record from one search result card element."""
+    return card_record(timed(timings, "fields", PLAN.extract, card, CARD_FIELDS))
+
+
+def extract_search(html, url, keyword=None, timings=None):
+    """Listing records of the result cards on a search page."""
+    return [extract_card(card, keyword, timings) for card in PLAN["card"].values(as_soup(html))]
+
+
+def description(soup, record, keyword):
+    paragraphs = PLAN["description"].values(soup)
+    record["description"] = " ".join(paragraphs) if paragraphs else PLAN["description_fallback"].value(soup, record["description"])
+
+
+def review(soup, record, keyword):
+    review_count = PLAN["review_count"].value(soup)
+    if review_count:
+        record["feedback"]["review"] = review_count
+
+
+def rating(soup, record, keyword):
+    for _, elements in PLAN["rating"].matches(soup):
+        for element in elements:
+            if patterns.RATING_DECIMAL.match(element.get_text(strip=True)):
+                record["feedback"]["rating"] = element.get_text(strip=True)
+                return
+
+
+def supplier(soup, record, keyword):
+    record["supplier"] = PLAN["supplier"].value(soup, record["supplier"])
+
+
+def full_size(image_elem, attr="data-zoom-image"):
+    """Absolute full-size source of an image element, or "" for missing images and thumbnails."""
+    url = absolute(image_elem.get(attr) or image_elem.get("src", "")) if image_elem else ""
+    return url if url and "100x100" not in url else ""
+
+
+def primary_image(soup, record, keyword):
+    # Big viewer, legacy main image, then the first thumbnail; thumbnail-sized sources fall through
+    found = (full_size(elements[0]) for _, elements in PLAN["primary_image"].matches(soup))
+    record["image_url"] = next((url for url in found if url), "")
+
+
+def media(soup, record, keyword, unresolved=None):
+    record["images"], record["videos"], left = resolve_media(soup, record["image_url"])
+    if unresolved is not None:
+        unresolved.extend(left)
+
+
+def spec_items(soup):
+    """(label, value) pairs of the showLayer specification list."""
+    for li in PLAN["spec_item"].values(soup):
+        key = PLAN["spec_item_label"].value(li)
+        value = PLAN["spec_item_value"].value(li)
+        if key and value:
+            yield key.replace(":", "").strip(), value
+
+
+def dimensions(soup, record, keyword):
+    found = [f"{key}: {value}" for key, value in spec_items(soup) if key in DIMENSION_KEYS and patterns.DHGATE_DIMENSION.match(value)]
+    if found:
+        record["dimensions"] = "; ".join(found)
+        return
+    matches = patterns.DHGATE_DIMENSION.findall(record.get("description", ""))
+    if matches:
+        record["dimensions"] = "; ".join(match[0] for match in matches if match[0])
+
+
+def specifications(soup, record, keyword):
+    specs = {}
+    if PLAN["spec_layer"].first(soup) is not None:
+        for key, value in spec_items(soup):
+            key, value = patterns.normalize_space(key), patterns.normalize_space(value)
+            if key and value and (patterns.DHGATE_SPEC_VALUE.match(value) or key.lower() in MEASURED_SPECS):
+                specs[key] = value
+    if not specs:
+        for row in PLAN["spec_table_row"].values(soup):
+            key = patterns.normalize_space(PLAN["spec_table_label"].value(row, ""))
+            value = patterns.normalize_space(PLAN["spec_table_value"].value(row, ""))
+            if key and value and patterns.DHGATE_SPEC_VALUE.match(value):
+                specs[key] = value
+    if not specs:
+        for match in patterns.DHGATE_SPEC_VALUE.findall(record.get("description", "")):
+            if patterns.normalize_space(match[0]):
+                specs['Dimensions'] = patterns.normalize_space(match[0])
+    if not specs:
+        logger.info(f"No specifications found for product: {record['url']}")
+    record["specifications"] = specs
+
+
+def discount(soup, record, keyword):
+    discount_text = PLAN["discount"].value(soup)
+    if discount_text:
+        if patterns.DISCOUNT_PERCENT.match(discount_text):
+            record["discount_information"] = discount_text
+    elif promo_text := PLAN["promo"].value(soup):
+        if patterns.PERCENT_OFF.match(promo_text):
+            record["discount_information"] = promo_text
+
+
+def brand(soup, record, keyword):
+    for key, value in record["specifications"].items():
+        if key.lower() in ["brand", "product brand"]:
+            record["brand_name"] = value
+            return
+    if brand_text := PLAN["brand"].value(soup):
+        record["brand_name"] = patterns.BRAND_PREFIX.sub('', brand_text)
+    elif keyword and keyword.lower() in record.get("title", "").lower():
+        record["brand_name"] = keyword
+
+
+DETAIL_STEPS = (
+    ("description", description), ("review", review), ("rating", rating), ("supplier", supplier),
+    ("primary_image", primary_image), ("media", media), ("dimensions", dimensions),
+    ("specifications", specifications), ("discount", discount), ("brand", brand),
+)
+
+
+def extract_detail(html, url, record=None, keyword=None, timings=None, unresolved=None):
+    """Listing record completed from a product page; gallery thumbnails are resolved from markup and embedded data only.
+
+    Indices of the thumbnails left unresolved are appended to `unresolved` when it is given,
+    for a caller that can click them in the live page.
+    """
+    record = detail_record(new_record, url, record)
+    steps = DETAIL_STEPS
+    if unresolved is not None:
+        steps = [(name, partial(media, unresolved=unresolved) if step is media else step) for name, step in DETAIL_STEPS]
+    run_steps(steps, as_soup(html), record, keyword, timings)
+    return record
@@ -0,0 +1,220 @@
+import re
+import json
+import logging
+import selector_plans
+from selenium.webdriver.common.action_chains import ActionChains
+from readiness import wait_for_quiet
+
+logger = logging.getLogger(__name__)
+
+# Gallery thumbnail, big viewer and embedded page data selectors, declared in site_specs/dhgate.json
+PLAN = selector_plans.load("dhgate")
+
+# Where a thumbnail keeps its full-size source, best first
+IMAGE_ATTRS = ("data-zoom-image", "data-big-img", "data-original", "data-src", "src")
+VIDEO_ATTRS = ("data-video", "data-video-url", "data-video-src")
+
+THUMBNAIL_SIZE = "100x100"
+IMAGE_URL = re.compile(r"\.(jpe?g|png|webp)(\?|$)", re.IGNORECASE)
+VIDEO_URL = re.compile(r"\.(mp4|m3u8|webm)(\?|$)", re.IGNORECASE)
+# The product's own node in the embedded page data, and the gallery lists and video entries inside it;
+# recommendation, store and banner data elsewhere in the page data is never read
+PRODUCT_KEY = re.compile(r"^(product|item|goods)(info|detail|data)?$", re.IGNORECASE)
+GALLERY_KEY = re.compile(r"^(img|image|pic|photo)s?(list|urls?)?(list)?$", re.IGNORECASE)
+VIDEO_KEY = re.compile(r"video", re.IGNORECASE)
+# Rendition markers DHgate appends to an asset's file name: watch01-zoom.jpg, watch02-big.jpg
+RENDITION_SUFFIX = re.compile(r"[-_](big|zoom|small|thumb|\d+x\d+)$", re.IGNORECASE)
+
+# What the big viewer shows after a thumbnail click, read in one round trip
+BIG_MAP_SCRIPT = """
+    const view = document.querySelector(arguments[0]);
+    if (!view) return null;
+    const video = view.querySelector('video');
+    const videoSrc = video && (video.currentSrc || video.getAttribute('src')
+        || (video.querySelector('source') || {}).src);
+    const img = view.querySelector('img');
+    return {
+        video: videoSrc || null,
+        image: img ? (img.getAttribute('data-zoom-image') || img.getAttribute('src')) : null
+    };
+"""
+
+
+def absolute(url):
+    """Protocol-relative DHgate asset URLs made absolute."""
+    url = (url or "").strip()
+    return f"https:{url}" if url.startswith("//") else url
+
+
+def is_full_size(url):
+    return bool(url) and url.startswith("http") and THUMBNAIL_SIZE not in url
+
+
+def thumbnail_media(thumbnail):
+    """("video" | "image", url) a gallery thumbnail opens, when the markup already holds it."""
+    for element in [thumbnail] + thumbnail.find_all(True):
+        for attr in VIDEO_ATTRS:
+            if element.get(attr):
+                return "video", absolute(element[attr])
+    video = thumbnail.find("video")
+    if video:
+        source = video.get("src") or (video.find("source") or {}).get("src")
+        if source:
+            return "video", absolute(source)
+    image = thumbnail.find("img")
+    if image:
+        for attr in IMAGE_ATTRS:
+            url = absolute(image.get(attr))
+            if is_full_size(url):
+                return "image", url
+    return None
+
+
+def asset_key(url):
+    """File name of an asset without extension and rendition marker, shared by a thumbnail and its full-size image."""
+    name = (url or "").split("?")[0].rsplit("/", 1)[-1].rsplit(".", 1)[0]
+    return RENDITION_SUFFIX.sub("", name).lower()
+
+
+def _urls(value, pattern):
+    """Every string under value that looks like a media URL of the given kind, in document order."""
+    if isinstance(value, dict):
+        return [url for child in value.values() for url in _urls(child, pattern)]
+    if isinstance(value, list):
+        return [url for child in value for url in _urls(child, pattern)]
+    if isinstance(value, str) and pattern.search(value):
+        return [absolute(value)]
+    return []
+
+
+def _product_node(value):
+    """First dict under a product-like key that holds a gallery list, searched breadth first."""
+    queue = [value]
+    while queue:
+        node = queue.pop(0)
+        if isinstance(node, dict):
+            for key, child in node.items():
+                if PRODUCT_KEY.match(key) and isinstance(child, dict) and any(
+                    GALLERY_KEY.match(name) and isinstance(entries, list) for name, entries in child.items()
+                ):
+                    return child
+                queue.append(child)
+        elif isinstance(node, list):
+            queue.extend(node)
+    return None
+
+
+def embedded_media(soup):
+    """Image and video URLs of the product's own gallery node in the JSON page data, in gallery order."""
+    for _, scripts in PLAN["embedded_data"].matches(soup):
+        for script in scripts:
+            try:
+                product = _product_node(json.loads(script.string or ""))
+            except ValueError:
+                continue
+            if product is None:
+                continue
+            images, videos = [], []
+            for key, value in product.items():
+                if GALLERY_KEY.match(key) and isinstance(value, list):
+                    images.extend(url for url in _urls(value, IMAGE_URL) if is_full_size(url))
+                elif VIDEO_KEY.search(key):
+                    videos.extend(_urls(value, VIDEO_URL))
+            return images, videos
+    return [], []
+
+
+def click_media(driver, indices):
+    """Fallback: click the given thumbnails and read what the big viewer shows for each."""
+    found = []
+    thumbnails = PLAN["gallery_thumbnail"].live(driver)
+    for index in indices:
+        if index >= len(thumbnails):
+            continue
+        try:
+            ActionChains(driver).move_to_element(thumbnails[index]).click().perform()
+            wait_for_quiet(driver, quiet_ms=200, timeout=2)
+            view = driver.execute_script(BIG_MAP_SCRIPT, PLAN["gallery_view"].css()) or {}
+            if view.get("video"):
+                found.append(("video", absolute(view["video"])))
+            elif is_full_size(absolute(view.get("image"))):
+                found.append(("image", absolute(view["image"])))
+        except Exception as e:
+            logger.error(f"Error extracting media for thumbnail {index}: {e}")
+    return found
+
+
+def embedded_match(thumbnail, embedded_images, embedded_videos):
+    """("video" | "image", url) of the embedded gallery entry a thumbnail stands for, or None.
+
+    Image thumbnails match the full-size image with the same file name; a video thumbnail
+    takes the next embedded video.
+    """
+    if "video" in str(thumbnail).lower():
+        return ("video", embedded_videos.pop(0)) if embedded_videos else None
+    image = thumbnail.find("img")
+    key = asset_key(image.get("src") or image.get("data-src")) if image else ""
+    match = next((url for url in embedded_images if key and asset_key(url) == key), None)
+    return ("image", match) if match else None
+
+
+def resolve_media(soup, primary_image=""):
+    """(images, videos, unresolved thumbnail indices) of a product gallery from one parsed snapshot.
+
+    Each thumbnail is resolved from its own markup, then matched to an entry of the product's
+    gallery in the embedded JSON data. Thumbnails matched by neither are left unresolved.
+    """
+    images = [primary_image] if primary_image else []
+    videos = []
+
+    def add(kind, url):
+        target = videos if kind == "video" else images
+        if url and url not in target:
+            target.append(url)
+
+    thumbnails = PLAN["gallery_thumbnail"].values(soup)
+    unresolved = []
+    for index, thumbnail in enumerate(thumbnails):
+        media = thumbnail_media(thumbnail)
+        if media:
+            add(*media)
+        else:
+            unresolved.append(index)
+    if unresolved or not thumbnails:
+        embedded_images, embedded_videos = embedded_media(soup)
+        if not thumbnails:
+            # No gallery markup to match against: the product's gallery data is all there is
+            for url in embedded_videos:
+                add("video", url)
+            for url in embedded_images:
+                add("image", url)
+        embedded_videos = [url for url in embedded_videos if url not in videos]
+        still_unresolved = []
+        for index in unresolved:
+            media = embedded_match(thumbnails[index], embedded_images, embedded_videos)
+            if media:
+                add(*media)
+            else:
+                still_unresolved.append(index)
+        unresolved = still_unresolved
+    return images, videos, unresolved
+
+
+def add_clicked(driver, unresolved, images, videos):
+    """Click the thumbnails resolve_media left unresolved and add what the viewer shows to images and videos."""
+    logger.info(f"Clicking {len(unresolved)} thumbnails without a static source")
+    for kind, url in click_media(driver, unresolved):
+        target = videos if kind == "video" else images
+        if url and url not in target:
+            target.append(url)
+
+
+def extract_media(driver, soup, primary_image=""):
+    """Images and videos of a product gallery from one parsed snapshot of the page.
+
+    See resolve_media; only the thumbnails it leaves unresolved are clicked in the live page.
+    """
+    images, videos, unresolved = resolve_media(soup, primary_image)
+    if unresolved and driver is not None:
+        add_clicked(driver, unresolved, images, videos)
+    return images, videos
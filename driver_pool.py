@@ -0,0 +1,462 @@
+import os
+import glob
+import time
+import atexit
+import shutil
+import logging
+import tempfile
+import threading
+from collections import deque
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+from chromedriver_cache import provision, provisioned, chromedriver_service, browser_binary
+from network_events import enable_performance_log, drain
+from resource_blocking import clear_profile
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+# A browser is replaced by a fresh one once it crosses any of these limits
+RECYCLE_NAVIGATIONS = int(os.environ.get("SCRAPER_RECYCLE_NAVIGATIONS", 200))
+RECYCLE_RSS_MB = float(os.environ.get("SCRAPER_RECYCLE_RSS_MB", 1500))
+MAX_WINDOWS = int(os.environ.get("SCRAPER_MAX_WINDOWS", 16))
+
+PROFILE_PREFIX = "scraper-chrome-"
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+
+# Injected into every new document so the pooled sessions look like a regular browser
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+    window.navigator.chrome = { runtime: {} };
+    Object.defineProperty(navigator, 'platform', { get: () => 'Win32' });
+"""
+
+
+class PooledChrome(RemoteWebDriver):
+    """Chrome session attached to the pool's shared chromedriver service.
+
+    Counts navigations and remembers session-wide CDP setup (stealth script, user agent,
+    blocked URLs) so the browser behind it can be swapped for a fresh one mid-crawl.
+    """
+
+    # CDP commands whose effect lasts for the whole session and must be replayed on a new browser
+    STICKY_COMMANDS = ("Network.enable", "Network.setUserAgentOverride", "Network.setBlockedURLs", "Page.addScriptToEvaluateOnNewDocument")
+
+    def __init__(self, *args, profile_dir=None, **kwargs):
+        self.profile_dir = profile_dir
+        self.browser_pid = None
+        self.navigations = 0
+        self.windows = 1
+        self.rss_mb = None
+        self.started_at = time.monotonic()
+        self.before_navigation = None
+        self.sticky_commands = {}
+        super().__init__(*args, **kwargs)
+
+    def get_log(self, log_type):
+        """Gets the log for a given log type."""
+        return self.execute("getLog", {"type": log_type})["value"]
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        """Execute a CDP command, remembering session-wide setup for replay after a restart."""
+        result = self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+        if cmd in self.STICKY_COMMANDS:
+            self.sticky_commands[cmd] = cmd_args
+        return result
+
+    def count_navigation(self):
+        """Record a navigation started outside get(), e.g. from a detail tab."""
+        self.navigations += 1
+
+    def get(self, url):
+        """Loads a web page, letting the pool's watchdog recycle the browser first."""
+        if self.before_navigation:
+            self.before_navigation(self)
+        self.count_navigation()
+        super().get(url)
+
+    def restart_session(self, options, profile_dir):
+        """Replace the browser behind this driver with a new one, carrying cookies and CDP setup over."""
+        cookies = self.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        try:
+            self.execute(Command.QUIT)
+        except Exception as e:
+            logger.warning(f"Error quitting browser being recycled: {e}")
+        self.start_session(options.to_capabilities())
+        self.profile_dir = profile_dir
+        self.browser_pid = None
+        self.navigations = 0
+        self.windows = 1
+        self.rss_mb = None
+        self.started_at = time.monotonic()
+        for cmd, cmd_args in self.sticky_commands.items():
+            self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})
+        if cookies:
+            self.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+
+
+def browser_rss_mb(driver):
+    """Resident memory of a pooled browser and all its child processes, or None without psutil."""
+    if psutil is None or not driver.profile_dir:
+        return None
+    try:
+        if driver.browser_pid is None:
+            for proc in psutil.process_iter(["cmdline"]):
+                cmdline = proc.info["cmdline"] or []
+                if any(driver.profile_dir in arg for arg in cmdline) and not any(arg.startswith("--type=") for arg in cmdline):
+                    driver.browser_pid = proc.pid
+                    break
+            else:
+                return None
+        browser = psutil.Process(driver.browser_pid)
+        processes = [browser] + browser.children(recursive=True)
+        return round(sum(proc.memory_info().rss for proc in processes) / (1024 * 1024), 1)
+    except psutil.Error:
+        driver.browser_pid = None
+        return None
+
+
+def cleanup_stale_profiles():
+    """Delete temporary Chrome profiles left behind by scraper processes that are no longer running."""
+    for path in glob.glob(os.path.join(tempfile.gettempdir(), PROFILE_PREFIX + "*")):
+        try:
+            pid = int(os.path.basename(path)[len(PROFILE_PREFIX):].split("-")[0])
+        except ValueError:
+            continue
+        if pid == os.getpid():
+            continue
+        try:
+            os.kill(pid, 0)
+            continue
+        except ProcessLookupError:
+            pass
+        except OSError:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        logger.info(f"Removed stale Chrome profile {path}")
+
+
+class DriverPool:
+    """Pool of pre-launched Chrome sessions with checkout/return semantics.
+
+    All sessions talk to a single chromedriver process. A driver is health-checked
+    when it is checked out and reset (cookies, tabs, user agent) when it is returned.
+    """
+
+    def __init__(self, min_size=1, max_size=4, acquire_timeout=300, user_agent=DEFAULT_USER_AGENT,
+                 recycle_navigations=RECYCLE_NAVIGATIONS, recycle_rss_mb=RECYCLE_RSS_MB, max_windows=MAX_WINDOWS):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.user_agent = user_agent
+        self.recycle_navigations = recycle_navigations
+        self.recycle_rss_mb = recycle_rss_mb
+        self.max_windows = max_windows
+        self._recycled = 0
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._in_use = set()
+        self._creating = 0
+        self._service = None
+        self._closed = False
+
+    def _new_profile_dir(self):
+        return tempfile.mkdtemp(prefix=f"{PROFILE_PREFIX}{os.getpid()}-")
+
+    def _build_options(self, profile_dir):
+        """Chrome options shared by every pooled session."""
+        options = webdriver.ChromeOptions()
+        options.add_argument(f"--user-data-dir={profile_dir}")
+        options.add_argument("--headless=new")
+        # Return from navigation at DOMContentLoaded; readiness predicates decide when a page is usable
+        options.page_load_strategy = "eager"
+        options.add_argument("--ignore-certificate-errors")
+        options.add_argument("--log-level=3")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument(f"user-agent={self.user_agent}")
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option("useAutomationExtension", False)
+        enable_performance_log(options)
+        binary = browser_binary()
+        if binary:
+            options.binary_location = binary
+        return options
+
+    def _ensure_service(self):
+        """Start the shared chromedriver process on first use."""
+        with self._cond:
+            if self._service is None:
+                service = chromedriver_service()
+                service.start()
+                self._service = service
+                logger.info(f"Shared chromedriver service started at {service.service_url}")
+            return self._service
+
+    def _create_driver(self):
+        """Launch a new Chrome session on the shared service."""
+        service = self._ensure_service()
+        executor = ChromeRemoteConnection(remote_server_addr=service.service_url, keep_alive=True)
+        profile_dir = self._new_profile_dir()
+        try:
+            driver = PooledChrome(command_executor=executor, options=self._build_options(profile_dir), profile_dir=profile_dir)
+        except Exception:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+        driver.before_navigation = self._watch
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": STEALTH_SCRIPT})
+        except Exception as e:
+            logger.warning(f"Failed to install stealth script: {e}")
+        logger.info("Chrome WebDriver launched for pool.")
+        return driver
+
+    def _is_healthy(self, driver):
+        """Check that the session still responds."""
+        try:
+            driver.execute_script("return 1")
+            return bool(driver.window_handles)
+        except Exception:
+            return False
+
+    def _reset(self, driver):
+        """Return a driver to a clean state: one blank tab, no cookies, default user agent, nothing blocked."""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": self.user_agent})
+        clear_profile(driver)
+        driver.get("about:blank")
+        drain(driver)
+
+    def _quit(self, driver):
+        """End a session without stopping the shared service, and delete its profile."""
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error closing pooled browser: {e}")
+        if driver.profile_dir:
+            shutil.rmtree(driver.profile_dir, ignore_errors=True)
+
+    def _watch(self, driver):
+        """Recycle a browser before its next navigation once it has done too much or grown too big."""
+        driver.rss_mb = browser_rss_mb(driver)
+        try:
+            driver.windows = len(driver.window_handles)
+        except Exception:
+            pass
+        if driver.navigations >= self.recycle_navigations:
+            reason = f"{driver.navigations} navigations"
+        elif driver.rss_mb is not None and driver.rss_mb >= self.recycle_rss_mb:
+            reason = f"{driver.rss_mb} MB resident memory"
+        elif driver.windows > self.max_windows:
+            reason = f"{driver.windows} open windows"
+        else:
+            return
+        logger.info(f"Recycling browser after {reason}")
+        old_profile = driver.profile_dir
+        profile_dir = self._new_profile_dir()
+        try:
+            driver.restart_session(self._build_options(profile_dir), profile_dir)
+        except Exception:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+        if old_profile:
+            shutil.rmtree(old_profile, ignore_errors=True)
+        with self._cond:
+            self._recycled += 1
+
+    def _describe(self, driver):
+        return {
+            "navigations": driver.navigations,
+            "windows": driver.windows,
+            "rss_mb": browser_rss_mb(driver),
+            "age_seconds": round(time.monotonic() - driver.started_at, 1)
+        }
+
+    def acquire(self, timeout=None):
+        """Check out a healthy driver, launching one if the pool has room."""
+        deadline = time.monotonic() + (self.acquire_timeout if timeout is None else timeout)
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Driver pool is shut down")
+                    if self._idle:
+                        driver = self._idle.popleft()
+                        self._in_use.add(driver)
+                        create = False
+                        break
+                    if len(self._in_use) + self._creating < self.max_size:
+                        self._creating += 1
+                        driver = None
+                        create = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No browser available after waiting; pool max size is {self.max_size}")
+                    self._cond.wait(remaining)
+            if create:
+                try:
+                    driver = self._create_driver()
+                except Exception:
+                    with self._cond:
+                        self._creating -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._creating -= 1
+                    self._in_use.add(driver)
+                return driver
+            if self._is_healthy(driver):
+                return driver
+            logger.warning("Discarding unhealthy pooled browser.")
+            self._discard(driver)
+
+    def release(self, driver, discard=False):
+        """Return a driver to the pool, resetting its state."""
+        if driver is None:
+            return
+        if not discard:
+            try:
+                self._reset(driver)
+            except Exception as e:
+                logger.warning(f"Failed to reset pooled browser, discarding it: {e}")
+                discard = True
+        if discard:
+            self._discard(driver)
+            return
+        with self._cond:
+            self._in_use.discard(driver)
+            if self._closed:
+                self._quit(driver)
+            else:
+                self._idle.append(driver)
+            self._cond.notify()
+
+    def _discard(self, driver):
+        with self._cond:
+            self._in_use.discard(driver)
+            self._cond.notify()
+        self._quit(driver)
+
+    @contextmanager
+    def driver(self):
+        """Context manager that checks a driver out and returns it afterwards."""
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def prewarm(self, background=True):
+        """Launch drivers until min_size sessions are idle."""
+        def fill():
+            while True:
+                with self._cond:
+                    if self._closed or len(self._idle) + len(self._in_use) + self._creating >= self.min_size:
+                        return
+                    self._creating += 1
+                try:
+                    driver = self._create_driver()
+                except Exception as e:
+                    logger.error(f"Failed to prewarm browser: {e}")
+                    with self._cond:
+                        self._creating -= 1
+                    return
+                with self._cond:
+                    self._creating -= 1
+                    self._idle.append(driver)
+                    self._cond.notify()
+
+        if background:
+            threading.Thread(target=fill, name="driver-pool-prewarm", daemon=True).start()
+        else:
+            fill()
+
+    def stats(self):
+        """Current pool occupancy."""
+        with self._cond:
+            drivers = list(self._idle) + list(self._in_use)
+            stats = {
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "starting": self._creating,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "recycled": self._recycled,
+                "chromedriver": provisioned()
+            }
+        stats["browsers"] = [self._describe(driver) for driver in drivers]
+        return stats
+
+    def shutdown(self):
+        """Quit every idle driver and stop the shared chromedriver service."""
+        with self._cond:
+            self._closed = True
+            drivers = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for driver in drivers:
+            self._quit(driver)
+        if self._service is not None:
+            try:
+                self._service.stop()
+            except Exception as e:
+                logger.warning(f"Error stopping chromedriver service: {e}")
+            self._service = None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide driver pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool(
+                min_size=int(os.environ.get("SCRAPER_POOL_MIN_SIZE", 1)),
+                max_size=int(os.environ.get("SCRAPER_POOL_MAX_SIZE", 4))
+            )
+            atexit.register(_pool.shutdown)
+            cleanup_stale_profiles()
+        return _pool
+
+
+def warm_up():
+    """Provision the chromedriver binaries and prewarm the pool at server start."""
+    try:
+        provision()
+    except Exception as e:
+        logger.error(f"Chromedriver provisioning failed: {e}")
+        return
+    get_pool().prewarm()
+
+
+def acquire_driver(timeout=None):
+    """Check out a driver from the process-wide pool."""
+    return get_pool().acquire(timeout)
+
+
+def release_driver(driver, discard=False):
+    """Return a driver to the process-wide pool."""
+    get_pool().release(driver, discard)
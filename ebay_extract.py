@@ -0,0 +1,212 @@
+import json
+import logging
+import patterns
+import selector_plans
+from retry_policy import extract as extract_field
+from extractors import as_soup, detail_record, run_steps, timed
+
+logger = logging.getLogger(__name__)
+
+# Search card fields, declared in site_specs/ebay.json
+PLAN = selector_plans.load("ebay")
+CARD_FIELDS = ["url", "title", "price", "location"]
+
+ITEM_URL = "https://www.ebay.com/itm/"
+ITEM_SPECIFICS = "div#viTabs_0_is dl[data-testid='ux-labels-values']"
+
+
+def new_record():
+    return {
+        "url": "N/A",
+        "title": "N/A",
+        "currency": "N/A",
+        "exact_price": "N/A",
+        "description": "N/A",
+        "min_order": "1 unit",
+        "supplier": "N/A",
+        "feedback": {"rating": "N/A", "review": "N/A"},
+        "image_url": "N/A",
+        "images": [],
+        "videos": [],
+        "specifications": {},
+        "website_name": "eBay",
+        "discount_information": "N/A",
+        "brand_name": "N/A",
+        "origin": "N/A"
+    }
+
+
+def split_price(price_text, record):
+    """Currency code and number of a displayed price like "US $12.99", keeping the record's values for parts not found."""
+    currency_match = patterns.EBAY_CURRENCY.match(price_text)
+    price_match = patterns.EBAY_PRICE.search(price_text)
+    return (
+        currency_match.group(1).strip() if currency_match else record["currency"],
+        price_match.group(0).replace(",", "") if price_match else record["exact_price"],
+    )
+
+
+def card_record(fields):
+    """Listing record from a card's url, title, price and location values, or None for non-item links."""
+    record = new_record()
+    if fields["url"]:
+        record["title"] = fields["title"] or "N/A"
+        record["url"] = fields["url"].split('?')[0]
+    if not record["url"] or not record["url"].startswith(ITEM_URL):
+        logger.warning(f"Invalid URL: {record['url']}")
+        return None
+    if fields["price"]:
+        record["currency"], record["exact_price"] = split_price(fields["price"], record)
+    record["origin"] = fields["location"].replace("from ", "").strip() if fields["location"] else "N/A"
+    return record
+
+
+def extract_card(card, keyword=None, timings=None):
+    """Listing record from one search result card element."""
+    return card_record(timed(timings, "fields", PLAN.extract, card, CARD_FIELDS))
+
+
+def extract_search(html, url, keyword=None, timings=None):
+    """Listing records of the item cards on a search page."""
+    cards = PLAN["card"].values(as_soup(html))
+    records = (extract_card(card, keyword, timings) for card in cards)
+    return [record for record in records if record]
+
+
+def price(soup, record, keyword):
+    price_text = extract_field(
+        lambda: soup.find("div", {"class": "x-price-primary"}).find("span", {"class": "ux-textspans"}).get_text(strip=True),
+        "", "ebay.price"
+    )
+    if price_text:
+        record["currency"], record["exact_price"] = split_price(price_text, record)
+
+
+def description(soup, record, keyword):
+    record["description"] = extract_field(lambda: soup.find("div", {"id": "viTabs_0_is"}).get_text(strip=True), "N/A", "ebay.description")
+
+
+def store_name(link):
+    """Seller name from a store link's client presentation metadata."""
+    metadata = link.get("data-clientpresentationmetadata")
+    return json.loads(metadata).get("_ssn", "") if metadata else ""
+
+
+def supplier(soup, record, keyword):
+    record["supplier"] = extract_field(
+        lambda: soup.find("div", class_=patterns.EBAY_SELLER_CARD)
+            .find("a", href=patterns.EBAY_STORE_LINK)
+            .find("span", class_="ux-textspans--BOLD").get_text(strip=True),
+        "N/A", "ebay.supplier"
+    )
+    if record["supplier"] == "N/A":
+        record["supplier"] = extract_field(
+            lambda: next((name for name in map(store_name, soup.find_all("a", href=patterns.EBAY_STORE_LINK)) if name), "N/A"),
+            "N/A", "ebay.supplier"
+        )
+
+
+def feedback(soup, record, keyword):
+    container = soup.find("div", class_="x-sellercard-atf_info_about-seller")
+    if not container:
+        return
+    record["feedback"]["rating"] = extract_field(
+        lambda: container.find("span", class_="ux-textspans ux-textspans--BOLD").get_text(strip=True),
+        "N/A", "ebay.feedback.rating"
+    )
+    review_text = extract_field(
+        lambda: container.find("span", class_="ux-textspans ux-textspans--SECONDARY").get_text(strip=True),
+        "", "ebay.review_text"
+    )
+    review_match = patterns.EBAY_REVIEW_COUNT.search(review_text)
+    record["feedback"]["review"] = review_match.group(1).replace(",", "") if review_match else "N/A"
+
+
+def image_size(url):
+    match = patterns.EBAY_IMAGE_SIZE.search(url)
+    return int(match.group(1)) if match else 0
+
+
+def images(soup, record, keyword):
+    image_urls = set()
+    for item in soup.find_all("div", {"class": "ux-image-carousel-item"}):
+        img_tag = item.find("img")
+        if not img_tag:
+            continue
+        for attr in ["src", "data-zoom-src", "srcset"]:
+            src = img_tag.get(attr)
+            if src and attr == "srcset":
+                image_urls.update(url.split()[0] for url in src.split(",") if url.strip())
+            elif src:
+                image_urls.add(src)
+    record["images"] = sorted(image_urls, key=image_size, reverse=True)
+    record["image_url"] = record["images"][0] if record["images"] else "N/A"
+
+
+def dimensions(soup, record, keyword):
+    found = []
+    spec_table = soup.find("div", {"class": "ux-layout-section-evo"})
+    if spec_table:
+        for label in spec_table.find_all("div", {"class": "ux-labels-values__labels"}):
+            label_text = label.get_text(strip=True).lower()
+            if not any(key in label_text for key in ["size", "dimensions"]):
+                continue
+            value_container = label.find_parent().find_next_sibling("div", {"class": "ux-labels-values__values"})
+            span = value_container.find("span", {"class": "ux-textspans"}) if value_container else None
+            dim_text = span.get_text(strip=True) if span else ""
+            for match in patterns.EBAY_DIMENSION.finditer(dim_text):
+                found.append(f"{label_text}: {dim_text} ({match.group(0)})")
+    record["dimensions"] = "; ".join(found) if found else "N/A"
+
+
+def item_specifics(soup):
+    """Label/value pairs of the item specifics tab."""
+    specifications = {}
+    for spec in soup.select(ITEM_SPECIFICS):
+        key_elem, value_elem = spec.find("dt"), spec.find("dd")
+        key = key_elem.get_text(" ", strip=True) if key_elem else ""
+        value = value_elem.get_text(" ", strip=True) if value_elem else ""
+        if key and value:
+            specifications[key] = value
+    return specifications
+
+
+def specifications(soup, record, keyword):
+    record["specifications"] = item_specifics(soup)
+
+
+def discount(soup, record, keyword):
+    original_price_elem = soup.find("span", {"class": "ux-textspans--STRIKETHROUGH"})
+    if original_price_elem:
+        try:
+            original_val = float(original_price_elem.get_text(strip=True).replace(record["currency"], "").replace(",", "").strip())
+            current_val = float(record["exact_price"])
+            if original_val > current_val:
+                record["discount_information"] = f"{((original_val - current_val) / original_val) * 100:.2f}% off"
+        except ValueError:
+            pass
+    else:
+        discount_elem = soup.find("span", {"class": "ux-textspans ux-textspans--EMPHASIS"})
+        record["discount_information"] = discount_elem.get_text(strip=True).strip('()') if discount_elem else "N/A"
+
+
+def brand(soup, record, keyword):
+    record["brand_name"] = record["specifications"].get("Brand", "N/A")
+    if record["brand_name"] == "N/A" and keyword:
+        brand_parts = keyword.split()
+        if brand_parts and brand_parts[0].lower() in record["title"].lower():
+            record["brand_name"] = brand_parts[0]
+
+
+DETAIL_STEPS = (
+    ("price", price), ("description", description), ("supplier", supplier), ("feedback", feedback),
+    ("images", images), ("dimensions", dimensions), ("specifications", specifications), ("discount", discount),
+    ("brand", brand),
+)
+
+
+def extract_detail(html, url, record=None, keyword=None, timings=None):
+    """Listing record completed from an item page: price, description, seller, feedback, images, dimensions, specifics, discount and brand."""
+    record = detail_record(new_record, url, record)
+    run_steps(DETAIL_STEPS, as_soup(html), record, keyword, timings)
+    return record
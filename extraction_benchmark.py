@@ -0,0 +1,154 @@
+"""Offline extraction benchmark over the stored fixture corpus, one row per page.
+
+Usage: python extraction_benchmark.py [--sites amazon,ebay] [--repeat N] [--cards N] [--engine lxml]
+
+Every fixtures/<site>/search.html and fixtures/<site>/detail.html goes through the site's
+driver-independent extractors (see extractors.py), exactly as the scrapers run them on a live
+snapshot. Each site also gets a synthetic search page holding --cards copies of its fixture
+cards. For each page the run reports best-of-N time, throughput, peak traced allocation and
+the costliest fields, and it fails when a fixture yields no records or a detail page fills no
+field, i.e. when the corpus and the extractors have drifted apart.
+"""
+import os
+import sys
+import time
+import atexit
+import argparse
+import tracemalloc
+import extractors
+import selector_plans
+from html_parser import ENGINE, parse
+
+FIXTURE_DIR = os.environ.get("SCRAPER_FIXTURES") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Where each site's search cards are declared: (spec site, card field)
+SEARCH = {
+    "amazon": ("amazon", "card"),
+    "ebay": ("ebay", "card"),
+    "flipkart": ("flipkart", "card"),
+    "dhgate": ("dhgate", "card"),
+    "indiamart": ("indiamart", "card"),
+    "alibaba": ("alibaba", "product_card"),
+}
+
+# Where synthetic pages repeat cards; defaults to the site's card selector
+SYNTHETIC_CARD = {"madeinchina": ".prod-list .list-node"}
+
+
+def fixture_cards(site, soup):
+    """Card elements of a parsed search page, using the first card fallback that matches."""
+    if site in SYNTHETIC_CARD:
+        return soup.select(SYNTHETIC_CARD[site])
+    spec_site, card = SEARCH[site]
+    return next((found for _, found in selector_plans.load(spec_site)[card].matches(soup)), [])
+
+
+def run_page(site, kind, markup, engine, timings=None):
+    """Records the site's extractors produce for one fixture page."""
+    soup = parse(markup, engine)
+    url = f"file://{site}/{kind}.html"
+    if kind == "detail":
+        return [extractors.extract_detail(site, soup, url, timings=timings)]
+    return extractors.extract_search(site, soup, url, timings=timings)
+
+
+def filled_fields(site, record):
+    """Fields of a record the extractors changed from the site's empty record."""
+    if record is None:
+        return 0
+    empty = extractors.site(site).new_record()
+    return sum(1 for name, value in record.items() if name != "url" and value and value != empty.get(name))
+
+
+def synthesize(site, markup, count):
+    """A search page whose card container holds `count` copies of the fixture's cards."""
+    soup = parse(markup, "html.parser")
+    cards = fixture_cards(site, soup)
+    if not cards:
+        return None
+    templates = [str(card) for card in cards]
+    container = cards[0].parent
+    container.clear()
+    container.append("@@CARDS@@")
+    return str(soup).replace("@@CARDS@@", "".join(templates[i % len(templates)] for i in range(count)))
+
+
+def measure(site, kind, markup, engine, repeat):
+    """Best-of-N seconds, records and per-field seconds of the best run, and traced peak bytes."""
+    best = None
+    for _ in range(repeat):
+        timings = {}
+        start = time.perf_counter()
+        records = run_page(site, kind, markup, engine, timings)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = (elapsed, records, timings)
+    tracemalloc.start()
+    run_page(site, kind, markup, engine)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best + (peak,)
+
+
+def pages_for(site, cards):
+    """(label, kind, markup) for the site's fixtures and its synthetic search page."""
+    pages = []
+    for kind in ("search", "detail"):
+        path = os.path.join(FIXTURE_DIR, site, f"{kind}.html")
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            markup = f.read()
+        pages.append((f"{kind}.html", kind, markup))
+        if kind == "search" and cards:
+            synthetic = synthesize(site, markup, cards)
+            if synthetic:
+                pages.append((f"synthetic x{cards}", kind, synthetic))
+    return pages
+
+
+def run(sites, engine, repeat=3, cards=2000, top=3):
+    """Benchmark every page of every site; returns False when a fixture extracts nothing."""
+    healthy = True
+    print(f"{'site':<12} {'page':<18} {'KB':>7} {'ms':>9} {'pages/s':>9} {'cards/s':>10} {'MB/s':>7} {'peak KB':>9}  fields")
+    for site in sites:
+        for label, kind, markup in pages_for(site, cards):
+            elapsed, records, fields, peak = measure(site, kind, markup, engine, repeat)
+            if kind == "search":
+                found = len(records)
+            else:
+                found = filled_fields(site, records[0])
+            if not found:
+                healthy = False
+            size = len(markup.encode("utf-8"))
+            card_rate = f"{len(records) / elapsed:>10.0f}" if kind == "search" else f"{'-':>10}"
+            costliest = sorted(fields.items(), key=lambda item: -item[1])[:top]
+            summary = ", ".join(f"{name} {seconds * 1e6:.0f}us" for name, seconds in costliest)
+            verdict = f"{found} {'cards' if kind == 'search' else 'fields'}" + ("" if found else " EMPTY")
+            print(f"{site:<12} {label:<18} {size / 1024:>7.0f} {elapsed * 1000:>9.2f} {1 / elapsed:>9.1f} {card_rate} "
+                  f"{size / elapsed / 1e6:>7.1f} {peak / 1024:>9.0f}  {verdict}; {summary}")
+    return healthy
+
+
+def main(argv=None):
+    sites = sorted(extractors.MODULES)
+    parser = argparse.ArgumentParser(description="Offline extraction benchmark over the fixture corpus")
+    parser.add_argument("--sites", default=",".join(sites), help="comma separated, from: " + ", ".join(sites))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cards", type=int, default=2000, help="cards on each synthetic search page; 0 to skip")
+    parser.add_argument("--engine", default=ENGINE)
+    parser.add_argument("--top", type=int, default=3, help="costliest fields shown per page")
+    args = parser.parse_args(argv)
+    # Benchmark probes must not skew the selector stats the scrapers persist
+    selector_plans.SAVE_INTERVAL = float("inf")
+    selector_plans.load("amazon")
+    atexit.unregister(selector_plans.save)
+    chosen = [site.strip() for site in args.sites.split(",") if site.strip()]
+    unknown = [site for site in chosen if site not in sites]
+    if unknown:
+        parser.error(f"Unknown sites: {', '.join(unknown)}")
+    return 0 if run(chosen, args.engine, args.repeat, args.cards, args.top) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
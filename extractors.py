@@ -0,0 +1,84 @@
+import copy
+import time
+import logging
+import importlib
+from html_parser import parse
+
+logger = logging.getLogger(__name__)
+
+# Site name -> module holding its driver-independent extractors. Each module exposes
+# new_record(), extract_card(card, keyword), extract_search(html, url, keyword) and
+# extract_detail(html, url, record, keyword); all take page HTML or a parsed tree and
+# never touch a WebDriver, so they run the same on a live snapshot, an archived page or
+# inside a worker process.
+MODULES = {
+    "amazon": "amazon_extract",
+    "ebay": "ebay_extract",
+    "flipkart": "flipkart_extract",
+    "madeinchina": "madeinchina_extract",
+    "dhgate": "dhgate_extract",
+    "indiamart": "indiamart_extract",
+    "alibaba": "alibaba_extract",
+}
+
+
+def site(name):
+    """The extractor module of a site, imported on first use."""
+    if name not in MODULES:
+        raise ValueError(f"No extractors for site '{name}'")
+    return importlib.import_module(MODULES[name])
+
+
+def as_soup(html):
+    """Parse page HTML, or pass an already parsed tree through."""
+    return parse(html) if isinstance(html, (str, bytes)) else html
+
+
+def detail_record(new_record, url, record):
+    """A copy of a listing record, or a fresh new_record(), to fill from a detail page."""
+    record = copy.deepcopy(record) if record is not None else new_record()
+    record["url"] = url
+    return record
+
+
+def timed(timings, name, func, *args):
+    """func(*args), with its seconds accumulated into timings[name] when timings is given."""
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def run_steps(steps, source, record, keyword=None, timings=None):
+    """Run (name, step) field extractors over one source into record.
+
+    A failing step is logged and skipped. A step returning False rejects the record and
+    ends the run, which then returns False. Per-step seconds accumulate into timings.
+    """
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            keep = step(source, record, keyword)
+        except Exception as e:
+            logger.warning(f"Error extracting {name}: {e}")
+            keep = None
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+        if keep is False:
+            return False
+    return True
+
+
+def extract_search(name, html, url, keyword=None, timings=None):
+    """Listing records of every card on a search page."""
+    return site(name).extract_search(html, url, keyword, timings)
+
+
+def extract_detail(name, html, url, record=None, keyword=None, timings=None):
+    """A record completed from a detail page, starting from the listing record if given.
+
+    None when the site's extractor rejects the product, e.g. a title not matching the keyword.
+    """
+    return site(name).extract_detail(html, url, record, keyword, timings)
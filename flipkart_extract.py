@@ -0,0 +1,174 @@
+import logging
+import patterns
+import selector_plans
+from urllib.parse import urljoin
+from extractors import as_soup, detail_record, run_steps, timed
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://www.flipkart.com"
+
+# Search card and product page selectors, declared in site_specs/flipkart.json
+PLAN = selector_plans.load("flipkart")
+
+# Inline script holding the page's embedded state, including the product's gallery
+STATE_MARKER = "__INITIAL_STATE__"
+# Image CDN path segment of the full-size gallery rendition; thumbnails differ only in it
+GALLERY_SIZE = "/image/832/832/"
+
+
+def new_record():
+    return {
+        "url": "N/A",
+        "title": "N/A",
+        "currency": "N/A",
+        "exact_price": "N/A",
+        "description": "N/A",
+        "min_order": "1 unit",
+        "supplier": "N/A",
+        "feedback": {"rating": "N/A", "review": "N/A"},
+        "image_url": "N/A",
+        "images": [],
+        "videos": [],
+        "specifications": {},
+        "website_name": "Flipkart",
+        "discount_information": "N/A"
+    }
+
+
+def text(element):
+    """Element text with child blocks separated by single spaces, like the rendered text."""
+    return patterns.normalize_space(element.get_text(" ")) if element is not None else ""
+
+
+def extract_card(card, keyword=None, timings=None):
+    """Listing record from one search result card; only the product URL is shown there."""
+    href = timed(timings, "card_link", PLAN["card_link"].value, card)
+    if not href:
+        return None
+    record = new_record()
+    record["url"] = urljoin(BASE_URL, href)
+    return record
+
+
+def extract_search(html, url, keyword=None, timings=None):
+    """Listing records of the result cards on a search page."""
+    cards = PLAN["card"].values(as_soup(html))
+    records = (extract_card(card, keyword, timings) for card in cards)
+    return [record for record in records if record]
+
+
+def title(soup, record, keyword):
+    record["title"] = text(PLAN["title"].first(soup)) or "N/A"
+    if keyword and keyword.lower() not in record["title"].lower():
+        logger.info(f"Skipping non-matching product: {record['title']}")
+        return False
+
+
+def price(soup, record, keyword):
+    record["exact_price"] = text(PLAN["price"].first(soup)) or "N/A"
+    match = patterns.FLIPKART_PRICE.match(record["exact_price"])
+    if match:
+        record["currency"] = match.group(1)
+        record["exact_price"] = match.group(2).replace(",", "")
+
+
+def description(soup, record, keyword):
+    titles = [text(element) for _, elements in PLAN["title"].matches(soup) for element in elements]
+    record["description"] = " ".join(title for title in titles if title) or "N/A"
+
+
+def supplier(soup, record, keyword):
+    element = PLAN["supplier"].first(soup)
+    record["supplier"] = next(element.stripped_strings, "N/A") if element is not None else "N/A"
+
+
+def feedback(soup, record, keyword):
+    rating = text(PLAN["rating"].first(soup)).split()
+    record["feedback"]["rating"] = rating[0] if rating else "N/A"
+    record["feedback"]["review"] = text(PLAN["review"].first(soup)) or "N/A"
+
+
+def discount(soup, record, keyword):
+    record["discount_information"] = text(PLAN["discount"].first(soup)) or "N/A"
+
+
+def full_size(image_url):
+    """Gallery rendition of a Flipkart image URL, whatever size and quality it was requested in."""
+    image_url = image_url.split("?")[0].replace("{@width}/{@height}", "0/0")
+    if image_url.startswith("http://"):
+        image_url = "https://" + image_url[len("http://"):]
+    return patterns.FLIPKART_IMAGE_SIZE.sub(GALLERY_SIZE, image_url)
+
+
+def state_images(soup):
+    """Gallery image URLs from the media list in the page's embedded state."""
+    for script in soup.find_all("script", string=patterns.FLIPKART_INITIAL_STATE):
+        media = patterns.FLIPKART_MULTIMEDIA.search(script.string)
+        if media:
+            return [full_size(url) for url in patterns.FLIPKART_STATE_IMAGE.findall(media.group(1))]
+    return []
+
+
+def thumbnail_source(thumbnail):
+    """Full-size image URL a gallery thumbnail's own src gives away, or None (lazy placeholder, no image)."""
+    image = thumbnail.find("img")
+    src = image.get("src", "") if image is not None else ""
+    return full_size(src) if src.startswith("http") else None
+
+
+def unresolved_thumbnails(soup):
+    """Indices of gallery image thumbnails whose full-size image the snapshot does not give away.
+
+    Video thumbnails are skipped; they never show an image in the gallery viewer.
+    """
+    gallery = PLAN["gallery"].first(soup)
+    if gallery is None:
+        return []
+    return [
+        index for index, thumbnail in enumerate(PLAN["gallery_thumbnail"].values(gallery))
+        if "video" not in str(thumbnail).lower() and thumbnail_source(thumbnail) is None
+    ]
+
+
+def images(soup, record, keyword):
+    gallery = PLAN["gallery"].first(soup)
+    found = []
+    if gallery is not None:
+        found.extend(PLAN["gallery_image"].values(gallery))
+        # Thumbnails are smaller renditions of the gallery images, so no click is needed to see them
+        found.extend(src for src in PLAN["thumbnail_image"].values(gallery) if src.startswith("http"))
+    found.extend(state_images(soup))
+    for image_url in map(full_size, found):
+        if record["image_url"] == "N/A":
+            record["image_url"] = image_url
+        if image_url not in record["images"]:
+            record["images"].append(image_url)
+
+
+def spec_rows(root):
+    """Label to comma-joined values of every specification table row under root."""
+    specifications = {}
+    for row in PLAN["spec_row"].values(root):
+        label = PLAN["spec_label"].value(row)
+        if label:
+            specifications[label] = ", ".join(PLAN["spec_value"].values(row))
+    return specifications
+
+
+def specifications(soup, record, keyword):
+    table = PLAN["specifications"].first(soup)
+    if table is not None:
+        record["specifications"] = spec_rows(table)
+
+
+DETAIL_STEPS = (
+    ("title", title), ("price", price), ("description", description), ("supplier", supplier),
+    ("feedback", feedback), ("discount", discount), ("images", images), ("specifications", specifications),
+)
+
+
+def extract_detail(html, url, record=None, keyword=None, timings=None):
+    """Listing record completed from a product page, or None when its title does not match the keyword."""
+    record = detail_record(new_record, url, record)
+    return record if run_steps(DETAIL_STEPS, as_soup(html), record, keyword, timings) else None
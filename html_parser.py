@@ -0,0 +1,87 @@
+import os
+import logging
+from bs4 import BeautifulSoup, FeatureNotFound
+
+logger = logging.getLogger(__name__)
+
+# Tree builders in order of preference; html.parser ships with Python and is always available
+ENGINES = ("lxml", "html.parser")
+
+# Executable scripts, styles and embedded graphics never hold data the extractors read.
+# Data-only scripts (text/data-video, application/json, ...) are left in place.
+PRUNED = "style, noscript, svg, iframe, link, script:not([type]), script[type='text/javascript'], script[type='module']"
+
+# Outer HTML of the outermost elements matching any region selector, in document order and
+# pruned, followed by whole inline scripts containing any of the given markers
+REGIONS_SCRIPT = """
+    const [regions, markers, pruned] = arguments;
+    const taken = [];
+    for (const selector of regions) {
+        for (const el of document.querySelectorAll(selector)) {
+            if (taken.some(t => t.contains(el))) continue;
+            for (let i = taken.length - 1; i >= 0; i--) {
+                if (el.contains(taken[i])) taken.splice(i, 1);
+            }
+            taken.push(el);
+        }
+    }
+    if (!taken.length) return null;
+    taken.sort((a, b) => a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING ? -1 : 1);
+    const parts = taken.map(el => {
+        const copy = el.cloneNode(true);
+        copy.querySelectorAll(pruned).forEach(node => node.remove());
+        return copy.outerHTML;
+    });
+    for (const script of document.scripts) {
+        if (markers.some(marker => script.text.includes(marker))) parts.push(script.outerHTML);
+    }
+    return parts.join('\\n');
+"""
+
+
+def available(engine):
+    """Whether BeautifulSoup can build trees with the given engine in this environment."""
+    try:
+        BeautifulSoup("", engine)
+        return True
+    except FeatureNotFound:
+        return False
+
+
+def _select_engine():
+    """Engine named by SCRAPER_HTML_PARSER, else the fastest one installed."""
+    requested = os.environ.get("SCRAPER_HTML_PARSER")
+    if requested:
+        if available(requested):
+            return requested
+        logger.warning(f"HTML parser '{requested}' is not installed, choosing automatically")
+    for engine in ENGINES:
+        if available(engine):
+            return engine
+    return "html.parser"
+
+
+ENGINE = _select_engine()
+
+
+def parse(markup, engine=None):
+    """Parse a page or fragment into a BeautifulSoup tree with the configured engine."""
+    return BeautifulSoup(markup, engine or ENGINE)
+
+
+def capture_regions(driver, regions, keep_scripts=()):
+    """Outer HTML of the regions of the live page an extractor reads, with scripts and styles pruned.
+
+    Inline scripts containing any of the `keep_scripts` markers are kept whole. Falls back to
+    the full page_source when no region matches, e.g. after a site layout change.
+    """
+    markup = driver.execute_script(REGIONS_SCRIPT, list(regions), list(keep_scripts), PRUNED)
+    if not markup:
+        logger.debug(f"No detail regions matched on {driver.current_url}, taking the full page")
+        markup = driver.page_source
+    return markup
+
+
+def parse_regions(driver, regions, keep_scripts=()):
+    """Parse only the regions of the live page an extractor reads; see capture_regions."""
+    return parse(capture_regions(driver, regions, keep_scripts))
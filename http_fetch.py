@@ -0,0 +1,100 @@
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from html_parser import parse as parse_html
+
+logger = logging.getLogger(__name__)
+
+# Set SCRAPER_HTTP_FAST_PATH=0 to always render pages in Chrome
+ENABLED = os.environ.get("SCRAPER_HTTP_FAST_PATH", "1") != "0"
+PER_HOST_CONNECTIONS = int(os.environ.get("SCRAPER_HTTP_PER_HOST", 6))
+TIMEOUT = float(os.environ.get("SCRAPER_HTTP_TIMEOUT", 15))
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+_session = None
+_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide keep-alive session, creating it on first use.
+
+    Each host gets its own connection pool of at most PER_HOST_CONNECTIONS sockets;
+    callers beyond that block until a connection is returned instead of opening more.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=PER_HOST_CONNECTIONS, pool_block=True)
+            session = requests.Session()
+            session.headers.update(DEFAULT_HEADERS)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def fetch_html(url, headers=None, timeout=TIMEOUT):
+    """GET a page without a browser and return its raw bytes, or None when the fast path is disabled or the request fails."""
+    if not ENABLED:
+        return None
+    try:
+        response = get_session().get(url, headers=headers, timeout=timeout)
+    except requests.RequestException as e:
+        logger.info(f"HTTP fetch failed for {url}, falling back to browser: {e}")
+        return None
+    if response.status_code != 200:
+        logger.info(f"HTTP fetch returned {response.status_code} for {url}, falling back to browser")
+        return None
+    # Raw bytes let the parser honour the page's own charset declaration
+    return response.content
+
+
+def fetch_soup(url, required=(), headers=None, timeout=TIMEOUT):
+    """GET a page without a browser and parse it.
+
+    Returns None when the fast path is disabled, the request fails, or any CSS selector in
+    `required` is missing from the response, so the caller can fall back to Selenium.
+    """
+    markup = fetch_html(url, headers, timeout)
+    if markup is None:
+        return None
+    soup = parse_html(markup)
+    missing = [selector for selector in required if soup.select_one(selector) is None]
+    if missing:
+        logger.info(f"HTTP response for {url} lacks {', '.join(missing)}, falling back to browser")
+        return None
+    return soup
+
+
+def fetch_many(urls, required=(), headers=None, timeout=TIMEOUT):
+    """fetch_soup for several URLs concurrently; results are returned in input order."""
+    urls = list(urls)
+    if not ENABLED or not urls:
+        return [None] * len(urls)
+    with ThreadPoolExecutor(max_workers=min(PER_HOST_CONNECTIONS, len(urls))) as executor:
+        return list(executor.map(lambda url: fetch_soup(url, required, headers, timeout), urls))
+
+
+def fetch_each(urls, handle, headers=None, timeout=TIMEOUT):
+    """fetch_html for several URLs concurrently, calling handle(url, markup) in the fetching thread as each page arrives.
+
+    markup is None for pages that could not be fetched. A handle that blocks, e.g. on a full
+    parse queue, holds its fetching thread back from the next request.
+    """
+    urls = list(urls)
+    if not urls:
+        return
+    if not ENABLED:
+        for url in urls:
+            handle(url, None)
+        return
+    with ThreadPoolExecutor(max_workers=min(PER_HOST_CONNECTIONS, len(urls))) as executor:
+        list(executor.map(lambda url: handle(url, fetch_html(url, headers, timeout)), urls))
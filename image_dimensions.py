@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+from pathlib import Path
+import patterns
+
+logger = logging.getLogger(__name__)
+
+# Natural sizes measured in a browser, keyed by image URL and kept across runs
+CACHE_FILE = Path(os.environ.get("SCRAPER_IMAGE_DIMENSIONS", Path.home() / ".cache" / "scraper_apis" / "image_dimensions.json"))
+MAX_ENTRIES = int(os.environ.get("SCRAPER_IMAGE_DIMENSIONS_MAX", 50000))
+SAVE_INTERVAL = float(os.environ.get("SCRAPER_IMAGE_DIMENSIONS_SAVE_INTERVAL", 60))
+
+# Natural sizes of every loaded <img> whose src is among arguments[0], in one round trip
+MEASURE_SCRIPT = """
+const wanted = new Set(arguments[0]);
+const found = {};
+for (const img of document.images) {
+    if (!img.complete || !img.naturalWidth) continue;
+    for (const src of [img.getAttribute('src'), img.getAttribute('data-src'), img.currentSrc, img.src]) {
+        if (src && wanted.has(src)) found[src] = [img.naturalWidth, img.naturalHeight];
+    }
+}
+return found;
+"""
+
+_cache = None
+_lock = threading.Lock()
+_dirty = False
+_last_save = time.monotonic()
+_stats = {"round_trips": 0, "measured": 0, "unresolved": 0}
+
+
+def _loaded():
+    """The URL -> "WxH" cache, read from CACHE_FILE on first use; call with _lock held."""
+    global _cache
+    if _cache is None:
+        try:
+            with open(CACHE_FILE, "r", encoding="utf-8") as f:
+                _cache = dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            _cache = {}
+        atexit.register(save)
+    return _cache
+
+
+def save():
+    """Write the measured sizes if any were added since the last save."""
+    global _dirty, _last_save
+    with _lock:
+        if not _dirty:
+            return
+        entries = dict(_cache)
+        _dirty = False
+        _last_save = time.monotonic()
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(temp_file, CACHE_FILE)
+    except OSError as e:
+        logger.warning(f"Failed to write image dimensions {CACHE_FILE}: {e}")
+
+
+def url_hint(src):
+    """Size from a "-500x500.jpg" style suffix in the image file name, or None."""
+    match = patterns.IMAGE_SIZE_SUFFIX.search(src or "")
+    return f"{match.group(1)}x{match.group(2)}" if match else None
+
+
+def known(src):
+    """Natural size of an image without a browser: a cached measurement or the URL size hint, else None."""
+    if not src:
+        return None
+    with _lock:
+        cached = _loaded().get(src)
+    return cached or url_hint(src)
+
+
+def remember(measured):
+    """Cache {src: "WxH"} sizes, dropping the oldest entries beyond MAX_ENTRIES."""
+    global _dirty
+    if not measured:
+        return
+    with _lock:
+        cache = _loaded()
+        for src, size in measured.items():
+            cache.pop(src, None)
+            cache[src] = size
+        for src in list(cache)[:max(0, len(cache) - MAX_ENTRIES)]:
+            del cache[src]
+        _dirty = True
+        due = time.monotonic() - _last_save >= SAVE_INTERVAL
+    if due:
+        save()
+
+
+def measure(driver, sources):
+    """Natural sizes of the loaded images among `sources`, read in one script call and cached.
+
+    Returns {src: "WxH"}; images that are not loaded yet (lazy, still downloading) are left out.
+    """
+    sources = sorted({src for src in sources if src})
+    if not sources:
+        return {}
+    _count("round_trips")
+    try:
+        found = driver.execute_script(MEASURE_SCRIPT, sources) or {}
+    except Exception as e:
+        logger.debug(f"Image size probe failed: {e}")
+        found = {}
+    measured = {src: f"{width}x{height}" for src, (width, height) in found.items() if width and height}
+    _count("measured", len(measured))
+    _count("unresolved", len(sources) - len(measured))
+    remember(measured)
+    return measured
+
+
+def measure_records(driver, records):
+    """Set "dimensions" of records whose primary image size is not known yet, measuring them in one call.
+
+    Returns how many records were measured.
+    """
+    unmeasured = [record for record in records if record["image_url"] and not known(record["image_url"])]
+    if not unmeasured:
+        return 0
+    measured = measure(driver, [record["image_url"] for record in unmeasured])
+    for record in unmeasured:
+        if record["image_url"] in measured:
+            record["dimensions"] = measured[record["image_url"]]
+    logger.info(f"Measured {len(measured)}/{len(unmeasured)} product images in one call")
+    return len(measured)
+
+
+def _count(name, amount=1):
+    with _lock:
+        _stats[name] += amount
+
+
+def stats():
+    """Browser probes made in this process and what they resolved, plus the cache size."""
+    with _lock:
+        summary = dict(_stats)
+        summary["cache_entries"] = len(_cache or {})
+    return summary
@@ -10,13 +10,12 @@ import subprocess
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, WebDriverException
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from datetime import datetime
 import sanitize_filename
+from readiness import wait_until_ready, wait_for_quiet
 
 app = Flask(__name__)
 CORS(app)
@@ -349,12 +348,7 @@ class IndiaMartScraper:
                     try:
                         self.rotate_user_agent()
                         self.browser.get(url)
-                        WebDriverWait(self.browser, 20).until(
-                            lambda d: d.execute_script("return document.readyState") == "complete"
-                        )
-                        WebDriverWait(self.browser, 10).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "div.card"))
-                        )
+                        wait_until_ready(self.browser, "indiamart", "search", timeout=20)
                         previous_product_count = 0
                         scroll_attempts = 0
                         while scroll_attempts < self.max_scroll_attempts:
@@ -367,7 +361,7 @@ class IndiaMartScraper:
                             self.browser.execute_script(
                                 "window.scrollTo(0, Math.min(document.body.scrollHeight, window.scrollY + 800));"
                             )
-                            time.sleep(random.uniform(1, 2))
+                            wait_for_quiet(self.browser)
                             scroll_attempts += 1
                         cards = self.browser.find_elements(By.CSS_SELECTOR, "div.card")
                         if not cards:
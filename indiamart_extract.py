@@ -0,0 +1,216 @@
+import logging
+import patterns
+import selector_plans
+import image_dimensions
+from extractors import as_soup, detail_record, run_steps
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://www.indiamart.com"
+
+# Search card selectors, declared in site_specs/indiamart.json
+PLAN = selector_plans.load("indiamart")
+
+COMMON_BRANDS = ("rolex", "omega", "tag heuer", "cartier", "patek philippe", "audemars piguet", "tissot", "seiko", "citizen")
+CURRENCY_SYMBOLS = ["₹", "$", "€", "¥", "£", "Rs"]
+PLACEHOLDER_IMAGES = ('placeholder.png', 'default.jpg', 'noimage.jpg')
+
+
+def new_record():
+    return {
+        "url": None,
+        "title": None,
+        "currency": None,
+        "exact_price": None,
+        "description": None,
+        "min_order": None,
+        "supplier": None,
+        "origin": None,
+        "feedback": {"rating": None, "review": None},
+        "image_url": None,
+        "images": [],
+        "videos": [],
+        "dimensions": None,
+        "website_name": "IndiaMart",
+        "discount_information": None,
+        "brand_name": None
+    }
+
+
+def clean_title(title, keyword=None):
+    """Clean up malformed titles by removing duplicates, redundant brands, and normalizing."""
+    if not title:
+        return None
+    title = patterns.HTML_TAG.sub('', title)
+    title = patterns.TITLE_SYMBOLS.sub('', title)
+    parts = patterns.TITLE_SEPARATORS.split(title)
+    parts = [part.strip() for part in parts if part.strip()]
+    seen = set()
+    cleaned_parts = []
+    for part in parts:
+        part_lower = part.lower()
+        if part_lower not in seen:
+            seen.add(part_lower)
+            cleaned_parts.append(part)
+    title = " ".join(cleaned_parts)
+    words = title.split()
+    brand_count = {brand: 0 for brand in COMMON_BRANDS}
+    cleaned_words = []
+    for word in words:
+        word_lower = word.lower()
+        skip = False
+        for brand in COMMON_BRANDS:
+            if brand in word_lower:
+                if brand_count[brand] > 0:
+                    skip = True
+                    break
+                brand_count[brand] += 1
+        if not skip and word_lower not in ["watch", "timepiece", "used"]:
+            cleaned_words.append(word)
+    cleaned_title = " ".join(cleaned_words).strip()
+    if keyword and keyword.lower() not in cleaned_title.lower():
+        cleaned_title += f" {keyword.capitalize()}"
+    if len(cleaned_title) > 100:
+        cleaned_title = cleaned_title[:97] + "..."
+    return cleaned_title
+
+
+def title(card, record, keyword):
+    raw_title = PLAN["title"].value(card)
+    if not raw_title:
+        logger.warning("No title found for card")
+        return False
+    record["title"] = clean_title(raw_title, keyword)
+    if keyword and keyword.lower() not in record["title"].lower():
+        logger.info(f"Skipping non-matching product: {record['title']}")
+        return False
+
+
+def url(card, record, keyword):
+    product_url = PLAN["title_link"].value(card)
+    if not product_url:
+        for _, links in PLAN["product_link"].matches(card):
+            href = links[0].get("href", None)
+            if href and ("indiamart.com" in href or href.startswith("/")):
+                product_url = href
+                break
+    if not product_url:
+        logger.warning(f"No URL found for {record['title']}")
+        return False
+    if product_url.startswith("/"):
+        product_url = f"{BASE_URL}{product_url}"
+    record["url"] = product_url.split("?")[0]
+
+
+def price(card, record, keyword):
+    price_el = PLAN["price"].first(card)
+    if not price_el:
+        logger.warning(f"No price element found for {record['title']}")
+        return
+    raw_price = price_el.get_text(strip=True)
+    if "Ask Price" in raw_price or "Call" in raw_price:
+        record["exact_price"] = "Ask Price"
+        return
+    currency = next((symbol for symbol in CURRENCY_SYMBOLS if symbol in raw_price), None)
+    if not currency and "rs" in raw_price.lower():
+        currency = "₹"
+    price_values = [patterns.NON_NUMERIC.sub('', p) for p in patterns.PRICE_NUMBER.findall(raw_price)]
+    if price_values:
+        record["currency"] = currency or "₹"
+        record["exact_price"] = price_values[0]
+
+
+def image_sources(card):
+    """(selector, [(index, img, src)]) of the first image selector with a usable source, placeholders skipped."""
+    for selector, img_elements in PLAN["image"].matches(card):
+        found = []
+        for index, img in enumerate(img_elements):
+            src = img.get("src", "")
+            if not src or src.endswith(PLACEHOLDER_IMAGES):
+                data_src = img.get("data-src", "")
+                if not data_src or data_src.endswith(PLACEHOLDER_IMAGES):
+                    continue
+                src = data_src
+            if not src.startswith('data:'):
+                found.append((index, img, src))
+        if found:
+            return selector, found
+    return None, []
+
+
+def images(card, record, keyword):
+    _, found = image_sources(card)
+    if not found:
+        logger.warning(f"No images found for {record['title']}")
+        return
+    index, first, src = found[0]
+    if index == 0:
+        record["image_url"] = src
+        # A measured or URL-declared natural size beats the layout size in the width/height attributes
+        record["dimensions"] = image_dimensions.known(src) or f"{first.get('width', 'Unknown')}x{first.get('height', 'Unknown')}"
+    record["images"] = [src for _, _, src in found]
+    logger.info(f"Found {len(record['images'])} images for {record['title']}")
+
+
+def description(card, record, keyword):
+    record["description"] = PLAN["description"].value(card)
+
+
+def min_order(card, record, keyword):
+    min_order_el = PLAN["min_order"].first(card)
+    if min_order_el:
+        text = min_order_el.get_text(strip=True)
+        qty_match = patterns.DIGITS.search(text)
+        unit_match = patterns.UNIT_WORD.search(text)
+        if qty_match and unit_match:
+            record["min_order"] = f"{qty_match.group(1)} {unit_match.group(1)}"
+
+
+def supplier(card, record, keyword):
+    record["supplier"] = PLAN["supplier"].value(card)
+
+
+def origin(card, record, keyword):
+    record["origin"] = PLAN["origin"].value(card)
+
+
+def feedback(card, record, keyword):
+    record["feedback"] = {"rating": PLAN["rating"].value(card), "review": PLAN["review"].value(card)}
+
+
+def videos(card, record, keyword):
+    record["videos"] = PLAN["video"].values(card)
+
+
+def discount(card, record, keyword):
+    record["discount_information"] = PLAN["discount"].value(card)
+
+
+def brand(card, record, keyword):
+    brand_name = patterns.first_word(COMMON_BRANDS, record["title"].lower())
+    record["brand_name"] = brand_name.capitalize() if brand_name else None
+
+
+CARD_STEPS = (
+    ("title", title), ("url", url), ("price", price), ("description", description), ("min_order", min_order),
+    ("supplier", supplier), ("origin", origin), ("feedback", feedback), ("images", images), ("videos", videos),
+    ("discount", discount), ("brand", brand),
+)
+
+
+def extract_card(card, keyword=None, timings=None):
+    """Listing record from one search result card, or None without a title or URL, or when the title does not match the keyword."""
+    record = new_record()
+    return record if run_steps(CARD_STEPS, card, record, keyword, timings) else None
+
+
+def extract_search(html, url, keyword=None, timings=None):
+    """Listing records of the result cards on a search page."""
+    cards = PLAN["card"].values(as_soup(html))
+    records = (extract_card(card, keyword, timings) for card in cards)
+    return [record for record in records if record]
+
+
+def extract_detail(html, url, record=None, keyword=None, timings=None):
+    """Search cards carry every field and product pages are not scraped, so this is the listing record under url."""
+    return detail_record(new_record, url, record)
@@ -0,0 +1,84 @@
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Walks every card in the page and reads each declared field; runs as a single execute_script call
+PLAN_SCRIPT = """
+    const plan = %s;
+    const read = (el, get) => {
+        if (!el) return null;
+        if (get === 'text') return (el.innerText || el.textContent || '').trim();
+        if (get === 'html') return el.outerHTML;
+        if (get.startsWith('attr:')) return el.getAttribute(get.slice(5));
+        if (get.startsWith('prop:')) {
+            const value = el[get.slice(5)];
+            return value === undefined || value === null ? null : String(value);
+        }
+        return null;
+    };
+    // Selectors are ordered fallbacks: the first one with any match wins
+    const selectAll = (root, selectors) => {
+        for (const selector of selectors) {
+            const found = root.querySelectorAll(selector);
+            if (found.length) return Array.from(found);
+        }
+        return [];
+    };
+    const selectOne = (root, selectors) => {
+        for (const selector of selectors) {
+            const found = root.querySelector(selector);
+            if (found) return found;
+        }
+        return null;
+    };
+    return selectAll(document, plan.card).map(card => {
+        const record = {};
+        for (const [name, field] of Object.entries(plan.fields)) {
+            if (field.all) {
+                const elements = field.selector ? selectAll(card, field.selector) : [card];
+                record[name] = elements.map(el => read(el, field.get)).filter(value => value);
+            } else {
+                record[name] = read(field.selector ? selectOne(card, field.selector) : card, field.get);
+            }
+        }
+        return record;
+    });
+"""
+
+GETTERS = ("text", "html")
+GETTER_PREFIXES = ("attr:", "prop:")
+
+
+def _fallbacks(selector):
+    """A selector or list of selectors as an ordered fallback list; None stays None."""
+    if selector is None:
+        return None
+    return [selector] if isinstance(selector, str) else list(selector)
+
+
+class ExtractionPlan:
+    """A site's card fields compiled into one in-page script.
+
+    `card` is the CSS selector of a result card. Each field maps a name to a dict with an
+    optional `selector` (relative to the card; omitted means the card itself), `get`
+    ("text", "html", "attr:<name>" or "prop:<name>", default "text") and `all` (collect
+    every match instead of the first). Any selector may also be a list of fallbacks, tried in
+    order until one matches.
+    """
+
+    def __init__(self, card, fields):
+        self.card = card
+        self.fields = {}
+        for name, field in fields.items():
+            get = field.get("get", "text")
+            if get not in GETTERS and not get.startswith(GETTER_PREFIXES):
+                raise ValueError(f"Unknown getter '{get}' for field '{name}'")
+            self.fields[name] = {"selector": _fallbacks(field.get("selector")), "get": get, "all": bool(field.get("all"))}
+        self.script = PLAN_SCRIPT % json.dumps({"card": _fallbacks(self.card), "fields": self.fields})
+
+    def run(self, driver):
+        """Extract every card in the current page as a list of dicts in one round trip."""
+        records = driver.execute_script(self.script) or []
+        logger.debug(f"Extracted {len(records)} cards matching {self.card}")
+        return records
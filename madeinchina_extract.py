@@ -0,0 +1,134 @@
+import json
+import logging
+import selector_plans
+from extractors import as_soup, detail_record, run_steps
+
+logger = logging.getLogger(__name__)
+
+# Search card and product page selectors, declared in site_specs/madeinchina.json
+PLAN = selector_plans.load("madeinchina")
+
+
+def new_record():
+    return {
+        "url": "",
+        "title": "",
+        "currency": "",
+        "exact_price": "",
+        "min_order": "",
+        "supplier": "",
+        "origin": "",
+        "feedback": {"rating": "", "star count": "0"},
+        "specifications": {},
+        "images": [],
+        "videos": [],
+        "website_name": "MadeinChina",
+        "discount_information": "N/A",
+        "brand_name": "N/A"
+    }
+
+
+def card_url(card, record, keyword):
+    product_url = PLAN["url"].value(card)
+    if product_url:
+        record["url"] = product_url
+
+
+def card_title(card, record, keyword):
+    title = PLAN["title"].value(card)
+    if title:
+        record["title"] = title
+
+
+def card_price(card, record, keyword):
+    price_text = PLAN["price"].value(card)
+    if price_text:
+        currency = ''.join(c for c in price_text if not c.isdigit() and c not in ['.', '-', ' ']).strip()
+        record["currency"] = currency
+        record["exact_price"] = price_text.replace(currency, '').strip()
+
+
+def card_min_order(card, record, keyword):
+    for info_elem in PLAN["info"].values(card):
+        if '(MOQ)' in info_elem.text:
+            record["min_order"] = info_elem.text.strip().replace('(MOQ)', '').strip()
+            break
+
+
+def card_supplier(card, record, keyword):
+    supplier = PLAN["supplier"].value(card)
+    if supplier:
+        record["supplier"] = supplier
+
+
+CARD_STEPS = (
+    ("url", card_url), ("title", card_title), ("price", card_price), ("min_order", card_min_order), ("supplier", card_supplier),
+)
+
+
+def extract_card(card, keyword=None, timings=None):
+    """Listing record from one search result card."""
+    record = new_record()
+    run_steps(CARD_STEPS, card, record, keyword, timings)
+    return record
+
+
+def extract_search(html, url, keyword=None, timings=None):
+    """Listing records of the result cards on a search page."""
+    return [extract_card(card, keyword, timings) for card in PLAN["card"].values(as_soup(html))]
+
+
+def spec_rows(soup):
+    """Label/value pairs of the basic information list."""
+    specifications = {}
+    for row in PLAN["spec_row"].values(soup):
+        label = PLAN["spec_label"].value(row)
+        value = PLAN["spec_value"].value(row)
+        if label and value:
+            specifications[label] = value
+    return specifications
+
+
+def origin(soup, record, keyword):
+    for label, value in record["specifications"].items():
+        if 'Origin' in label:
+            record["origin"] = value
+
+
+def rating(soup, record, keyword):
+    score = PLAN["review_score"].value(soup)
+    if score:
+        record["feedback"]["rating"] = score
+        record["feedback"]["star count"] = str(len(PLAN["review_star"].values(soup)))
+    else:
+        record["feedback"]["rating"] = "No rating available"
+        record["feedback"]["star count"] = "0"
+
+
+def specifications(soup, record, keyword):
+    record["specifications"] = spec_rows(soup)
+
+
+def media(soup, record, keyword):
+    wrapper = PLAN["gallery"].first(soup)
+    if wrapper is None:
+        return
+    for slide in PLAN["gallery_slide"].values(wrapper):
+        for script in PLAN["slide_video"].values(slide):
+            try:
+                video_data = json.loads(script)
+            except ValueError:
+                continue
+            if video_data.get("videoUrl"):
+                record["videos"].append(video_data["videoUrl"])
+        record["images"].extend(PLAN["slide_image"].values(slide))
+
+
+DETAIL_STEPS = (("specifications", specifications), ("origin", origin), ("rating", rating), ("media", media))
+
+
+def extract_detail(html, url, record=None, keyword=None, timings=None):
+    """Listing record completed from a product page: specifications, origin, rating, images and videos."""
+    record = detail_record(new_record, url, record)
+    run_steps(DETAIL_STEPS, as_soup(html), record, keyword, timings)
+    return record
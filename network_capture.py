@@ -0,0 +1,142 @@
+import os
+import re
+import json
+import base64
+import logging
+from urllib.parse import urljoin
+from network_events import peek
+
+logger = logging.getLogger(__name__)
+
+# Set SCRAPER_NETWORK_CAPTURE=1 to read search results from the site's own JSON responses
+ENABLED = os.environ.get("SCRAPER_NETWORK_CAPTURE", "0") == "1"
+
+# Per site: which responses carry search results, and the dotted paths of each schema field
+# inside a result object. A JSON object becomes a product when both url and title resolve.
+SITES = {
+    "flipkart": {
+        "response_url": r"flipkart\.com/api/\d+/page/fetch",
+        "base_url": "https://www.flipkart.com",
+        "product_url": r"/p/",
+        "fields": {
+            "url": ["baseUrl", "productUrl", "smartUrl"],
+            "title": ["titles.title", "title"],
+            "price": ["pricing.finalPrice.value", "pricing.finalPrice.decimalValue", "price"],
+            "currency": ["pricing.finalPrice.currency"],
+            "image": ["media.images.0.url", "imageUrl"],
+            "rating": ["rating.average"],
+            "review": ["rating.reviewCount", "rating.count"],
+        },
+    },
+    "alibaba": {
+        "response_url": r"alibaba\.com/.*(search|offer).*(json|ajax|api)|mtop\..*search",
+        "base_url": "https://www.alibaba.com",
+        "product_url": r"product-detail",
+        "fields": {
+            "url": ["productUrl", "detailUrl", "productDetailUrl", "url"],
+            "title": ["title", "subject", "productTitle"],
+            "price": ["price", "priceV2.formatPrice", "promotionPrice", "minPrice"],
+            "image": ["mainImage", "imageUrl", "image"],
+            "min_order": ["moq", "minOrder", "moqV2"],
+            "supplier": ["companyName", "supplierName", "company.name"],
+        },
+    },
+    "dhgate": {
+        "response_url": r"dhgate\.com/.*(search|wholesale).*(json|api|ajax)",
+        "base_url": "https://www.dhgate.com",
+        "product_url": r"/product/",
+        "fields": {
+            "url": ["productUrl", "itemUrl", "detailUrl", "url"],
+            "title": ["title", "productName", "itemName", "name"],
+            "price": ["price", "priceRange", "minPrice", "showPrice"],
+            "image": ["imageUrl", "imgUrl", "image"],
+            "supplier": ["sellerName", "storeName", "supplierName"],
+        },
+    },
+}
+
+
+def _resolve(obj, path):
+    """Follow a dotted path through nested dicts and lists; None when any step is missing."""
+    for step in path.split("."):
+        if isinstance(obj, list) and step.isdigit() and int(step) < len(obj):
+            obj = obj[int(step)]
+        elif isinstance(obj, dict) and step in obj:
+            obj = obj[step]
+        else:
+            return None
+    return obj
+
+
+def _first(obj, paths):
+    for path in paths:
+        value = _resolve(obj, path)
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def _walk(obj):
+    """Yield every dict nested anywhere in a JSON document, in document order."""
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            yield current
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+
+
+def map_products(site, documents):
+    """Map captured JSON documents to product records with the site's field paths, in page order."""
+    config = SITES[site]
+    fields = config["fields"]
+    product_url = re.compile(config["product_url"])
+    products = {}
+    for document in documents:
+        for candidate in _walk(document):
+            url, title = _first(candidate, fields["url"]), _first(candidate, fields["title"])
+            if not isinstance(url, str) or not isinstance(title, str):
+                continue
+            url = urljoin(config["base_url"], url.strip())
+            if not product_url.search(url) or url in products:
+                continue
+            record = {"url": url, "title": title.strip()}
+            for name, paths in fields.items():
+                if name not in record:
+                    value = _first(candidate, paths)
+                    record[name] = value if value is None or isinstance(value, (str, int, float)) else None
+            products[url] = record
+    return list(products.values())
+
+
+def capture_products(driver, site):
+    """Product records from the site's JSON responses seen so far in the current tab.
+
+    Returns an empty list when capture is disabled or nothing matched, so the caller falls
+    back to DOM parsing.
+    """
+    if not ENABLED:
+        return []
+    response_url = re.compile(SITES[site]["response_url"])
+    current = driver.current_window_handle
+    documents = []
+    for event in peek(driver):
+        if event.get("method") != "Network.responseReceived" or event.get("webview") not in (None, current):
+            continue
+        response = event["params"].get("response", {})
+        if "json" not in response.get("mimeType", "") or not response_url.search(response.get("url", "")):
+            continue
+        try:
+            body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": event["params"]["requestId"]})
+            text = base64.b64decode(body["body"]).decode("utf-8", "replace") if body.get("base64Encoded") else body["body"]
+            documents.append(json.loads(text))
+        except Exception as e:
+            logger.debug(f"Could not read captured response {response.get('url')}: {e}")
+    products = map_products(site, documents)
+    if products:
+        logger.info(f"Captured {len(products)} {site} products from {len(documents)} JSON responses")
+    else:
+        logger.info(f"No {site} products captured from network responses, falling back to DOM parsing")
+    return products
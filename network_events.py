@@ -0,0 +1,51 @@
+import json
+import logging
+import threading
+import weakref
+
+logger = logging.getLogger(__name__)
+
+# Events read from chromedriver but not yet consumed, per driver; reading the log clears it
+_pending = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def enable_performance_log(options):
+    """Ask chromedriver to record DevTools Network events for every tab of the session."""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def _poll(driver):
+    """Move newly logged events into the driver's pending buffer."""
+    try:
+        entries = driver.get_log("performance")
+    except Exception as e:
+        logger.debug(f"Performance log unavailable: {e}")
+        entries = []
+    events = []
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])
+            event = message["message"]
+            event["webview"] = message.get("webview")
+            events.append(event)
+        except (KeyError, ValueError):
+            continue
+    with _lock:
+        pending = _pending.setdefault(driver, [])
+        pending.extend(events)
+        return pending
+
+
+def peek(driver):
+    """Buffered DevTools events as {"method", "params", "webview"} dicts, left in place for drain."""
+    pending = _poll(driver)
+    with _lock:
+        return list(pending)
+
+
+def drain(driver):
+    """Buffered DevTools events as {"method", "params", "webview"} dicts, clearing the buffer."""
+    _poll(driver)
+    with _lock:
+        return _pending.pop(driver, [])
@@ -0,0 +1,164 @@
+import os
+import time
+import atexit
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import extractors
+import selector_plans
+from html_parser import parse
+
+logger = logging.getLogger(__name__)
+
+# Extraction is CPU bound, so it runs in worker processes; one core is left to the browsers.
+# SCRAPER_PARSE_WORKERS=0 extracts inline in the fetching thread.
+WORKERS = int(os.environ.get("SCRAPER_PARSE_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+# Pages a scrape may have waiting for or in extraction before its fetchers are held back
+QUEUE_SIZE = int(os.environ.get("SCRAPER_PARSE_QUEUE", max(4, WORKERS * 4)))
+
+_executor = None
+_executor_lock = threading.Lock()
+_totals = {"pages": 0, "failed": 0, "inline": 0, "blocked_seconds": 0.0, "extract_seconds": 0.0}
+_totals_lock = threading.Lock()
+
+
+def _init_worker():
+    # Workers start from the saved stats but never write them; their probe counts travel back
+    # with each result and the scraper process, which owns the file, merges them
+    selector_plans.PERSIST = False
+    selector_plans.TRACK_DELTAS = True
+
+
+def extract(site, kind, markup, url, record=None, keyword=None, required=()):
+    """Parse one page and run the site's search or detail extractors over it; returns (result, seconds, selector deltas).
+
+    Runs in a worker process. Raises ValueError when a `required` CSS selector is missing,
+    e.g. when a plain GET was answered with a block page instead of the product.
+    """
+    started = time.perf_counter()
+    soup = parse(markup)
+    missing = [selector for selector in required if soup.select_one(selector) is None]
+    if missing:
+        raise ValueError(f"{url} lacks {', '.join(missing)}")
+    if kind == "search":
+        result = extractors.extract_search(site, soup, url, keyword)
+    else:
+        result = extractors.extract_detail(site, soup, url, record, keyword)
+    return result, time.perf_counter() - started, selector_plans.take_deltas()
+
+
+def get_executor():
+    """Return the process-wide extraction pool, creating it on first use; None when extraction runs inline."""
+    global _executor
+    if WORKERS < 1:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            # Spawned rather than forked: the scraper process runs browser and server threads
+            _executor = ProcessPoolExecutor(
+                max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker
+            )
+            atexit.register(shutdown)
+            logger.info(f"Started {WORKERS} extraction worker processes")
+        return _executor
+
+
+def shutdown():
+    """Stop the extraction workers; the next pipeline starts a fresh pool."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _count(**amounts):
+    with _totals_lock:
+        for name, amount in amounts.items():
+            _totals[name] += amount
+
+
+def totals():
+    """Extraction counters across every pipeline in this process."""
+    with _totals_lock:
+        stats = dict(_totals)
+    stats["workers"] = WORKERS
+    stats["queue_size"] = QUEUE_SIZE
+    return stats
+
+
+class ParsePipeline:
+    """Hands page HTML from fetchers to the extraction workers and delivers the records.
+
+    Fetchers (browser tabs, HTTP threads) call submit() with the raw HTML of a page and go
+    back to fetching while a worker process parses it. At most queue_size pages of one
+    pipeline are waiting for or in extraction; submit() blocks beyond that, so fetchers are
+    held back when parsing falls behind instead of piling up page HTML in memory.
+
+    Results come back through the on_result/on_error callbacks, which run on a pool thread
+    of this process; join() waits until every submitted page has been delivered.
+    """
+
+    def __init__(self, site, keyword=None, queue_size=QUEUE_SIZE):
+        extractors.site(site)
+        self.site = site
+        self.keyword = keyword
+        self.slots = threading.BoundedSemaphore(max(1, queue_size))
+        self.pending = 0
+        self.idle = threading.Condition()
+
+    def submit(self, kind, markup, url, record=None, on_result=None, on_error=None, required=()):
+        """Queue a "search" or "detail" page for extraction, waiting for a free slot when the queue is full.
+
+        on_result receives the extractor's return value: a list of records for search pages, the
+        completed record (or None when rejected) for detail pages. on_error receives the exception
+        when the page could not be extracted.
+        """
+        started = time.perf_counter()
+        self.slots.acquire()
+        blocked = time.perf_counter() - started
+        with self.idle:
+            self.pending += 1
+        _count(pages=1, blocked_seconds=blocked)
+        args = (self.site, kind, markup, url, record, self.keyword, tuple(required))
+        executor = get_executor()
+        if executor is not None:
+            try:
+                future = executor.submit(extract, *args)
+            except (BrokenProcessPool, RuntimeError) as e:
+                logger.warning(f"Extraction pool unavailable, extracting {url} inline: {e}")
+                shutdown()
+            else:
+                future.add_done_callback(lambda done: self._deliver(url, done.result, on_result, on_error))
+                return
+        _count(inline=1)
+        self._deliver(url, lambda: extract(*args), on_result, on_error)
+
+    def _deliver(self, url, outcome, on_result, on_error):
+        try:
+            try:
+                result, seconds, deltas = outcome()
+            except Exception as e:
+                _count(failed=1)
+                logger.info(f"Extraction failed for {url}: {e}")
+                if on_error:
+                    on_error(e)
+                return
+            _count(extract_seconds=seconds)
+            selector_plans.merge_deltas(deltas)
+            if on_result:
+                on_result(result)
+        except Exception as e:
+            logger.error(f"Error handling extracted page {url}: {e}")
+        finally:
+            self.slots.release()
+            with self.idle:
+                self.pending -= 1
+                self.idle.notify_all()
+
+    def join(self):
+        """Wait until every submitted page has been extracted and its callback has run."""
+        with self.idle:
+            self.idle.wait_for(lambda: self.pending == 0)
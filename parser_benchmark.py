@@ -0,0 +1,116 @@
+"""Compare HTML parser engines on saved pages: parse time and extracted output.
+
+Usage: python parser_benchmark.py [--repeat N] site=page.html [site=page.html ...]
+
+Each page is parsed with every installed engine and the site's probe selectors (the ones
+its extractors read) are evaluated. The run fails if any engine extracts different text
+or links from the reference engine, html.parser.
+"""
+import sys
+import time
+import argparse
+from html_parser import ENGINES, available, parse
+
+REFERENCE = "html.parser"
+
+# Selectors the site extractors read; output must match across engines
+PROBES = {
+    "amazon": [
+        "#productTitle", "#bylineInfo", "span.a-price-whole", "span.a-price-fraction", "span.a-price-symbol",
+        "span.savingsPercentage", "#landingImage, img#imgTagWrapperId", "#altImages .a-button-thumbnail img",
+        "div#productDescription, ul.a-unordered-list.a-vertical.a-spacing-mini li", "ul.detail-bullet-list > li",
+        "table#productDetails_detailBullets_sections1 tr", "div.s-result-item.s-asin:not(.AdHolder)",
+    ],
+    "ebay": [
+        "h1.x-item-title__mainTitle", "div.x-price-primary", "div.ux-image-carousel-item img",
+        "div#viTabs_0_is dl[data-testid='ux-labels-values']", "div.ux-layout-section-evo",
+        "div.x-sellercard-atf_info_about-seller", "ul.srp-results li.s-item",
+    ],
+    "flipkart": ["span.VU-ZEz", "div.Nx9bqj", "tr.WJdYP6", "td.col-9-12 li", "div.slAVV4"],
+    "madeinchina": [
+        ".prod-list div.prod-info", ".product-name a[href]", ".product-property .price-info .price",
+        "div.sr-proMainInfo-slide-container img[src]", "script[type='text/data-video']", "div.bsc-item.cf",
+        ".basic-info-list",
+    ],
+    "alibaba": [
+        "h1", ".attribute-item", "tr, li, div.do-entry-item", "video", "img[src]",
+        ".price, .price-item, .promotion-price",
+    ],
+    "dhgate": [
+        "h1", "ul.masterMap_smallMapList__JTkBX li img", "div.masterMap_bigMapWarp__2Jzw2 img",
+        "ul.prodSpecifications_showUl__fmY8y li", "div.prodSpecifications_deswrap___Z092 p",
+        "span.productPrice_discount__dMPyI", ".gallery-main",
+    ],
+    "indiamart": ["div.card", "div.producttitle, div.listing-title, div.prdname", "div.card a[href]", "div.card img"],
+}
+
+LINK_ATTRS = ("href", "src", "data-src", "data-old-hires")
+
+
+def extract(soup, selectors):
+    """Normalised text and link attributes of every probe match, per selector."""
+    output = {}
+    for selector in selectors:
+        matches = []
+        for element in soup.select(selector):
+            text = " ".join(element.get_text(" ").split())
+            links = tuple(element.get(attr) for attr in LINK_ATTRS if element.get(attr))
+            matches.append((text, links))
+        output[selector] = matches
+    return output
+
+
+def measure(markup, engine, selectors, repeat):
+    """Best-of-N seconds to parse and probe a page, and the extracted output."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = extract(parse(markup, engine), selectors)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, output
+
+
+def run(pages, repeat=3):
+    """Benchmark every (site, path) page; returns False when any engine's output differs."""
+    engines = [engine for engine in ENGINES if available(engine)]
+    if REFERENCE not in engines:
+        engines.append(REFERENCE)
+    identical = True
+    print(f"{'site':<12} {'page':<32} {'KB':>7} " + " ".join(f"{engine:>12}" for engine in engines) + "  output")
+    for site, path in pages:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            markup = f.read()
+        selectors = PROBES[site]
+        timings, outputs = {}, {}
+        for engine in engines:
+            timings[engine], outputs[engine] = measure(markup, engine, selectors, repeat)
+        mismatched = [engine for engine in engines if outputs[engine] != outputs[REFERENCE]]
+        identical = identical and not mismatched
+        verdict = "equal" if not mismatched else "DIFFERS: " + ", ".join(mismatched)
+        cells = " ".join(f"{timings[engine] * 1000:>10.1f}ms" for engine in engines)
+        print(f"{site:<12} {path[-32:]:<32} {len(markup) / 1024:>7.0f} {cells}  {verdict}")
+        for engine in mismatched:
+            for selector in selectors:
+                if outputs[engine][selector] != outputs[REFERENCE][selector]:
+                    print(f"    {engine} differs on {selector!r}: "
+                          f"{len(outputs[engine][selector])} vs {len(outputs[REFERENCE][selector])} matches")
+    return identical
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare HTML parser engines on saved pages")
+    parser.add_argument("pages", nargs="+", help="site=path, site one of: " + ", ".join(PROBES))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    pages = []
+    for item in args.pages:
+        site, _, path = item.partition("=")
+        if site not in PROBES or not path:
+            parser.error(f"Expected site=path with a known site, got '{item}'")
+        pages.append((site, path))
+    return 0 if run(pages, args.repeat) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Micro-benchmark of per-product text extraction: inline regexes versus the patterns module.
+
+Usage: python pattern_benchmark.py [--products N]
+
+The "inline" kernels reproduce how the scrapers built and applied patterns before they moved
+to patterns.py; both variants run over the same synthetic product fields and must agree.
+"""
+import re
+import sys
+import time
+import argparse
+import patterns
+
+FIELDS = [
+    "  Stainless\u2009Steel   Case\u200b with [U+2122] sapphire\n\n crystal ",
+    "Water resistant to 100 m \u2028 (330 ft)",
+    "Visit the Casio Store",
+    "Country of Origin: China.",
+    "\u200e\u200fBand Width: 22 mm\t",
+] * 6
+SPEC_VALUES = ["42 mm", "22 x 10 x 5 cm", "18-22 mm", "Stainless steel", "40 UK", "1.5 in", "Black", "120 g"] * 2
+DESCRIPTION = "Case 42mm, band length 20 x 2 x 0.3 cm, weight 120 g, fits 18 - 22 mm lugs. " * 4
+TITLES = ["Mens Seiko Automatic Diver Watch", "Luxury Cartier Style Quartz", "Generic Sports Watch 2024"]
+BRANDS = ["rolex", "omega", "tag heuer", "cartier", "patek philippe", "audemars piguet", "tissot", "seiko", "citizen"]
+PRICES = ["US $1,299.99", "Rs. 2,450 - 3,100", "$45.00 - $60.00"]
+
+
+def inline_product():
+    """One product's text work as the scrapers used to write it."""
+    out = []
+    for text in FIELDS:
+        cleaned = re.sub(r'[\u2000-\u200F\u2028-\u202F]+', '', text)
+        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = re.sub(r'\[U\+[0-9A-Fa-f]+\]', '', cleaned)
+        out.append(cleaned.strip())
+    spec_regex = r'\b\d+(\.\d+)?\s*(?:x|X)\s*\d+(\.\d+)?\s*(?:x|X)\s*\d+(\.\d+)?\s*(cm|in|inches|centimeters|mm|kg|g)\b|' + \
+                 r'\b\d+\s*-\s*\d+\s*(millimeters|mm|cm|in|inches|centimeters|kg|g)\b|' + \
+                 r'\b\d+(\.\d+)?\s*(cm|in|inches|centimeters|mm|kg|g)\b|' + \
+                 r'\b\d+\s*(UK|US|EU|CM)\b'
+    out.append([bool(re.match(spec_regex, value, re.IGNORECASE)) for value in SPEC_VALUES])
+    out.append(re.findall(spec_regex, DESCRIPTION, re.IGNORECASE))
+    for value in SPEC_VALUES:
+        dim_regex = r'\b(?:About\s*)?\d+(\.\d+)?\s*(cm|in|inches|centimeters|mm)\b|' + \
+                    r'\b\d+(\.\d+)?\s*x\s*\d+(\.\d+)?\s*(inch|in)\b'
+        out.append([m.group(0) for m in re.finditer(dim_regex, value, re.IGNORECASE)])
+    for title in TITLES:
+        out.append(next((brand for brand in BRANDS if re.search(r'\b' + brand + r'\b', title.lower())), None))
+    for price in PRICES:
+        out.append([re.sub(r'[^\d.]', '', p) for p in re.findall(r'[\d,]+(?:\.\d+)?', price)])
+    return out
+
+
+def registry_product():
+    """The same work through the precompiled registry and translate-based kernels."""
+    out = [patterns.clean_text(text) for text in FIELDS]
+    out.append([bool(patterns.DHGATE_SPEC_VALUE.match(value)) for value in SPEC_VALUES])
+    out.append(patterns.DHGATE_SPEC_VALUE.findall(DESCRIPTION))
+    for value in SPEC_VALUES:
+        out.append([m.group(0) for m in patterns.EBAY_DIMENSION.finditer(value)])
+    for title in TITLES:
+        out.append(patterns.first_word(BRANDS, title.lower()))
+    for price in PRICES:
+        out.append([patterns.NON_NUMERIC.sub('', p) for p in patterns.PRICE_NUMBER.findall(price)])
+    return out
+
+
+def best_of(func, products, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(products):
+            func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-product regex/text cost, inline versus patterns.py")
+    parser.add_argument("--products", type=int, default=2000)
+    args = parser.parse_args(argv)
+    if inline_product() != registry_product():
+        print("Outputs differ between inline and registry kernels")
+        return 1
+    before = best_of(inline_product, args.products)
+    after = best_of(registry_product, args.products)
+    print(f"inline:   {before / args.products * 1e6:8.1f} us/product")
+    print(f"registry: {after / args.products * 1e6:8.1f} us/product")
+    print(f"speedup:  {before / after:8.2f}x (outputs equal)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import re
+from functools import lru_cache
+
+# Patterns used on every product, compiled once at import instead of per call or per loop
+
+# Generic numbers and prices
+DIGITS = re.compile(r"(\d+)")
+DECIMAL = re.compile(r"([\d.]+)")
+PARENTHESIZED_COUNT = re.compile(r"\((\d+)\)")
+NON_NUMERIC = re.compile(r"[^\d.]")
+PRICE_NUMBER = re.compile(r"[\d,]+(?:\.\d+)?")
+UNIT_WORD = re.compile(r"([A-Za-z]+)")
+DISCOUNT_PERCENT = re.compile(r"\d+%\s*(off)?", re.IGNORECASE)
+PERCENT_OFF = re.compile(r"\d+%\s*off", re.IGNORECASE)
+RATING_DECIMAL = re.compile(r"^\d+\.\d+$")
+
+# Titles
+HTML_TAG = re.compile(r"<[^>]+>")
+TITLE_SYMBOLS = re.compile(r"[^\w\s,()&-]")
+TITLE_SEPARATORS = re.compile(r"[,|/]")
+UNICODE_ESCAPE = re.compile(r"\[U\+[0-9A-Fa-f]+\]")
+
+# Amazon
+AMAZON_COLOR_IMAGES = re.compile("colorImages")
+AMAZON_LARGE_IMAGE = re.compile(r'"large":"(https://[^"]+)"')
+AMAZON_THUMBNAIL_SIZE = re.compile(r"\._(AC_SR\d+,\d+|SX\d+_SY\d+)_")
+AMAZON_BYLINE_BRAND = re.compile(r"(?:Visit|Brand:|by|from)\s+the\s+(.+?)\s+(?:Store|Brand|$)", re.IGNORECASE)
+COUNTRY_OF_ORIGIN = re.compile(r"Country of Origin:?\s*([^:]+?)(?:\.|\s|$)", re.IGNORECASE)
+
+# eBay
+EBAY_CURRENCY = re.compile(r"([A-Z]{2,})\s?\$")
+EBAY_PRICE = re.compile(r"[\d,.]+")
+EBAY_REVIEW_COUNT = re.compile(r"\(?(\d[\d,]*)\)?")
+EBAY_IMAGE_SIZE = re.compile(r"s-l(\d+)")
+EBAY_SELLER_CARD = re.compile(r"x-sellercard-atf_info_about-seller")
+EBAY_STORE_LINK = re.compile(r"https://www.ebay.com/str/")
+EBAY_DIMENSION = re.compile(
+    r"\b(?:About\s*)?\d+(\.\d+)?\s*(cm|in|inches|centimeters|mm)\b|"
+    r"\b\d+(\.\d+)?\s*x\s*\d+(\.\d+)?\s*(inch|in)\b",
+    re.IGNORECASE
+)
+
+# Flipkart
+FLIPKART_PRICE = re.compile(r"([^0-9]+)([0-9,]+)")
+FLIPKART_IMAGE_SIZE = re.compile(r"/image/\d+/\d+/")
+FLIPKART_INITIAL_STATE = re.compile("__INITIAL_STATE__")
+FLIPKART_MULTIMEDIA = re.compile(r'"multimediaComponents"\s*:\s*\[(.*?)\]', re.DOTALL)
+FLIPKART_STATE_IMAGE = re.compile(r'"url"\s*:\s*"(https?://[^"]+/image/\{@width\}/\{@height\}/[^"?]+)')
+
+# DHgate
+DHGATE_SPEC_VALUE = re.compile(
+    r"\b\d+(\.\d+)?\s*(?:x|X)\s*\d+(\.\d+)?\s*(?:x|X)\s*\d+(\.\d+)?\s*(cm|in|inches|centimeters|mm|kg|g)\b|"
+    r"\b\d+\s*-\s*\d+\s*(millimeters|mm|cm|in|inches|centimeters|kg|g)\b|"
+    r"\b\d+(\.\d+)?\s*(cm|in|inches|centimeters|mm|kg|g)\b|"
+    r"\b\d+\s*(UK|US|EU|CM)\b",
+    re.IGNORECASE
+)
+DHGATE_DIMENSION = re.compile(
+    r"\b\d+(\.\d+)?\s*(?:x|X)\s*\d+(\.\d+)?\s*(?:x|X)\s*\d+(\.\d+)?\s*(cm|in|inches|centimeters|mm)\b|"
+    r"\b\d+\s*-\s*\d+\s*(millimeters|mm|cm|in|inches|centimeters)\b|"
+    r"\b\d+(\.\d+)?\s*(cm|in|inches|centimeters|mm)\b",
+    re.IGNORECASE
+)
+DHGATE_PRICE_RANGE = re.compile(r"Rs\.([\d,]+(?:\.\d+)?)\s*-\s*([\d,]+(?:\.\d+)?)")
+BRAND_PREFIX = re.compile(r"^Brand:\s*", re.IGNORECASE)
+
+# IndiaMart CDN renditions carry their pixel size in the file name, e.g. watch-500x500.jpg
+IMAGE_SIZE_SUFFIX = re.compile(r"[-_](\d{2,4})x(\d{2,4})\.(?:jpe?g|png|webp|gif)(?:$|\?)", re.IGNORECASE)
+
+# Typographic spaces, zero-width characters and bidi/line separators (U+2000-U+200F, U+2028-U+202F)
+INVISIBLE = dict.fromkeys([*range(0x2000, 0x2010), *range(0x2028, 0x2030)])
+
+
+def normalize_space(text):
+    """Collapse runs of whitespace to single spaces and trim."""
+    return " ".join(text.split()) if text else ""
+
+
+def clean_text(text):
+    """Drop invisible Unicode characters and [U+XXXX] escapes, collapse whitespace and trim."""
+    if not text:
+        return ""
+    cleaned = " ".join(text.translate(INVISIBLE).split())
+    if "[U+" in cleaned:
+        cleaned = UNICODE_ESCAPE.sub("", cleaned).strip()
+    return cleaned
+
+
+@lru_cache(maxsize=None)
+def word_pattern(words):
+    """One compiled whole-word alternation for a tuple of lowercase words or phrases."""
+    return re.compile(r"\b(?:" + "|".join(re.escape(word) for word in words) + r")\b")
+
+
+def first_word(words, text):
+    """The first of `words`, in list order, that occurs as a whole word in text."""
+    found = set(word_pattern(tuple(words)).findall(text))
+    return next((word for word in words if word in found), None)
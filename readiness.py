@@ -0,0 +1,96 @@
+import logging
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.1
+
+# What "ready" means for each page type: at least min_count matches of selector, and no DOM
+# mutations or new resource loads for quiet_ms. Pages load with the eager strategy, so none of
+# these wait for images or third-party scripts to finish.
+CONDITIONS = {
+    "amazon": {
+        "search": {"selector": "div.s-main-slot div.s-result-item.s-asin", "min_count": 1, "quiet_ms": 300},
+        "detail": {"selector": "#productTitle", "min_count": 1, "quiet_ms": 300},
+    },
+    "ebay": {
+        "search": {"selector": "ul.srp-results li.s-item", "min_count": 2, "quiet_ms": 300},
+        "detail": {"selector": "div.ux-layout-section-evo", "min_count": 1, "quiet_ms": 200},
+    },
+    "flipkart": {
+        "search": {"selector": "div.slAVV4", "min_count": 1, "quiet_ms": 400},
+        "detail": {"selector": "span.VU-ZEz", "min_count": 1, "quiet_ms": 400},
+    },
+    "madeinchina": {
+        "search": {"selector": ".prod-list div.prod-info", "min_count": 1, "quiet_ms": 200},
+        "detail": {"selector": ".basic-info-list, .sr-proMainInfo-slide-container", "min_count": 1, "quiet_ms": 300},
+    },
+    "dhgate": {
+        "search": {"selector": ".gallery-main", "min_count": 1, "quiet_ms": 400},
+        "detail": {"selector": ".product-info, .product-description-detail, .masterMap", "min_count": 1, "quiet_ms": 400},
+    },
+    "indiamart": {
+        "search": {"selector": "div.card", "min_count": 1, "quiet_ms": 300},
+    },
+    "alibaba": {
+        "search": {"selector": "body", "min_count": 1, "quiet_ms": 500},
+        "detail": {"selector": "body", "min_count": 1, "quiet_ms": 500},
+    },
+}
+
+# True once the document is parsed, the selector matches often enough and the page has gone quiet.
+# A MutationObserver and the resource timing buffer track the last time anything changed.
+READY_SCRIPT = """
+    const [selector, minCount, quietMs] = arguments;
+    const root = document.documentElement;
+    if (!root || document.readyState === 'loading' || root.hasAttribute('data-scraper-stale')) return false;
+    const now = performance.now();
+    let state = window.__scraperQuiet;
+    if (!state) {
+        state = window.__scraperQuiet = { last: now, resources: 0 };
+        new MutationObserver(() => { state.last = performance.now(); })
+            .observe(root, { childList: true, subtree: true });
+    }
+    const resources = performance.getEntriesByType('resource').length;
+    if (resources !== state.resources) {
+        state.resources = resources;
+        state.last = now;
+    }
+    if (selector && document.querySelectorAll(selector).length < minCount) return false;
+    return now - state.last >= quietMs;
+"""
+
+
+# Restarts the quiet window so changes triggered by the last action are waited for
+MARK_SCRIPT = "if (window.__scraperQuiet) window.__scraperQuiet.last = performance.now();"
+
+
+def condition(site, page_type):
+    """Readiness condition declared for a site's page type."""
+    return CONDITIONS[site][page_type]
+
+
+def is_ready(driver, cond):
+    """Evaluate a readiness condition once in the current tab."""
+    return bool(driver.execute_script(READY_SCRIPT, cond.get("selector"), cond.get("min_count", 1), cond.get("quiet_ms", 0)))
+
+
+def wait_for(driver, cond, timeout=15):
+    """Block until a readiness condition holds; raises TimeoutException like WebDriverWait."""
+    WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(lambda d: is_ready(d, cond))
+
+
+def wait_until_ready(driver, site, page_type, timeout=15):
+    """Block until a site's search or detail page is ready to harvest."""
+    wait_for(driver, condition(site, page_type), timeout)
+
+
+def wait_for_quiet(driver, quiet_ms=300, timeout=5):
+    """Wait for the DOM and network to settle, e.g. after a scroll; gives up quietly on timeout."""
+    try:
+        driver.execute_script(MARK_SCRIPT)
+        wait_for(driver, {"quiet_ms": quiet_ms}, timeout)
+        return True
+    except Exception as e:
+        logger.debug(f"Page did not settle within {timeout}s: {e}")
+        return False
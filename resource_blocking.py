@@ -0,0 +1,140 @@
+import os
+import json
+import logging
+import threading
+from network_events import drain
+
+logger = logging.getLogger(__name__)
+
+# Set SCRAPER_RESOURCE_BLOCKING=0 to let pages load every asset
+ENABLED = os.environ.get("SCRAPER_RESOURCE_BLOCKING", "1") != "0"
+
+
+def _extension_patterns(*extensions):
+    """URL wildcards matching a file extension at the end of the path, with or without a query string.
+
+    Anchoring keeps API and XHR endpoints such as /api/icons.json?x from matching "*.ico*".
+    """
+    return [pattern for extension in extensions for pattern in (f"*.{extension}", f"*.{extension}?*")]
+
+
+# Network.setBlockedURLs matches URL wildcards, so resource types are expressed as URL patterns
+RESOURCE_TYPE_PATTERNS = {
+    "image": _extension_patterns("jpg", "jpeg", "png", "gif", "webp", "avif", "svg", "ico"),
+    "font": _extension_patterns("woff", "woff2", "ttf", "otf", "eot"),
+    "media": _extension_patterns("mp4", "webm", "m3u8", "mp3", "ogg", "mov"),
+    "tracker": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*googlesyndication.com*", "*facebook.net*", "*connect.facebook.com*",
+        "*hotjar.com*", "*scorecardresearch.com*", "*criteo.com*", "*clarity.ms*"
+    ],
+}
+
+# IndiaMart and Alibaba measure naturalWidth/naturalHeight of card images, so they keep images
+PROFILES = {
+    "amazon": {"resource_types": ["image", "font", "media", "tracker"], "url_patterns": ["*amazon-adsystem.com*", "*fls-na.amazon.com*"]},
+    "ebay": {"resource_types": ["image", "font", "media", "tracker"], "url_patterns": ["*ebay.com/nap/*", "*ebayadservices.com*"]},
+    "flipkart": {"resource_types": ["image", "font", "media", "tracker"], "url_patterns": ["*flipkart.com/x/*"]},
+    "madeinchina": {"resource_types": ["image", "font", "media", "tracker"], "url_patterns": []},
+    "alibaba": {"resource_types": ["font", "media", "tracker"], "url_patterns": ["*mmstat.com*", "*arms-retcode*", "*alilog*", "*cloud.video.taobao.com*"]},
+    "dhgate": {"resource_types": ["image", "font", "media", "tracker"], "url_patterns": ["*dhgate.com/dhlog*", "*criteo.net*"]},
+    "indiamart": {"resource_types": ["font", "media", "tracker"], "url_patterns": ["*imimg.com/data3/video*"]},
+}
+
+# Typical transfer sizes used until real loads of the same type have been observed
+DEFAULT_TYPE_BYTES = {"Image": 40000, "Font": 30000, "Media": 500000, "Script": 60000, "Stylesheet": 20000}
+FALLBACK_BYTES = 10000
+
+_observed = {}
+_totals = {"pages": 0, "requests": 0, "bytes": 0, "blocked_requests": 0, "avoided_bytes_estimate": 0}
+_lock = threading.Lock()
+
+
+def _load_overrides():
+    """Merge profiles from the JSON file named by SCRAPER_BLOCKING_CONFIG over the defaults."""
+    path = os.environ.get("SCRAPER_BLOCKING_CONFIG")
+    if not path:
+        return
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            overrides = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to load blocking profiles from {path}: {e}")
+        return
+    for site, profile in overrides.items():
+        PROFILES[site] = {**PROFILES.get(site, {}), **profile}
+
+
+_load_overrides()
+
+
+def blocked_patterns(site):
+    """URL patterns blocked for a site's profile."""
+    profile = PROFILES.get(site, {})
+    patterns = []
+    for resource_type in profile.get("resource_types", []):
+        patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+    patterns.extend(profile.get("url_patterns", []))
+    return patterns
+
+
+def apply_profile(driver, site):
+    """Install a site's blocking profile on a checked-out driver."""
+    if not ENABLED:
+        return
+    patterns = blocked_patterns(site)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        drain(driver)
+        logger.info(f"Applied '{site}' resource blocking profile ({len(patterns)} patterns)")
+    except Exception as e:
+        logger.warning(f"Failed to apply resource blocking profile '{site}': {e}")
+
+
+def clear_profile(driver):
+    """Remove any blocking profile so the driver can serve another site."""
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+
+
+def summarize(events):
+    """Count loaded and blocked requests in a batch of Network events."""
+    types = {}
+    stats = {"requests": 0, "bytes": 0, "blocked_requests": 0, "avoided_bytes_estimate": 0, "blocked_by_type": {}}
+    for event in events:
+        method, params = event.get("method"), event.get("params", {})
+        if method == "Network.requestWillBeSent":
+            types[params.get("requestId")] = params.get("type", "Other")
+        elif method == "Network.loadingFinished":
+            resource_type = types.get(params.get("requestId"), "Other")
+            size = int(params.get("encodedDataLength", 0))
+            stats["requests"] += 1
+            stats["bytes"] += size
+            with _lock:
+                count, total = _observed.get(resource_type, (0, 0))
+                _observed[resource_type] = (count + 1, total + size)
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            resource_type = params.get("type") or types.get(params.get("requestId"), "Other")
+            with _lock:
+                count, total = _observed.get(resource_type, (0, 0))
+            estimate = total // count if count else DEFAULT_TYPE_BYTES.get(resource_type, FALLBACK_BYTES)
+            stats["blocked_requests"] += 1
+            stats["avoided_bytes_estimate"] += estimate
+            stats["blocked_by_type"][resource_type] = stats["blocked_by_type"].get(resource_type, 0) + 1
+    return stats
+
+
+def page_stats(driver):
+    """Drain the driver's Network events since the last call and count what was loaded and avoided."""
+    stats = summarize(drain(driver))
+    with _lock:
+        _totals["pages"] += 1
+        for key in ("requests", "bytes", "blocked_requests", "avoided_bytes_estimate"):
+            _totals[key] += stats[key]
+    return stats
+
+
+def totals():
+    """Process-wide counters across every page measured so far."""
+    with _lock:
+        return dict(_totals, enabled=ENABLED)
@@ -0,0 +1,56 @@
+import os
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Backoff for lookups against the live DOM, which may still be rendering: 0.25 s, 0.5 s, ... capped
+LIVE_ATTEMPTS = int(os.environ.get("SCRAPER_LIVE_ATTEMPTS", 3))
+LIVE_BASE_DELAY = float(os.environ.get("SCRAPER_LIVE_BASE_DELAY", 0.25))
+LIVE_MAX_DELAY = float(os.environ.get("SCRAPER_LIVE_MAX_DELAY", 1.0))
+
+_stats = {}
+_lock = threading.Lock()
+
+
+def _record(field, attempts, slept, found):
+    with _lock:
+        entry = _stats.setdefault(field, {"calls": 0, "attempts": 0, "retries": 0, "sleep_seconds": 0.0, "misses": 0})
+        entry["calls"] += 1
+        entry["attempts"] += attempts
+        entry["retries"] += attempts - 1
+        entry["sleep_seconds"] += slept
+        entry["misses"] += 0 if found else 1
+
+
+def extract(func, default="", field="unnamed", live=False, attempts=LIVE_ATTEMPTS, max_delay=LIVE_MAX_DELAY):
+    """Run one field extraction and return its truthy result, or default.
+
+    Static lookups (a parsed tree, a dict) are deterministic, so they run exactly once and a
+    missing optional field costs nothing. Live lookups against the browser are retried with
+    exponential backoff from LIVE_BASE_DELAY, each sleep capped at max_delay.
+    """
+    tries = max(1, attempts) if live else 1
+    slept = 0.0
+    for attempt in range(tries):
+        try:
+            result = func()
+            if result:
+                _record(field, attempt + 1, slept, True)
+                return result
+        except Exception as e:
+            logger.debug(f"Extraction of {field} failed (attempt {attempt + 1}/{tries}): {e}")
+        if attempt < tries - 1:
+            delay = min(max_delay, LIVE_BASE_DELAY * 2 ** attempt)
+            time.sleep(delay)
+            slept += delay
+    _record(field, tries, slept, False)
+    return default
+
+
+def stats():
+    """Per-field extraction counters since start-up, costliest fields first."""
+    with _lock:
+        ordered = sorted(_stats.items(), key=lambda item: (-item[1]["sleep_seconds"], -item[1]["retries"], item[0]))
+        return {field: dict(entry, sleep_seconds=round(entry["sleep_seconds"], 3)) for field, entry in ordered}
@@ -0,0 +1,348 @@
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+import soupsieve
+from pathlib import Path
+from selenium.webdriver.common.by import By
+import patterns
+from js_extract import ExtractionPlan
+
+logger = logging.getLogger(__name__)
+
+# One JSON spec per site; SCRAPER_SELECTOR_SPECS points at a directory of replacement specs
+SPEC_DIR = os.environ.get("SCRAPER_SELECTOR_SPECS") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "site_specs")
+
+# Per-selector hit counts, kept across runs so fallback order survives a restart
+STATS_FILE = Path(os.environ.get("SCRAPER_SELECTOR_STATS", Path.home() / ".cache" / "scraper_apis" / "selector_stats.json"))
+SAVE_INTERVAL = float(os.environ.get("SCRAPER_SELECTOR_SAVE_INTERVAL", 60))
+# Cleared in extraction worker processes: they hand their probe counts to the scraper process
+# (see take_deltas/merge_deltas) instead of writing STATS_FILE themselves
+PERSIST = True
+TRACK_DELTAS = False
+
+# A selector whose hit rate falls below DEAD_RATE after MIN_ATTEMPTS probes sinks behind the live ones.
+# Counts are halved past WINDOW attempts so a selector that starts matching again can climb back.
+REORDER_EVERY = int(os.environ.get("SCRAPER_SELECTOR_REORDER_EVERY", 50))
+MIN_ATTEMPTS = int(os.environ.get("SCRAPER_SELECTOR_MIN_ATTEMPTS", 20))
+DEAD_RATE = float(os.environ.get("SCRAPER_SELECTOR_DEAD_RATE", 0.05))
+WINDOW = int(os.environ.get("SCRAPER_SELECTOR_WINDOW", 2000))
+
+# Named post-processors a spec can chain after reading a match; each returns None to reject it
+POSTPROCESSORS = {
+    "strip": lambda value: value.strip(),
+    "clean_text": patterns.clean_text,
+    "normalize_space": patterns.normalize_space,
+    "digits": lambda value: (match := patterns.DIGITS.search(value)) and match.group(1),
+    "decimal": lambda value: (match := patterns.DECIMAL.search(value)) and match.group(1),
+    "parenthesized_count": lambda value: (match := patterns.PARENTHESIZED_COUNT.search(value)) and match.group(1),
+    "absolute_url": lambda value: f"https:{value}" if value.startswith("//") else value,
+    "strip_query": lambda value: value.split("?")[0],
+}
+
+
+def read(element, get):
+    """Read a matched element the way a field spec asks: text, html, attr:<name> or the element itself.
+
+    prop:<name> is resolved by the browser in in-page plans; in a parsed tree it reads the attribute.
+    """
+    if get == "element":
+        return element
+    if get == "text":
+        return element.get_text(strip=True)
+    if get == "html":
+        return str(element)
+    if get.startswith(("attr:", "prop:")):
+        return element.get(get[5:])
+    raise ValueError(f"Unknown getter '{get}'")
+
+
+class FieldPlan:
+    """A field's fallback selectors, compiled once, and how to read and post-process a match.
+
+    Every probe is counted per selector. Selectors that have stopped matching are moved behind
+    the ones that still match (dead ones ordered by hit rate), so lookups stop paying for them;
+    live selectors keep their declared precedence because a catch-all fallback must never
+    overtake a specific one.
+    """
+
+    def __init__(self, site, name, selectors, get="text", post=()):
+        if isinstance(selectors, str):
+            selectors = [selectors]
+        unknown = [step for step in post if step not in POSTPROCESSORS]
+        if unknown:
+            raise ValueError(f"Unknown post-processors {unknown} for {site}.{name}")
+        self.site = site
+        self.name = name
+        self.selectors = list(selectors)
+        self.get = get
+        self.post = [POSTPROCESSORS[step] for step in post]
+        self.compiled = {selector: soupsieve.compile(selector) for selector in self.selectors}
+        self.order = list(self.selectors)
+        self.counters = {selector: {"attempts": 0, "hits": 0, "seconds": 0.0} for selector in self.selectors}
+        self.deltas = {}
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def _record(self, selector, started, hit):
+        self._add(selector, 1, 1 if hit else 0, time.perf_counter() - started)
+
+    def _add(self, selector, attempts, hits, seconds):
+        reordered = False
+        with self._lock:
+            entry = self.counters[selector]
+            entry["attempts"] += attempts
+            entry["hits"] += hits
+            entry["seconds"] += seconds
+            if entry["attempts"] >= WINDOW:
+                entry["attempts"] //= 2
+                entry["hits"] //= 2
+                entry["seconds"] /= 2
+            if TRACK_DELTAS:
+                delta = self.deltas.setdefault(selector, {"attempts": 0, "hits": 0, "seconds": 0.0})
+                delta["attempts"] += attempts
+                delta["hits"] += hits
+                delta["seconds"] += seconds
+            before = self._probes
+            self._probes += attempts
+            if self._probes // REORDER_EVERY != before // REORDER_EVERY:
+                reordered = self._reorder()
+        if reordered:
+            _save_soon()
+
+    def take_deltas(self):
+        """Probe counts recorded since the last call, keyed by selector; empty unless TRACK_DELTAS is set."""
+        with self._lock:
+            deltas, self.deltas = self.deltas, {}
+        return deltas
+
+    def merge(self, deltas):
+        """Add probe counts taken in another process, e.g. an extraction worker."""
+        for selector, delta in deltas.items():
+            if selector in self.counters:
+                self._add(selector, delta["attempts"], delta["hits"], delta["seconds"])
+
+    def _hit_rate(self, selector):
+        entry = self.counters[selector]
+        return entry["hits"] / entry["attempts"] if entry["attempts"] else None
+
+    def _reorder(self):
+        """Sink dead selectors behind live ones; True when the probe order changed."""
+        def rank(selector):
+            rate = self._hit_rate(selector)
+            if self.counters[selector]["attempts"] >= MIN_ATTEMPTS and rate < DEAD_RATE:
+                return (1, -rate, self.selectors.index(selector))
+            return (0, 0, self.selectors.index(selector))
+
+        order = sorted(self.selectors, key=rank)
+        if order == self.order:
+            return False
+        logger.info(f"Reordered {self.site}.{self.name} selectors: {order}")
+        self.order = order
+        return True
+
+    def restore(self, saved):
+        """Resume counters persisted by an earlier run, for selectors still in the spec."""
+        with self._lock:
+            for selector, entry in saved.items():
+                if selector in self.counters:
+                    self.counters[selector].update(
+                        attempts=int(entry.get("attempts", 0)), hits=int(entry.get("hits", 0)), seconds=float(entry.get("seconds", 0.0))
+                    )
+            self._reorder()
+
+    def snapshot(self):
+        """Counters for persistence, keyed by selector."""
+        with self._lock:
+            return {selector: dict(entry) for selector, entry in self.counters.items() if entry["attempts"]}
+
+    def stats(self):
+        """Probe order and per-selector attempts, hits, hit rate and time."""
+        with self._lock:
+            return {
+                "order": list(self.order),
+                "selectors": {
+                    selector: {
+                        "attempts": entry["attempts"],
+                        "hits": entry["hits"],
+                        "hit_rate": round(entry["hits"] / entry["attempts"], 3) if entry["attempts"] else None,
+                        "seconds": round(entry["seconds"], 4)
+                    }
+                    for selector, entry in self.counters.items()
+                }
+            }
+
+    def _finish(self, value):
+        for step in self.post:
+            if not value:
+                return value
+            value = step(value)
+        return value
+
+    def matches(self, root):
+        """(selector, elements) for each fallback that matches under root, in probe order."""
+        for selector in self.order:
+            started = time.perf_counter()
+            found = self.compiled[selector].select(root)
+            self._record(selector, started, bool(found))
+            if found:
+                yield selector, found
+
+    def first(self, root):
+        """First element matched by the earliest fallback that matches, or None."""
+        for selector in self.order:
+            started = time.perf_counter()
+            element = self.compiled[selector].select_one(root)
+            self._record(selector, started, element is not None)
+            if element is not None:
+                return element
+        return None
+
+    def value(self, root, default=None):
+        """Read and post-process the earliest fallback match that yields a non-empty value."""
+        for selector in self.order:
+            started = time.perf_counter()
+            element = self.compiled[selector].select_one(root)
+            value = self._finish(read(element, self.get)) if element is not None else None
+            self._record(selector, started, bool(value))
+            if value:
+                return value
+        return default
+
+    def values(self, root):
+        """Every non-empty value matched by the earliest fallback that yields any."""
+        for selector in self.order:
+            started = time.perf_counter()
+            found = [self._finish(read(element, self.get)) for element in self.compiled[selector].select(root)]
+            found = [value for value in found if value]
+            self._record(selector, started, bool(found))
+            if found:
+                return found
+        return []
+
+    def live_matches(self, context):
+        """(selector, WebElements) for each fallback that matches under a driver or element."""
+        for selector in self.order:
+            started = time.perf_counter()
+            found = context.find_elements(By.CSS_SELECTOR, selector)
+            self._record(selector, started, bool(found))
+            if found:
+                yield selector, found
+
+    def live(self, context):
+        """WebElements for the earliest fallback that matches under a driver or element."""
+        return next((found for _, found in self.live_matches(context)), [])
+
+    def css(self):
+        """All fallbacks as one selector list, for APIs that take a single CSS string."""
+        return ", ".join(self.order)
+
+
+class SitePlan:
+    """Every field declared in a site's spec, compiled into FieldPlans."""
+
+    def __init__(self, site, spec):
+        self.site = site
+        self.fields = {name: FieldPlan(site, name, **field) for name, field in spec["fields"].items()}
+
+    def __getitem__(self, name):
+        return self.fields[name]
+
+    def extract(self, root, names):
+        """Values of several fields read from the same root."""
+        return {name: self.fields[name].value(root) for name in names}
+
+    def card_plan(self, card, names):
+        """Compile a card field and some of its sibling fields, in current probe order, into one in-page ExtractionPlan."""
+        fields = {name: {"selector": self.fields[name].order, "get": self.fields[name].get} for name in names}
+        return ExtractionPlan(self.fields[card].order, fields)
+
+    def stats(self):
+        """Selector telemetry for every field that has been probed."""
+        return {name: field.stats() for name, field in self.fields.items() if field.snapshot()}
+
+
+_plans = {}
+_plans_lock = threading.Lock()
+_last_save = time.monotonic()
+
+
+def _read_saved():
+    try:
+        with open(STATS_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save():
+    """Write this process's selector counters, keeping other sites' entries in the file."""
+    global _last_save
+    if not PERSIST:
+        return
+    with _plans_lock:
+        plans = dict(_plans)
+        _last_save = time.monotonic()
+    probed = {site: {name: field.snapshot() for name, field in plan.fields.items()} for site, plan in plans.items()}
+    probed = {site: fields for site, fields in probed.items() if any(fields.values())}
+    if not probed:
+        return
+    saved = _read_saved()
+    saved.update(probed)
+    try:
+        STATS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = STATS_FILE.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(saved, f, indent=2)
+        os.replace(temp_file, STATS_FILE)
+    except OSError as e:
+        logger.warning(f"Failed to write selector stats {STATS_FILE}: {e}")
+
+
+def _save_soon():
+    """Persist after a reorder, at most once per SAVE_INTERVAL."""
+    if time.monotonic() - _last_save >= SAVE_INTERVAL:
+        save()
+
+
+def load(site):
+    """The compiled plan for a site, loaded from its spec file once per process."""
+    with _plans_lock:
+        if site not in _plans:
+            path = os.path.join(SPEC_DIR, f"{site}.json")
+            with open(path, "r", encoding="utf-8") as f:
+                plan = SitePlan(site, json.load(f))
+            saved = _read_saved().get(site, {})
+            for name, field in plan.fields.items():
+                field.restore(saved.get(name, {}))
+            if not _plans:
+                atexit.register(save)
+            _plans[site] = plan
+            logger.info(f"Loaded {len(plan.fields)} {site} field specs from {path}")
+        return _plans[site]
+
+
+def take_deltas():
+    """{site: {field: {selector: counts}}} probed since the last call, for handing to another process."""
+    with _plans_lock:
+        plans = dict(_plans)
+    taken = {site: {name: field.take_deltas() for name, field in plan.fields.items()} for site, plan in plans.items()}
+    return {site: {name: d for name, d in fields.items() if d} for site, fields in taken.items() if any(fields.values())}
+
+
+def merge_deltas(deltas):
+    """Fold probe counts from take_deltas() in another process into this process's plans."""
+    for site, fields in deltas.items():
+        plan = load(site)
+        for name, field_deltas in fields.items():
+            if name in plan.fields:
+                plan.fields[name].merge(field_deltas)
+
+
+def stats():
+    """Per-site selector telemetry for every plan loaded so far."""
+    with _plans_lock:
+        plans = dict(_plans)
+    return {site: plan.stats() for site, plan in plans.items()}